@@ -3,7 +3,15 @@ import os
 
 from fastapi import FastAPI
 
+from api.v1.ppt.endpoints.presentation import run_presentation_generation_job
 from services.database import create_db_and_tables
+from services.docling_worker_pool import DOCLING_WORKER_POOL
+from services.pptx_export_executor import PPTX_EXPORT_EXECUTOR
+from services.presentation_generation_queue import (
+    PresentationGenerationWorkerPool,
+    get_generation_workers,
+)
+from utils.download_helpers import close_http_session
 from utils.get_env import get_app_data_directory_env
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
@@ -14,10 +22,22 @@ from utils.model_availability import (
 async def app_lifespan(_: FastAPI):
     """
     Lifespan context manager for FastAPI application.
-    Initializes the application data directory and checks LLM model availability.
+    Initializes the application data directory, checks LLM model availability
+    and runs presentation generation workers unless GENERATION_WORKERS is 0.
+    Stops the PPTX export and Docling process pools and closes the pooled
+    download session on shutdown.
 
     """
     os.makedirs(get_app_data_directory_env(), exist_ok=True)
     await create_db_and_tables()
     await check_llm_and_image_provider_api_or_model_availability()
+
+    worker_pool = PresentationGenerationWorkerPool(
+        run_presentation_generation_job, get_generation_workers()
+    )
+    worker_pool.start()
     yield
+    await worker_pool.stop()
+    PPTX_EXPORT_EXECUTOR.shutdown()
+    DOCLING_WORKER_POOL.shutdown()
+    await close_http_session()
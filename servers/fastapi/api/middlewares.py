@@ -2,6 +2,8 @@ from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
+from constants.llm import LLM_RESPONSE_CACHE_BYPASS_HEADER
+from services.llm_response_cache import LLM_CACHE_BYPASS
 from utils.get_env import get_can_change_keys_env
 from utils.user_config import update_env_with_user_config
 
@@ -11,3 +13,16 @@ class UserConfigEnvUpdateMiddleware(BaseHTTPMiddleware):
         if get_can_change_keys_env() != "false":
             update_env_with_user_config()
         return await call_next(request)
+
+
+class LLMCacheBypassMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        bypass = (
+            request.headers.get(LLM_RESPONSE_CACHE_BYPASS_HEADER, "").lower()
+            == "bypass"
+        )
+        token = LLM_CACHE_BYPASS.set(bypass)
+        try:
+            return await call_next(request)
+        finally:
+            LLM_CACHE_BYPASS.reset(token)
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.database import get_async_session
+from services.docling_worker_pool import DOCLING_WORKER_POOL
+from services.document_context_builder import DOCUMENT_CONTEXT_BUILDER
+from services.export_artifact_cache import EXPORT_ARTIFACT_CACHE
+from services.layout_cache import LAYOUT_CACHE
+from services.llm_rate_limiter import LLM_RATE_LIMITER
+from services.llm_response_cache import LLM_RESPONSE_CACHE
+from services.network_asset_store import NETWORK_ASSET_STORE
+from services.parsed_document_cache import PARSED_DOCUMENT_CACHE
+from services.pptx_export_executor import PPTX_EXPORT_EXECUTOR
+from services.pptx_slide_cache import PPTX_SLIDE_CACHE
+from services.processed_image_cache import PROCESSED_IMAGE_CACHE
+from services.presentation_generation_queue import (
+    PRESENTATION_GENERATION_QUEUE,
+    get_generation_workers,
+)
+
+METRICS_ROUTER = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@METRICS_ROUTER.get("/llm")
+async def get_llm_metrics():
+    return {
+        "response_cache": LLM_RESPONSE_CACHE.get_stats(),
+        "rate_limiter": LLM_RATE_LIMITER.get_state(),
+    }
+
+
+@METRICS_ROUTER.get("/layouts")
+async def get_layout_metrics():
+    return LAYOUT_CACHE.get_stats()
+
+
+@METRICS_ROUTER.get("/exports")
+async def get_export_metrics():
+    return {
+        "artifact_cache": EXPORT_ARTIFACT_CACHE.get_stats(),
+        "slide_cache": PPTX_SLIDE_CACHE.get_stats(),
+        "image_cache": PROCESSED_IMAGE_CACHE.get_stats(),
+        "asset_store": NETWORK_ASSET_STORE.get_stats(),
+        "executor": PPTX_EXPORT_EXECUTOR.get_stats(),
+    }
+
+
+@METRICS_ROUTER.get("/documents")
+async def get_document_metrics():
+    return {
+        "parsed_cache": PARSED_DOCUMENT_CACHE.get_stats(),
+        "parser_pool": DOCLING_WORKER_POOL.get_stats(),
+        "context_builder": DOCUMENT_CONTEXT_BUILDER.get_stats(),
+    }
+
+
+@METRICS_ROUTER.get("/generation-queue")
+async def get_generation_queue_metrics(
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    return {
+        **(await PRESENTATION_GENERATION_QUEUE.get_stats(sql_session)),
+        "api_workers": get_generation_workers(),
+    }
@@ -19,6 +19,7 @@ from models.sse_response import (
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.database import get_async_session
 from services.documents_loader import DocumentsLoader
+from services.document_context_builder import DOCUMENT_CONTEXT_BUILDER
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from utils.ppt_utils import get_presentation_title_from_outlines
 
@@ -47,7 +48,10 @@ async def stream_outlines(
             await documents_loader.load_documents(temp_dir)
             documents = documents_loader.documents
             if documents:
-                additional_context = "\n\n".join(documents)
+                additional_context, _ = await DOCUMENT_CONTEXT_BUILDER.build(
+                    documents,
+                    f"{presentation.content}\n{presentation.instructions or ''}",
+                )
 
         presentation_outlines_text = ""
 
@@ -7,7 +7,7 @@ import random
 import traceback
 from typing import Annotated, List, Literal, Optional, Tuple
 import dirtyjson
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Path
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,6 +15,9 @@ from sqlmodel import select
 from constants.presentation import DEFAULT_TEMPLATES
 from enums.webhook_event import WebhookEvent
 from models.api_error_model import APIErrorModel
+from models.async_presentation_generation_status_response import (
+    AsyncPresentationGenerationStatusResponse,
+)
 from models.generate_presentation_request import GeneratePresentationRequest
 from models.presentation_and_path import PresentationPathAndEditPath
 from models.presentation_from_template import EditPresentationRequest
@@ -33,32 +36,48 @@ from models.presentation_with_slides import (
 from models.sql.template import TemplateModel
 
 from services.documents_loader import DocumentsLoader
+from services.document_context_builder import DOCUMENT_CONTEXT_BUILDER
 from services.webhook_service import WebhookService
 from utils.get_layout_by_name import get_layout_by_name
 from services.image_generation_service import ImageGenerationService
 from utils.dict_utils import deep_update
-from utils.export_utils import export_presentation
+from utils.export_utils import export_presentation, get_export_download_response
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from models.sql.slide import SlideModel
-from models.sse_response import SSECompleteResponse, SSEErrorResponse, SSEResponse
+from models.sse_response import (
+    SSECompleteResponse,
+    SSEErrorResponse,
+    SSEResponse,
+    SSESlideResponse,
+)
 
 from services.database import get_async_session
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.concurrent_service import CONCURRENT_SERVICE
 from models.sql.presentation import PresentationModel
-from services.pptx_presentation_creator import PptxPresentationCreator
+from services.export_artifact_cache import EXPORT_ARTIFACT_CACHE
+from services.pptx_export_executor import PPTX_EXPORT_EXECUTOR
 from models.sql.async_presentation_generation_status import (
     AsyncPresentationGenerationTaskModel,
 )
+from models.sql.image_asset import ImageAsset
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
+from services.generation_checkpoints import GenerationCheckpoints, get_checkpoint_stages
+from services.presentation_generation_queue import PRESENTATION_GENERATION_QUEUE
 from utils.asset_directory_utils import get_exports_directory, get_images_directory
+from utils.get_env import get_can_change_keys_env
+from utils.user_config import update_env_with_user_config
 from utils.llm_calls.generate_presentation_structure import (
     generate_presentation_structure,
 )
 from utils.llm_calls.generate_slide_content import (
     get_slide_content_from_type_and_outline,
 )
+from utils.pipelined_generation import PipelinedSlideGeneration
+from utils.sliding_window import gather_in_sliding_window, iterate_in_sliding_window
 from utils.ppt_utils import (
     get_presentation_title_from_outlines,
+    get_slide_generation_window,
     select_toc_or_list_slide_layout_index,
 )
 from utils.process_slides import (
@@ -124,6 +143,7 @@ async def delete_presentation(
 
     await sql_session.delete(presentation)
     await sql_session.commit()
+    EXPORT_ARTIFACT_CACHE.invalidate(id)
 
 
 @PRESENTATION_ROUTER.post("/create", response_model=PresentationModel)
@@ -257,7 +277,9 @@ async def prepare_presentation(
 
 @PRESENTATION_ROUTER.get("/stream/{id}", response_model=PresentationWithSlides)
 async def stream_presentation(
-    id: uuid.UUID, sql_session: AsyncSession = Depends(get_async_session)
+    id: uuid.UUID,
+    indexed: bool = False,
+    sql_session: AsyncSession = Depends(get_async_session),
 ):
     presentation = await sql_session.get(PresentationModel, id)
     if not presentation:
@@ -283,49 +305,72 @@ async def stream_presentation(
         # These tasks will be gathered and awaited after all slides are generated
         async_assets_generation_tasks = []
 
+        def get_slide_content_factory(i: int):
+            slide_layout = layout.slides[structure.slides[i]]
+            return lambda: get_slide_content_from_type_and_outline(
+                slide_layout,
+                outline.slides[i],
+                presentation.language,
+                presentation.tone,
+                presentation.verbosity,
+                presentation.instructions,
+            )
+
         slides: List[SlideModel] = []
+        # Slides that finished before the ones preceding them
+        completed_slides: dict[int, SlideModel] = {}
+
         yield SSEResponse(
             event="response",
             data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
         ).to_string()
-        for i, slide_layout_index in enumerate(structure.slides):
-            slide_layout = layout.slides[slide_layout_index]
-
-            try:
-                slide_content = await get_slide_content_from_type_and_outline(
-                    slide_layout,
-                    outline.slides[i],
-                    presentation.language,
-                    presentation.tone,
-                    presentation.verbosity,
-                    presentation.instructions,
-                )
-            except HTTPException as e:
-                yield SSEErrorResponse(detail=e.detail).to_string()
-                return
 
-            slide = SlideModel(
-                presentation=id,
-                layout_group=layout.name,
-                layout=slide_layout.id,
-                index=i,
-                speaker_note=slide_content.get("__speaker_note__", ""),
-                content=slide_content,
-            )
-            slides.append(slide)
+        slide_contents = iterate_in_sliding_window(
+            [get_slide_content_factory(i) for i in range(len(structure.slides))],
+            get_slide_generation_window(),
+        )
+        try:
+            async for i, slide_content in slide_contents:
+                slide = SlideModel(
+                    presentation=id,
+                    layout_group=layout.name,
+                    layout=layout.slides[structure.slides[i]].id,
+                    index=i,
+                    speaker_note=slide_content.get("__speaker_note__", ""),
+                    content=slide_content,
+                )
 
-            # This will mutate slide and add placeholder assets
-            process_slide_add_placeholder_assets(slide)
+                # This will mutate slide and add placeholder assets
+                process_slide_add_placeholder_assets(slide)
 
-            # This will mutate slide
-            async_assets_generation_tasks.append(
-                process_slide_and_fetch_assets(image_generation_service, slide)
-            )
+                # This will mutate slide
+                async_assets_generation_tasks.append(
+                    process_slide_and_fetch_assets(image_generation_service, slide)
+                )
 
-            yield SSEResponse(
-                event="response",
-                data=json.dumps({"type": "chunk", "chunk": slide.model_dump_json()}),
-            ).to_string()
+                if indexed:
+                    yield SSESlideResponse(
+                        index=i, slide=slide.model_dump(mode="json")
+                    ).to_string()
+
+                # Chunks are always emitted in slide order
+                completed_slides[i] = slide
+                while len(slides) in completed_slides:
+                    next_slide = completed_slides.pop(len(slides))
+                    # Separated by commas so the chunks join into valid json
+                    chunk = ("," if slides else "") + next_slide.model_dump_json()
+                    slides.append(next_slide)
+                    yield SSEResponse(
+                        event="response",
+                        data=json.dumps({"type": "chunk", "chunk": chunk}),
+                    ).to_string()
+        except HTTPException as e:
+            for coroutine in async_assets_generation_tasks:
+                coroutine.close()
+            yield SSEErrorResponse(detail=e.detail).to_string()
+            return
+        finally:
+            await slide_contents.aclose()
 
         yield SSEResponse(
             event="response",
@@ -394,6 +439,8 @@ async def update_presentation(
         sql_session.add_all(slides)
 
     await sql_session.commit()
+    # Exports of the previous version are not needed anymore
+    EXPORT_ARTIFACT_CACHE.invalidate(presentation.id)
 
     return PresentationWithSlides(
         **presentation.model_dump(),
@@ -407,18 +454,35 @@ async def export_presentation_as_pptx(
 ):
     temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
 
-    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-    await pptx_creator.create_ppt()
-
     export_directory = get_exports_directory()
     pptx_path = os.path.join(
         export_directory, f"{pptx_model.name or uuid.uuid4()}.pptx"
     )
-    pptx_creator.save(pptx_path)
+    await PPTX_EXPORT_EXECUTOR.create_pptx(pptx_model, temp_dir, pptx_path)
 
     return pptx_path
 
 
+@PRESENTATION_ROUTER.get("/download/{id}")
+async def download_presentation(
+    id: uuid.UUID,
+    request: Request,
+    export_as: Literal["pptx", "pdf"] = "pptx",
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Returns the exported file directly. PPTX files start streaming while
+    they are written, finished exports support Range and ETag requests.
+    """
+    presentation = await sql_session.get(PresentationModel, id)
+    if not presentation:
+        raise HTTPException(status_code=404, detail="Presentation not found")
+
+    return await get_export_download_response(
+        id, presentation.title or str(uuid.uuid4()), export_as, request.headers
+    )
+
+
 @PRESENTATION_ROUTER.post("/export", response_model=PresentationPathAndEditPath)
 async def export_presentation_as_pptx_or_pdf(
     id: Annotated[uuid.UUID, Body(description="Presentation ID to export")],
@@ -487,20 +551,88 @@ async def check_if_api_request_is_valid(
     return (presentation_id,)
 
 
+async def complete_presentation_generation(
+    request: GeneratePresentationRequest,
+    presentation: PresentationModel,
+    async_status: Optional[AsyncPresentationGenerationTaskModel],
+    sql_session: AsyncSession,
+    checkpoints: GenerationCheckpoints,
+) -> PresentationPathAndEditPath:
+    if async_status:
+        async_status.message = "Exporting presentation"
+        async_status.updated_at = datetime.now()
+        sql_session.add(async_status)
+
+    # 9. Export
+    presentation_and_path = await export_presentation(
+        presentation.id, presentation.title or str(uuid.uuid4()), request.export_as
+    )
+
+    response = PresentationPathAndEditPath(
+        **presentation_and_path.model_dump(),
+        edit_path=f"/presentation?id={presentation.id}",
+    )
+
+    if async_status:
+        async_status.message = "Presentation generation completed"
+        async_status.status = "completed"
+        async_status.data = response.model_dump(mode="json")
+        async_status.updated_at = datetime.now()
+        sql_session.add(async_status)
+        await sql_session.commit()
+
+    await checkpoints.complete()
+
+    # Triggering webhook on success
+    CONCURRENT_SERVICE.run_task(
+        None,
+        WebhookService.send_webhook,
+        WebhookEvent.PRESENTATION_GENERATION_COMPLETED,
+        response.model_dump(mode="json"),
+    )
+
+    return response
+
+
 async def generate_presentation_handler(
     request: GeneratePresentationRequest,
     presentation_id: uuid.UUID,
     async_status: Optional[AsyncPresentationGenerationTaskModel],
     sql_session: AsyncSession = Depends(get_async_session),
+    retry_on_error: bool = False,
 ):
+    pipelined_generation: Optional[PipelinedSlideGeneration] = None
+    # Index of the pipelined outline of each slide, None for slides added later
+    pipelined_outline_indices: List[Optional[int]] = []
+    checkpoints = GenerationCheckpoints(async_status.id if async_status else None)
     try:
+        await checkpoints.load()
+
+        # Presentation and slides were saved by a previous attempt
+        if await checkpoints.reuse("presentation"):
+            presentation = await sql_session.get(PresentationModel, presentation_id)
+            return await complete_presentation_generation(
+                request, presentation, async_status, sql_session, checkpoints
+            )
+
         using_slides_markdown = False
 
         if request.slides_markdown:
             using_slides_markdown = True
             request.n_slides = len(request.slides_markdown)
 
-        if not using_slides_markdown:
+        # Parse Layouts
+        layout_model = await get_layout_by_name(request.template)
+        total_slide_layouts = len(layout_model.slides)
+
+        outlines_checkpoint = await checkpoints.reuse("outlines")
+        if outlines_checkpoint:
+            presentation_outlines = PresentationOutlineModel(
+                **outlines_checkpoint["outlines"]
+            )
+            total_outlines = outlines_checkpoint["total_outlines"]
+
+        elif not using_slides_markdown:
             additional_context = ""
 
             # Updating async status
@@ -515,7 +647,9 @@ async def generate_presentation_handler(
                 await documents_loader.load_documents(TEMP_FILE_SERVICE.base_dir)
                 documents = documents_loader.documents
                 if documents:
-                    additional_context = "\n\n".join(documents)
+                    additional_context, _ = await DOCUMENT_CONTEXT_BUILDER.build(
+                        documents, f"{request.content}\n{request.instructions or ''}"
+                    )
 
             # Finding number of slides to generate by considering table of contents
             n_slides_to_generate = request.n_slides
@@ -532,6 +666,17 @@ async def generate_presentation_handler(
                     (request.n_slides - needed_toc_count) / 10
                 )
 
+            # Layout selection and slide contents start as soon as each outline is streamed
+            if request.pipelined:
+                pipelined_generation = PipelinedSlideGeneration(
+                    layout_model,
+                    n_slides_to_generate,
+                    request.language,
+                    request.tone.value,
+                    request.verbosity.value,
+                    request.instructions,
+                )
+
             presentation_outlines_text = ""
             async for chunk in generate_ppt_outline(
                 request.content,
@@ -543,26 +688,42 @@ async def generate_presentation_handler(
                 request.instructions,
                 request.include_title_slide,
                 request.web_search,
+                incremental_path="slides[*]" if pipelined_generation else None,
             ):
 
                 if isinstance(chunk, HTTPException):
                     raise chunk
 
+                if pipelined_generation:
+                    for item in chunk.items:
+                        pipelined_generation.add_outline(SlideOutlineModel(**item))
+                    chunk = chunk.chunk
+
                 presentation_outlines_text += chunk
 
-            try:
-                presentation_outlines_json = dict(
-                    dirtyjson.loads(presentation_outlines_text)
+            if pipelined_generation:
+                if not pipelined_generation.outlines:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Failed to generate presentation outlines. Please try again.",
+                    )
+                presentation_outlines = PresentationOutlineModel(
+                    slides=[*pipelined_generation.outlines]
                 )
-            except Exception as e:
-                traceback.print_exc()
-                raise HTTPException(
-                    status_code=400,
-                    detail="Failed to generate presentation outlines. Please try again.",
+            else:
+                try:
+                    presentation_outlines_json = dict(
+                        dirtyjson.loads(presentation_outlines_text)
+                    )
+                except Exception as e:
+                    traceback.print_exc()
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Failed to generate presentation outlines. Please try again.",
+                    )
+                presentation_outlines = PresentationOutlineModel(
+                    **presentation_outlines_json
                 )
-            presentation_outlines = PresentationOutlineModel(
-                **presentation_outlines_json
-            )
             total_outlines = n_slides_to_generate
 
         else:
@@ -575,6 +736,15 @@ async def generate_presentation_handler(
             )
             total_outlines = len(request.slides_markdown)
 
+        if not outlines_checkpoint:
+            await checkpoints.save(
+                "outlines",
+                {
+                    "outlines": presentation_outlines.model_dump(),
+                    "total_outlines": total_outlines,
+                },
+            )
+
         # Updating async status
         if async_status:
             async_status.message = f"Selecting layout for each slide"
@@ -585,68 +755,98 @@ async def generate_presentation_handler(
         print("-" * 40)
         print(f"Generated {total_outlines} outlines for the presentation")
 
-        # Parse Layouts
-        layout_model = await get_layout_by_name(request.template)
-        total_slide_layouts = len(layout_model.slides)
+        structure_checkpoint = await checkpoints.reuse("structure")
+        if structure_checkpoint:
+            presentation_structure = PresentationStructureModel(
+                **structure_checkpoint["structure"]
+            )
+            # Outlines with table of contents
+            presentation_outlines = PresentationOutlineModel(
+                **structure_checkpoint["outlines"]
+            )
 
-        # Generate Structure
-        if layout_model.ordered:
-            presentation_structure = layout_model.to_presentation_structure()
         else:
-            presentation_structure: PresentationStructureModel = (
-                await generate_presentation_structure(
-                    presentation_outlines,
-                    layout_model,
-                    request.instructions,
-                    using_slides_markdown,
+            # Generate Structure
+            if pipelined_generation:
+                presentation_structure = (
+                    await pipelined_generation.get_presentation_structure()
                 )
-            )
-
-        presentation_structure.slides = presentation_structure.slides[:total_outlines]
-        for index in range(total_outlines):
-            random_slide_index = random.randint(0, total_slide_layouts - 1)
-            if index >= total_outlines:
-                presentation_structure.slides.append(random_slide_index)
-                continue
-            if presentation_structure.slides[index] >= total_slide_layouts:
-                presentation_structure.slides[index] = random_slide_index
-
-        # Injecting table of contents to the presentation structure and outlines
-        if request.include_table_of_contents and not using_slides_markdown:
-            n_toc_slides = request.n_slides - total_outlines
-            toc_slide_layout_index = select_toc_or_list_slide_layout_index(layout_model)
-            if toc_slide_layout_index != -1:
-                outline_index = 1 if request.include_title_slide else 0
-                for i in range(n_toc_slides):
-                    outlines_to = outline_index + 10
-                    if total_outlines == outlines_to:
-                        outlines_to -= 1
-
-                    presentation_structure.slides.insert(
-                        i + 1 if request.include_title_slide else i,
-                        toc_slide_layout_index,
+                pipelined_outline_indices = list(
+                    range(len(pipelined_generation.outlines))
+                )
+            elif layout_model.ordered:
+                presentation_structure = layout_model.to_presentation_structure()
+            else:
+                presentation_structure: PresentationStructureModel = (
+                    await generate_presentation_structure(
+                        presentation_outlines,
+                        layout_model,
+                        request.instructions,
+                        using_slides_markdown,
                     )
-                    toc_outline = f"Table of Contents\n\n"
-
-                    for outline in presentation_outlines.slides[
-                        outline_index:outlines_to
-                    ]:
-                        page_number = (
-                            outline_index - i + n_toc_slides + 1
-                            if request.include_title_slide
-                            else outline_index - i + n_toc_slides
+                )
+
+            presentation_structure.slides = presentation_structure.slides[
+                :total_outlines
+            ]
+            for index in range(total_outlines):
+                random_slide_index = random.randint(0, total_slide_layouts - 1)
+                if index >= total_outlines:
+                    presentation_structure.slides.append(random_slide_index)
+                    continue
+                if presentation_structure.slides[index] >= total_slide_layouts:
+                    presentation_structure.slides[index] = random_slide_index
+
+            # Injecting table of contents to the presentation structure and outlines
+            if request.include_table_of_contents and not using_slides_markdown:
+                n_toc_slides = request.n_slides - total_outlines
+                toc_slide_layout_index = select_toc_or_list_slide_layout_index(
+                    layout_model
+                )
+                if toc_slide_layout_index != -1:
+                    outline_index = 1 if request.include_title_slide else 0
+                    for i in range(n_toc_slides):
+                        outlines_to = outline_index + 10
+                        if total_outlines == outlines_to:
+                            outlines_to -= 1
+
+                        presentation_structure.slides.insert(
+                            i + 1 if request.include_title_slide else i,
+                            toc_slide_layout_index,
                         )
-                        toc_outline += f"Slide page number: {page_number}\n Slide Content: {outline.content[:100]}\n\n"
-                        outline_index += 1
+                        toc_outline = f"Table of Contents\n\n"
+
+                        for outline in presentation_outlines.slides[
+                            outline_index:outlines_to
+                        ]:
+                            page_number = (
+                                outline_index - i + n_toc_slides + 1
+                                if request.include_title_slide
+                                else outline_index - i + n_toc_slides
+                            )
+                            toc_outline += f"Slide page number: {page_number}\n Slide Content: {outline.content[:100]}\n\n"
+                            outline_index += 1
 
-                    outline_index += 1
+                        outline_index += 1
 
-                    presentation_outlines.slides.insert(
-                        i + 1 if request.include_title_slide else i,
-                        SlideOutlineModel(
-                            content=toc_outline,
-                        ),
-                    )
+                        presentation_outlines.slides.insert(
+                            i + 1 if request.include_title_slide else i,
+                            SlideOutlineModel(
+                                content=toc_outline,
+                            ),
+                        )
+                        if pipelined_outline_indices:
+                            pipelined_outline_indices.insert(
+                                i + 1 if request.include_title_slide else i, None
+                            )
+
+            await checkpoints.save(
+                "structure",
+                {
+                    "structure": presentation_structure.model_dump(),
+                    "outlines": presentation_outlines.model_dump(),
+                },
+            )
 
         # Create PresentationModel
         presentation = PresentationModel(
@@ -673,55 +873,98 @@ async def generate_presentation_handler(
         image_generation_service = ImageGenerationService(get_images_directory())
         async_assets_generation_tasks = []
 
-        # 7. Generate slide content concurrently (batched), then build slides and fetch assets
-        slides: List[SlideModel] = []
-
+        # 7. Generate slide content in a sliding window, then build slides and fetch assets
         slide_layout_indices = presentation_structure.slides
         slide_layouts = [layout_model.slides[idx] for idx in slide_layout_indices]
 
-        # Schedule slide content generation and asset fetching in batches of 10
-        batch_size = 10
-        for start in range(0, len(slide_layouts), batch_size):
-            end = min(start + batch_size, len(slide_layouts))
+        def get_slide_content_factory(i: int):
+            async def factory():
+                slide_content = await checkpoints.reuse(f"slides[{i}]")
+                if slide_content:
+                    return slide_content
 
-            print(f"Generating slides from {start} to {end}")
-
-            # Generate contents for this batch concurrently
-            content_tasks = [
-                get_slide_content_from_type_and_outline(
-                    slide_layouts[i],
-                    presentation_outlines.slides[i],
-                    request.language,
-                    request.tone.value,
-                    request.verbosity.value,
-                    request.instructions,
+                outline_index = (
+                    pipelined_outline_indices[i]
+                    if i < len(pipelined_outline_indices)
+                    else None
                 )
-                for i in range(start, end)
-            ]
-            batch_contents: List[dict] = await asyncio.gather(*content_tasks)
-
-            # Build slides for this batch
-            batch_slides: List[SlideModel] = []
-            for offset, slide_content in enumerate(batch_contents):
-                i = start + offset
-                slide_layout = slide_layouts[i]
-                slide = SlideModel(
-                    presentation=presentation_id,
-                    layout_group=layout_model.name,
-                    layout=slide_layout.id,
-                    index=i,
-                    speaker_note=slide_content.get("__speaker_note__"),
-                    content=slide_content,
+                prefetched_task = (
+                    pipelined_generation.get_content_task(outline_index)
+                    if outline_index is not None
+                    else None
+                )
+                slide_content = await (
+                    prefetched_task
+                    or get_slide_content_from_type_and_outline(
+                        slide_layouts[i],
+                        presentation_outlines.slides[i],
+                        request.language,
+                        request.tone.value,
+                        request.verbosity.value,
+                        request.instructions,
+                    )
                 )
-                slides.append(slide)
-                batch_slides.append(slide)
+                await checkpoints.save(f"slides[{i}]", slide_content)
+                return slide_content
+
+            return factory
+
+        async def fetch_slide_assets(i: int, slide: SlideModel) -> List[ImageAsset]:
+            assets_checkpoint = await checkpoints.reuse(f"assets[{i}]")
+            if assets_checkpoint:
+                slide.content = assets_checkpoint["content"]
+                return [
+                    ImageAsset.model_validate(asset)
+                    for asset in assets_checkpoint["assets"]
+                ]
 
-            # Start asset fetch tasks for just-generated slides so they run while next batch is processed
-            asset_tasks = [
-                process_slide_and_fetch_assets(image_generation_service, slide)
-                for slide in batch_slides
-            ]
-            async_assets_generation_tasks.extend(asset_tasks)
+            # This will mutate slide
+            assets = await process_slide_and_fetch_assets(
+                image_generation_service, slide
+            )
+            await checkpoints.save(
+                f"assets[{i}]",
+                {
+                    "content": slide.content,
+                    "assets": [asset.model_dump(mode="json") for asset in assets],
+                },
+            )
+            return assets
+
+        # Keeps slides in order even though contents finish out of order
+        slides: List[Optional[SlideModel]] = [None] * len(slide_layouts)
+
+        def on_slide_content(i: int, slide_content: dict):
+            slide = SlideModel(
+                presentation=presentation_id,
+                layout_group=layout_model.name,
+                layout=slide_layouts[i].id,
+                index=i,
+                speaker_note=slide_content.get("__speaker_note__"),
+                content=slide_content,
+            )
+            slides[i] = slide
+
+            # Start fetching assets as soon as the slide content lands
+            async_assets_generation_tasks.append(
+                asyncio.create_task(fetch_slide_assets(i, slide))
+            )
+
+        slide_generation_window = get_slide_generation_window()
+        print(
+            f"Generating {len(slide_layouts)} slides, {slide_generation_window} at a time"
+        )
+
+        try:
+            await gather_in_sliding_window(
+                [get_slide_content_factory(i) for i in range(len(slide_layouts))],
+                slide_generation_window,
+                on_slide_content,
+            )
+        except BaseException:
+            for task in async_assets_generation_tasks:
+                task.cancel()
+            raise
 
         if async_status:
             async_status.message = "Fetching assets for slides"
@@ -729,7 +972,7 @@ async def generate_presentation_handler(
             sql_session.add(async_status)
             await sql_session.commit()
 
-        # Run all asset tasks concurrently while batches may still be generating content
+        # Asset tasks have been running since each slide content landed
         generated_assets_list = await asyncio.gather(*async_assets_generation_tasks)
         generated_assets = []
         for assets_list in generated_assets_list:
@@ -740,45 +983,24 @@ async def generate_presentation_handler(
         sql_session.add_all(slides)
         sql_session.add_all(generated_assets)
         await sql_session.commit()
+        await checkpoints.save("presentation", {"id": str(presentation_id)})
 
-        if async_status:
-            async_status.message = "Exporting presentation"
-            async_status.updated_at = datetime.now()
-            sql_session.add(async_status)
-
-        # 9. Export
-        presentation_and_path = await export_presentation(
-            presentation_id, presentation.title or str(uuid.uuid4()), request.export_as
-        )
-
-        response = PresentationPathAndEditPath(
-            **presentation_and_path.model_dump(),
-            edit_path=f"/presentation?id={presentation_id}",
-        )
-
-        if async_status:
-            async_status.message = "Presentation generation completed"
-            async_status.status = "completed"
-            async_status.data = response.model_dump(mode="json")
-            async_status.updated_at = datetime.now()
-            sql_session.add(async_status)
-            await sql_session.commit()
-
-        # Triggering webhook on success
-        CONCURRENT_SERVICE.run_task(
-            None,
-            WebhookService.send_webhook,
-            WebhookEvent.PRESENTATION_GENERATION_COMPLETED,
-            response.model_dump(mode="json"),
+        return await complete_presentation_generation(
+            request, presentation, async_status, sql_session, checkpoints
         )
 
-        return response
-
     except Exception as e:
+        if pipelined_generation:
+            pipelined_generation.cancel()
+
         if not isinstance(e, HTTPException):
             traceback.print_exc()
             e = HTTPException(status_code=500, detail="Presentation generation failed")
 
+        if async_status and retry_on_error and e.status_code >= 500:
+            # Generation queue will retry this job
+            raise e
+
         api_error_model = APIErrorModel.from_exception(e)
 
         # Triggering webhook on failure
@@ -821,28 +1043,15 @@ async def generate_presentation_sync(
 )
 async def generate_presentation_async(
     request: GeneratePresentationRequest,
-    background_tasks: BackgroundTasks,
     sql_session: AsyncSession = Depends(get_async_session),
 ):
     try:
         (presentation_id,) = await check_if_api_request_is_valid(request, sql_session)
 
-        async_status = AsyncPresentationGenerationTaskModel(
-            status="pending",
-            message="Queued for generation",
-            data=None,
-        )
-        sql_session.add(async_status)
-        await sql_session.commit()
-
-        background_tasks.add_task(
-            generate_presentation_handler,
-            request,
-            presentation_id,
-            async_status=async_status,
-            sql_session=sql_session,
+        # Picked up by PresentationGenerationWorkerPool
+        return await PRESENTATION_GENERATION_QUEUE.enqueue(
+            sql_session, request, presentation_id
         )
-        return async_status
 
     except Exception as e:
         if not isinstance(e, HTTPException):
@@ -852,8 +1061,30 @@ async def generate_presentation_async(
         raise e
 
 
+async def run_presentation_generation_job(
+    job: PresentationGenerationJobModel,
+    sql_session: AsyncSession,
+    retry_on_error: bool,
+) -> bool:
+    if get_can_change_keys_env() != "false":
+        update_env_with_user_config()
+
+    async_status = await sql_session.get(AsyncPresentationGenerationTaskModel, job.id)
+    if not async_status:
+        raise Exception(f"No presentation generation task found for job {job.id}")
+
+    await generate_presentation_handler(
+        GeneratePresentationRequest(**job.request),
+        job.presentation_id,
+        async_status,
+        sql_session,
+        retry_on_error=retry_on_error,
+    )
+    return async_status.status == "completed"
+
+
 @PRESENTATION_ROUTER.get(
-    "/status/{id}", response_model=AsyncPresentationGenerationTaskModel
+    "/status/{id}", response_model=AsyncPresentationGenerationStatusResponse
 )
 async def check_async_presentation_generation_status(
     id: str = Path(description="ID of the presentation generation task"),
@@ -864,6 +1095,37 @@ async def check_async_presentation_generation_status(
         raise HTTPException(
             status_code=404, detail="No presentation generation task found"
         )
+
+    checkpointed_stages, reused_stages = await get_checkpoint_stages(sql_session, id)
+    return AsyncPresentationGenerationStatusResponse(
+        **status.model_dump(),
+        checkpointed_stages=checkpointed_stages,
+        reused_stages=reused_stages,
+    )
+
+
+@PRESENTATION_ROUTER.post(
+    "/status/{id}/resume", response_model=AsyncPresentationGenerationTaskModel
+)
+async def resume_async_presentation_generation(
+    id: str = Path(description="ID of the presentation generation task"),
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    status = await sql_session.get(AsyncPresentationGenerationTaskModel, id)
+    if not status:
+        raise HTTPException(
+            status_code=404, detail="No presentation generation task found"
+        )
+    if status.status != "error":
+        raise HTTPException(
+            status_code=400, detail="Only failed presentation generations can resume"
+        )
+
+    # Generation continues from its last checkpoint
+    if not await PRESENTATION_GENERATION_QUEUE.requeue(sql_session, id):
+        raise HTTPException(
+            status_code=400, detail="Presentation generation can not be resumed"
+        )
     return status
 
 
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, func
 from utils.asset_directory_utils import get_images_directory
 from services.database import get_async_session
+from services.layout_cache import LAYOUT_CACHE
 from models.sql.presentation_layout_code import PresentationLayoutCodeModel
 from .prompts import (
     GENERATE_HTML_SYSTEM_PROMPT,
@@ -783,6 +784,9 @@ async def save_layouts(
 
         await session.commit()
 
+        for presentation in {layout.presentation for layout in request.layouts}:
+            LAYOUT_CACHE.invalidate(f"custom-{presentation}")
+
         return SaveLayoutsResponse(
             success=True,
             saved_count=saved_count,
@@ -1001,6 +1005,7 @@ async def create_template(
                 )
             )
         await session.commit()
+        LAYOUT_CACHE.invalidate(f"custom-{request.id}")
 
         # Read back
         template = await session.get(TemplateModel, request.id)
@@ -1039,5 +1044,6 @@ async def delete_template(
             )
         )
         await session.commit()
+        LAYOUT_CACHE.invalidate(f"custom-{template_id}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete template")
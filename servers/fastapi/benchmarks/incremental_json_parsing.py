@@ -0,0 +1,93 @@
+"""
+Compares parsing a streamed outline once the stream ends against feeding
+every chunk to the incremental parser.
+
+    python -m benchmarks.incremental_json_parsing [n_slides]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+import dirtyjson
+
+from utils.incremental_json_parser import IncrementalJsonParser
+
+CHUNK_SIZE = 8
+CHUNK_DELAY_SECONDS = 0.0005
+
+
+def get_outline(n_slides: int) -> dict:
+    return {
+        "slides": [
+            {
+                "content": f'# Slide {i}\n- Point with "quotes", [brackets] '
+                f"and {{braces}}\n- Growth: {i * 3.5}%"
+            }
+            for i in range(n_slides)
+        ]
+    }
+
+
+async def stream(text: str):
+    # Delays between chunks stand in for the LLM generating tokens
+    for i in range(0, len(text), CHUNK_SIZE):
+        await asyncio.sleep(CHUNK_DELAY_SECONDS)
+        yield text[i : i + CHUNK_SIZE]
+
+
+async def parse_at_end(text: str):
+    started_at = time.perf_counter()
+    collected = ""
+    async for chunk in stream(text):
+        collected += chunk
+    parse_started_at = time.perf_counter()
+    slides = dict(dirtyjson.loads(collected))["slides"]
+    finished_at = time.perf_counter()
+    total = finished_at - started_at
+    return total, total, finished_at - parse_started_at, len(slides)
+
+
+async def parse_incrementally(text: str):
+    started_at = time.perf_counter()
+    first_item_at = None
+    parse_seconds = 0
+    count = 0
+    parser = IncrementalJsonParser("slides[*]")
+    async for chunk in stream(text):
+        parse_started_at = time.perf_counter()
+        items = parser.feed(chunk)
+        parse_seconds += time.perf_counter() - parse_started_at
+        if items and first_item_at is None:
+            first_item_at = time.perf_counter()
+        count += len(items)
+    finished_at = time.perf_counter()
+    return (
+        first_item_at - started_at,
+        finished_at - started_at,
+        parse_seconds,
+        count,
+    )
+
+
+def run(n_slides: int):
+    text = json.dumps(get_outline(n_slides))
+    print(f"{'':<16}{'first slide':>14}{'total':>12}{'parse':>12}{'slides':>8}")
+    for name, parse in [
+        ("end of stream", parse_at_end),
+        ("incremental", parse_incrementally),
+    ]:
+        first, total, parse_seconds, count = asyncio.run(parse(text))
+        print(
+            f"{name:<16}{first * 1000:>12.1f}ms{total * 1000:>10.1f}ms"
+            f"{parse_seconds * 1000:>10.2f}ms{count:>8}"
+        )
+
+
+def main():
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 30)
+
+
+if __name__ == "__main__":
+    main()
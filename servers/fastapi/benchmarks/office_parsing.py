@@ -0,0 +1,75 @@
+"""
+Compares parsing Word and PowerPoint files with Docling against reading
+their xml directly.
+
+    python -m benchmarks.office_parsing [file.docx|file.pptx ...]
+
+Without arguments a mix of synthetic files is parsed. Docling is skipped
+when it isn't installed.
+"""
+
+import os
+import sys
+import tempfile
+from typing import List
+
+from benchmarks.pdf_parsing import (
+    count_headings,
+    get_docling_parse,
+    get_similarity,
+    measure,
+)
+from benchmarks.sample_documents import write_sample_office_documents
+from services.ooxml_text_extractor import extract_office_markdown
+
+
+def run(file_paths: List[str]):
+    docling_parse = get_docling_parse()
+    if not docling_parse:
+        print("Docling is not installed, only the native extractor is measured\n")
+
+    print(
+        f"{'file':<30}{'native':>10}{'docling':>10}"
+        f"{'headings':>10}{'docling headings':>18}{'similarity':>12}"
+    )
+    for file_path in file_paths:
+        native_seconds, native_markdown = measure(
+            lambda: extract_office_markdown(file_path)
+        )
+        docling_seconds = docling_markdown = None
+        if docling_parse:
+            docling_seconds, docling_markdown = measure(
+                lambda: docling_parse(file_path)
+            )
+
+        print(
+            f"{os.path.basename(file_path)[:29]:<30}"
+            + (
+                f"{native_seconds:>9.3f}s"
+                if native_markdown is not None
+                # Files with unusual content are left to Docling
+                else f"{'fallback':>10}"
+            )
+            + (f"{docling_seconds:>9.3f}s" if docling_seconds else f"{'-':>10}")
+            + f"{count_headings(native_markdown or ''):>10}"
+            + (
+                f"{count_headings(docling_markdown):>18}"
+                if docling_markdown is not None
+                else f"{'-':>18}"
+            )
+            + (
+                f"{get_similarity(native_markdown, docling_markdown):>12.2f}"
+                if native_markdown is not None and docling_markdown is not None
+                else f"{'-':>12}"
+            )
+        )
+
+
+def main():
+    file_paths = sys.argv[1:]
+    with tempfile.TemporaryDirectory() as directory:
+        run(file_paths or write_sample_office_documents(directory))
+
+
+if __name__ == "__main__":
+    main()
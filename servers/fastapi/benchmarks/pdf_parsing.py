@@ -0,0 +1,109 @@
+"""
+Compares parsing PDFs with Docling alone against the text layer tier that
+sends only the pages needing layout analysis to Docling.
+
+    python -m benchmarks.pdf_parsing [file.pdf ...]
+
+Without arguments a mix of synthetic PDFs is parsed. Docling is skipped
+when it isn't installed.
+"""
+
+import difflib
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+from benchmarks.sample_documents import get_sample_pdfs, write_pdf
+from services.pdf_text_layer import (
+    extract_pdf_text_layer,
+    get_layout_page_ranges,
+    merge_page_markdown,
+)
+
+
+def get_docling_parse() -> Optional[Callable]:
+    try:
+        from services.docling_service import DoclingService
+    except ImportError:
+        return None
+    return DoclingService().parse_to_markdown
+
+
+def parse_tiered(file_path: str, docling_parse: Optional[Callable]) -> str:
+    text_layer_pages = extract_pdf_text_layer(file_path)
+    page_ranges = get_layout_page_ranges(text_layer_pages)
+    if not docling_parse:
+        # Flagged pages keep their text layer when Docling is unavailable
+        return merge_page_markdown(text_layer_pages, [], [])
+    range_markdowns = [
+        docling_parse(file_path, page_range) for page_range in page_ranges
+    ]
+    return merge_page_markdown(text_layer_pages, page_ranges, range_markdowns)
+
+
+def measure(parse: Callable[[], str]):
+    started_at = time.perf_counter()
+    markdown = parse()
+    return time.perf_counter() - started_at, markdown
+
+
+def count_headings(markdown: str) -> int:
+    return sum(1 for line in markdown.splitlines() if line.startswith("#"))
+
+
+def get_similarity(first: str, second: str) -> float:
+    return difflib.SequenceMatcher(None, first.split(), second.split()).ratio()
+
+
+def run(file_paths: List[str]):
+    docling_parse = get_docling_parse()
+    if not docling_parse:
+        print("Docling is not installed, only the text layer tier is measured\n")
+
+    print(
+        f"{'file':<28}{'pages':>6}{'layout':>8}{'text layer':>12}"
+        f"{'tiered':>10}{'docling s':>11}{'headings':>10}{'similarity':>12}"
+    )
+    for file_path in file_paths:
+        text_layer_seconds, text_layer_pages = measure(
+            lambda: extract_pdf_text_layer(file_path)
+        )
+        layout_pages = sum(
+            end - start + 1 for start, end in get_layout_page_ranges(text_layer_pages)
+        )
+        tiered_seconds, tiered_markdown = measure(
+            lambda: parse_tiered(file_path, docling_parse)
+        )
+
+        docling_seconds = similarity = None
+        if docling_parse:
+            docling_seconds, docling_markdown = measure(
+                lambda: docling_parse(file_path)
+            )
+            similarity = get_similarity(tiered_markdown, docling_markdown)
+
+        print(
+            f"{os.path.basename(file_path)[:27]:<28}"
+            f"{len(text_layer_pages):>6}{layout_pages:>8}"
+            f"{text_layer_seconds:>11.3f}s{tiered_seconds:>9.3f}s"
+            + (f"{docling_seconds:>10.3f}s" if docling_seconds else f"{'-':>11}")
+            + f"{count_headings(tiered_markdown):>10}"
+            + (f"{similarity:>12.2f}" if similarity is not None else f"{'-':>12}")
+        )
+
+
+def main():
+    file_paths = sys.argv[1:]
+    with tempfile.TemporaryDirectory() as directory:
+        if not file_paths:
+            for name, pages in get_sample_pdfs():
+                file_path = os.path.join(directory, f"{name}.pdf")
+                write_pdf(file_path, pages)
+                file_paths.append(file_path)
+        run(file_paths)
+
+
+if __name__ == "__main__":
+    main()
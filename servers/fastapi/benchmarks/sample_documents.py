@@ -0,0 +1,319 @@
+"""
+Writes small synthetic documents for the parsing benchmarks and tests, so
+neither depends on sample files checked into the repository.
+"""
+
+import os
+from typing import List, Tuple
+import zipfile
+import zlib
+
+from pptx import Presentation
+from pptx.util import Inches
+
+LOREM = (
+    "Quarterly revenue grew across every region as the new pricing reached "
+    "existing customers. Operating costs stayed flat while the support team "
+    "absorbed twice the ticket volume of the previous year."
+)
+
+
+def escape_pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_text(x: float, y: float, size: float, text: str) -> str:
+    return f"BT /F1 {size} Tf {x} {y} Td ({escape_pdf_text(text)}) Tj ET"
+
+
+def pdf_paragraph(x: float, y: float, size: float, text: str, width: int = 90) -> str:
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + len(word) + 1 > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}".strip()
+    lines.append(line)
+    return "\n".join(
+        pdf_text(x, y - index * size * 1.2, size, line)
+        for index, line in enumerate(lines)
+    )
+
+
+def pdf_table(x: float, y: float, rows: List[List[str]], cell_width: float = 120):
+    cell_height = 20
+    operations = []
+    for row_index in range(len(rows) + 1):
+        row_y = y - row_index * cell_height
+        operations.append(f"{x} {row_y} m {x + cell_width * len(rows[0])} {row_y} l S")
+    for column_index in range(len(rows[0]) + 1):
+        column_x = x + column_index * cell_width
+        operations.append(
+            f"{column_x} {y} m {column_x} {y - cell_height * len(rows)} l S"
+        )
+    for row_index, row in enumerate(rows):
+        for column_index, cell in enumerate(row):
+            operations.append(
+                pdf_text(
+                    x + column_index * cell_width + 4,
+                    y - (row_index + 1) * cell_height + 6,
+                    10,
+                    cell,
+                )
+            )
+    return "\n".join(operations)
+
+
+def pdf_image(x: float, y: float, width: float, height: float) -> str:
+    return f"q {width} 0 0 {height} {x} {y} cm /Im1 Do Q"
+
+
+def write_pdf(path: str, pages: List[List[str]]):
+    """Writes a PDF whose pages draw the given content stream operations"""
+    objects: List[bytes] = []
+
+    def add(content: bytes) -> int:
+        objects.append(content)
+        return len(objects)
+
+    catalog = add(b"")
+    pages_object = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pixels = zlib.compress(bytes([200, 40, 40] * 64 * 64))
+    image = add(
+        b"<< /Type /XObject /Subtype /Image /Width 64 /Height 64 "
+        b"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode "
+        + f"/Length {len(pixels)} >>\nstream\n".encode()
+        + pixels
+        + b"\nendstream"
+    )
+
+    page_objects = []
+    for operations in pages:
+        content = "\n".join(operations).encode("latin-1")
+        stream = add(
+            f"<< /Length {len(content)} >>\nstream\n".encode()
+            + content
+            + b"\nendstream"
+        )
+        page_objects.append(
+            add(
+                f"<< /Type /Page /Parent {pages_object} 0 R "
+                f"/MediaBox [0 0 612 792] /Contents {stream} 0 R "
+                f"/Resources << /Font << /F1 {font} 0 R >> "
+                f"/XObject << /Im1 {image} 0 R >> >> >>".encode()
+            )
+        )
+
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages_object} 0 R >>".encode()
+    kids = " ".join(f"{page} 0 R" for page in page_objects)
+    objects[pages_object - 1] = (
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(page_objects)} >>".encode()
+    )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, content in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + content + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode()
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+
+    with open(path, "wb") as file:
+        file.write(output)
+
+
+def report_page(title: str, paragraphs: int = 4) -> List[str]:
+    operations = [pdf_text(72, 720, 22, title)]
+    y = 680
+    for index in range(paragraphs):
+        operations.append(pdf_text(72, y, 14, f"Section {index + 1}"))
+        operations.append(pdf_paragraph(72, y - 22, 10, LOREM))
+        y -= 110
+    return operations
+
+
+def table_page(title: str) -> List[str]:
+    rows = [["Region", "Revenue", "Growth"]] + [
+        [f"Region {index}", f"{index * 120}", f"{index * 3}%"] for index in range(8)
+    ]
+    return [pdf_text(72, 720, 14, title), pdf_table(72, 690, rows)]
+
+
+def scanned_page() -> List[str]:
+    return [pdf_image(36, 36, 540, 720)]
+
+
+def get_sample_pdfs() -> List[Tuple[str, List[List[str]]]]:
+    """Names and pages of a mix of born-digital and harder PDFs"""
+    return [
+        ("report", [report_page(f"Chapter {index + 1}") for index in range(20)]),
+        (
+            "report_with_tables",
+            [
+                (
+                    table_page(f"Results {index}")
+                    if index % 5 == 4
+                    else report_page(f"Chapter {index + 1}")
+                )
+                for index in range(20)
+            ],
+        ),
+        ("scanned", [scanned_page() for _ in range(5)]),
+    ]
+
+
+DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+</Types>"""
+
+DOCX_PACKAGE_RELATIONSHIPS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+DOCX_DOCUMENT_RELATIONSHIPS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+
+WORDPROCESSING_NAMESPACE = (
+    "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+)
+
+
+def get_docx_styles() -> str:
+    styles = [
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal">'
+        '<w:name w:val="Normal"/></w:style>',
+        '<w:style w:type="paragraph" w:styleId="Title">'
+        '<w:name w:val="Title"/></w:style>',
+        '<w:style w:type="paragraph" w:styleId="ListParagraph">'
+        '<w:name w:val="List Paragraph"/></w:style>',
+    ] + [
+        f'<w:style w:type="paragraph" w:styleId="Heading{level}">'
+        f'<w:name w:val="heading {level}"/>'
+        f'<w:pPr><w:outlineLvl w:val="{level - 1}"/></w:pPr></w:style>'
+        for level in range(1, 4)
+    ]
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:styles xmlns:w="{WORDPROCESSING_NAMESPACE}">{"".join(styles)}</w:styles>'
+    )
+
+
+def escape_xml(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def docx_paragraph(text: str, style: str = None, list_level: int = None) -> str:
+    properties = ""
+    if style:
+        properties += f'<w:pStyle w:val="{style}"/>'
+    if list_level is not None:
+        properties += (
+            f'<w:numPr><w:ilvl w:val="{list_level}"/><w:numId w:val="1"/></w:numPr>'
+        )
+    if properties:
+        properties = f"<w:pPr>{properties}</w:pPr>"
+    return f"<w:p>{properties}<w:r><w:t>{escape_xml(text)}</w:t></w:r></w:p>"
+
+
+def docx_table(rows: List[List[str]]) -> str:
+    return (
+        "<w:tbl>"
+        + "".join(
+            "<w:tr>"
+            + "".join(f"<w:tc>{docx_paragraph(cell)}</w:tc>" for cell in row)
+            + "</w:tr>"
+            for row in rows
+        )
+        + "</w:tbl>"
+    )
+
+
+def docx_text_box(text: str) -> str:
+    return (
+        "<w:p><w:r><w:pict><w:txbxContent>"
+        f"{docx_paragraph(text)}"
+        "</w:txbxContent></w:pict></w:r></w:p>"
+    )
+
+
+def write_docx(path: str, body: List[str]):
+    """Writes a Word file whose body holds the given paragraphs and tables"""
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{WORDPROCESSING_NAMESPACE}">'
+        f"<w:body>{''.join(body)}</w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", DOCX_PACKAGE_RELATIONSHIPS)
+        archive.writestr("word/_rels/document.xml.rels", DOCX_DOCUMENT_RELATIONSHIPS)
+        archive.writestr("word/document.xml", document)
+        archive.writestr("word/styles.xml", get_docx_styles())
+
+
+def report_docx_body(chapters: int = 10) -> List[str]:
+    body = [docx_paragraph("Annual Report", "Title")]
+    for chapter in range(1, chapters + 1):
+        body.append(docx_paragraph(f"Chapter {chapter}", "Heading1"))
+        for section in range(1, 4):
+            body.append(docx_paragraph(f"Section {chapter}.{section}", "Heading2"))
+            body.append(docx_paragraph(LOREM))
+            body.append(docx_paragraph("Highlights", "ListParagraph", 0))
+            body.append(docx_paragraph(LOREM[:60], "ListParagraph", 1))
+        body.append(
+            docx_table(
+                [["Region", "Revenue"]]
+                + [[f"Region {index}", f"{index * 120}"] for index in range(5)]
+            )
+        )
+    return body
+
+
+def write_pptx(path: str, slides: int = 20):
+    presentation = Presentation()
+    for index in range(1, slides + 1):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = f"Topic {index}"
+        body = slide.placeholders[1].text_frame
+        body.text = LOREM[:80]
+        for level in (1, 1, 2):
+            paragraph = body.add_paragraph()
+            paragraph.text = LOREM[:40]
+            paragraph.level = level
+        if index % 5 == 0:
+            table = slide.shapes.add_table(
+                3, 3, Inches(1), Inches(5), Inches(6), Inches(1.5)
+            ).table
+            for row_index, row in enumerate(table.rows):
+                for column_index, cell in enumerate(row.cells):
+                    cell.text = f"Cell {row_index}.{column_index}"
+    presentation.save(path)
+
+
+def write_sample_office_documents(directory: str) -> List[str]:
+    """Writes a mix of Word and PowerPoint files and returns their paths"""
+    paths = [
+        os.path.join(directory, name)
+        for name in ("report.docx", "report_with_text_box.docx", "deck.pptx")
+    ]
+    write_docx(paths[0], report_docx_body())
+    write_docx(
+        paths[1], report_docx_body(3) + [docx_text_box("Sidebar with a key quote")]
+    )
+    write_pptx(paths[2])
+    return paths
@@ -0,0 +1,65 @@
+"""
+Compares generating slides in fixed batches against the sliding window,
+with a mock LLM where every fifth slide is slow.
+
+    python -m benchmarks.sliding_window [n_slides] [window_size]
+"""
+
+import asyncio
+import sys
+import time
+
+from utils.sliding_window import gather_in_sliding_window
+
+
+def get_delays(n_slides: int) -> list:
+    return [0.15 if i % 5 == 0 else 0.03 for i in range(n_slides)]
+
+
+async def mock_slide_content(delay: float) -> float:
+    await asyncio.sleep(delay)
+    return delay
+
+
+async def fixed_batches(delays: list, window_size: int) -> list:
+    results = []
+    for start in range(0, len(delays), window_size):
+        results.extend(
+            await asyncio.gather(
+                *[
+                    mock_slide_content(each)
+                    for each in delays[start : start + window_size]
+                ]
+            )
+        )
+    return results
+
+
+async def sliding_window(delays: list, window_size: int) -> list:
+    return await gather_in_sliding_window(
+        [lambda delay=each: mock_slide_content(delay) for each in delays],
+        window_size,
+    )
+
+
+def run(n_slides: int, window_size: int):
+    delays = get_delays(n_slides)
+    for name, generate in [
+        ("fixed batches", fixed_batches),
+        ("sliding window", sliding_window),
+    ]:
+        started_at = time.perf_counter()
+        results = asyncio.run(generate(delays, window_size))
+        seconds = time.perf_counter() - started_at
+        assert results == delays
+        print(f"{name:<16}{seconds * 1000:>8.0f}ms")
+
+
+def main():
+    n_slides = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    window_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    run(n_slides, window_size)
+
+
+if __name__ == "__main__":
+    main()
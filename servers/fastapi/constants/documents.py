@@ -18,3 +18,37 @@ WEBP_MIME_TYPES = ["image/webp"]
 UPLOAD_ACCEPTED_FILE_TYPES = (
     PDF_MIME_TYPES + TEXT_MIME_TYPES + POWERPOINT_TYPES + WORD_TYPES
 )
+
+
+DEFAULT_DOCUMENT_PARSER_WORKERS = 2
+DEFAULT_DOCUMENT_PARSER_QUEUE_SIZE = 20
+# Seconds a single document may take to parse
+DEFAULT_DOCUMENT_PARSE_TIMEOUT = 300
+# PDF page ranges at least this long are split across the parser workers
+DEFAULT_PDF_PARALLEL_MIN_PAGES = 20
+
+# Bump when a code change alters the markdown of unchanged documents
+DOCUMENT_PARSER_VERSION = 3
+PARSED_DOCUMENT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+PARSED_DOCUMENT_CACHE_FILE_HASHES = 1024
+
+# Pages of a PDF whose text layer is used instead of Docling
+PDF_TEXT_LAYER_MIN_CHARS = 80
+PDF_TEXT_LAYER_MAX_GARBLED_RATIO = 0.05
+PDF_HEADING_SIZE_RATIOS = [(1.6, 1), (1.2, 2)]
+PDF_HEADING_MAX_CHARS = 120
+# Documents with more pages needing Docling are parsed by Docling as a whole
+PDF_TEXT_LAYER_MAX_LAYOUT_PAGES_RATIO = 0.5
+
+# Estimated tokens of uploaded documents sent with the outline prompt, by
+# provider, when DOCUMENT_CONTEXT_TOKENS doesn't set them
+DEFAULT_DOCUMENT_CONTEXT_TOKENS = {
+    "openai": 48000,
+    "google": 120000,
+    "anthropic": 48000,
+    # Local models usually run with a few thousand tokens of context
+    "ollama": 6000,
+    "custom": 12000,
+}
+# Documents over the budget are split into chunks of about this many tokens
+DOCUMENT_CONTEXT_CHUNK_TOKENS = 400
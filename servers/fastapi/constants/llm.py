@@ -4,3 +4,25 @@ OPENAI_URL = "https://api.openai.com/v1"
 DEFAULT_OPENAI_MODEL = "gpt-4.1"
 DEFAULT_GOOGLE_MODEL = "models/gemini-2.5-flash"
 DEFAULT_ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
+
+# Pooled provider http clients
+LLM_HTTP_MAX_CONNECTIONS = 100
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+LLM_HTTP_KEEPALIVE_EXPIRY = 60
+LLM_CLIENT_REGISTRY_MAX_CLIENTS = 8
+
+# LLM response cache
+LLM_RESPONSE_CACHE_MEMORY_ITEMS = 256
+LLM_RESPONSE_CACHE_DISK_MAX_BYTES = 200 * 1024 * 1024
+LLM_RESPONSE_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+LLM_RESPONSE_CACHE_REPLAY_CHUNK_SIZE = 64
+LLM_RESPONSE_CACHE_BYPASS_HEADER = "X-LLM-Cache"
+
+# LLM rate limiter
+LLM_DEFAULT_MAX_CONCURRENCY = 10
+LLM_MIN_CONCURRENCY = 1
+LLM_RATE_LIMIT_MAX_RETRIES = 3
+LLM_RATE_LIMIT_DEFAULT_BACKOFF_SECONDS = 2
+LLM_LATENCY_DEGRADATION_FACTOR = 2
+LLM_CONCURRENCY_DECREASE_FACTOR = 0.5
+LLM_LATENCY_DECREASE_FACTOR = 0.9
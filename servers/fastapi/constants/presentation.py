@@ -1 +1,40 @@
 DEFAULT_TEMPLATES = ["general", "modern", "standard", "swift"]
+
+DEFAULT_SLIDE_GENERATION_WINDOW = 10
+
+DEFAULT_GENERATION_WORKERS = 2
+DEFAULT_GENERATION_JOB_MAX_ATTEMPTS = 3
+GENERATION_JOB_LEASE_SECONDS = 120
+GENERATION_JOB_POLL_INTERVAL_SECONDS = 1
+GENERATION_JOB_RETRY_BACKOFF_SECONDS = 10
+
+LAYOUT_CACHE_TTL_SECONDS = 600
+
+PPTX_SLIDE_CACHE_MAX_SLIDES = 500
+
+PROCESSED_IMAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+PROCESSED_IMAGE_CACHE_SOURCE_HASHES = 1024
+
+DEFAULT_EXPORT_IMAGE_DPI = 150
+EXPORT_IMAGE_JPEG_QUALITY = 85
+
+# Bump when a code change alters exported files of unchanged presentations
+EXPORT_ARTIFACT_CACHE_VERSION = 2
+DEFAULT_EXPORTS_MAX_SIZE_MB = 2048
+
+PPTX_MEDIA_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+EXPORT_STREAM_CHUNK_SIZE = 64 * 1024
+EXPORT_STREAM_POLL_SECONDS = 0.05
+
+# Pooled session used for downloads
+HTTP_MAX_CONNECTIONS = 32
+HTTP_MAX_CONNECTIONS_PER_HOST = 8
+HTTP_DOWNLOAD_TIMEOUT_SECONDS = 60
+
+NETWORK_ASSET_STORE_MAX_BYTES = 1024 * 1024 * 1024
+NETWORK_ASSET_REVALIDATE_SECONDS = 24 * 60 * 60
+
+DEFAULT_EXPORT_CONCURRENCY = 2
+DEFAULT_EXPORT_QUEUE_SIZE = 20
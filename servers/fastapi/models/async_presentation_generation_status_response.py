@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class AsyncPresentationGenerationStatusResponse(BaseModel):
+    id: str
+    status: str
+    message: Optional[str] = None
+    error: Optional[dict] = None
+    created_at: datetime
+    updated_at: datetime
+    data: Optional[dict] = None
+    checkpointed_stages: List[str] = []
+    reused_stages: List[str] = []
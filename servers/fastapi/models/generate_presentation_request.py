@@ -40,3 +40,7 @@ class GeneratePresentationRequest(BaseModel):
     trigger_webhook: bool = Field(
         default=False, description="Whether to trigger subscribed webhooks"
     )
+    pipelined: bool = Field(
+        default=False,
+        description="Whether to start generating slides while outlines are still being generated",
+    )
@@ -104,6 +104,8 @@ class PptxObjectFitModel(BaseModel):
 class PptxPictureModel(BaseModel):
     is_network: bool
     path: str
+    # Size in bytes of the picture before export processing
+    original_size: Optional[int] = None
 
 
 class PptxShapeModel(BaseModel):
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, Column, DateTime
+from sqlmodel import Field, SQLModel
+
+from utils.datetime_utils import get_current_utc_datetime
+
+
+class PresentationGenerationCheckpointModel(SQLModel, table=True):
+    __tablename__ = "presentation_generation_checkpoints"
+
+    # Id of AsyncPresentationGenerationTaskModel
+    task_id: str = Field(primary_key=True)
+    # outlines, structure, slides[i], assets[i] or presentation
+    stage: str = Field(primary_key=True)
+    # Cleared once the generation completes
+    data: Optional[dict] = Field(sa_column=Column(JSON), default=None)
+    reused: bool = Field(default=False)
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=get_current_utc_datetime,
+    )
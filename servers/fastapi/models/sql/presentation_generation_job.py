@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from sqlalchemy import JSON, Column, DateTime
+from sqlmodel import Field, SQLModel
+
+from enums.presentation_generation_job_status import PresentationGenerationJobStatus
+from utils.datetime_utils import get_current_utc_datetime
+
+
+class PresentationGenerationJobModel(SQLModel, table=True):
+    __tablename__ = "presentation_generation_jobs"
+
+    # Same as the id of AsyncPresentationGenerationTaskModel
+    id: str = Field(primary_key=True)
+    presentation_id: uuid.UUID
+    request: dict = Field(sa_column=Column(JSON))
+    status: str = Field(
+        default=PresentationGenerationJobStatus.QUEUED.value, index=True
+    )
+    attempts: int = Field(default=0)
+    max_attempts: int
+    available_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
+        default_factory=get_current_utc_datetime,
+    )
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = Field(
+        sa_column=Column(DateTime(timezone=True)), default=None
+    )
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=get_current_utc_datetime,
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        default_factory=get_current_utc_datetime,
+    )
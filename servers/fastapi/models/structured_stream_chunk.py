@@ -0,0 +1,7 @@
+from typing import Any, List
+from pydantic import BaseModel
+
+
+class StructuredStreamChunk(BaseModel):
+    chunk: str
+    items: List[Any] = []
@@ -38,3 +38,14 @@ class UserConfig(BaseModel):
 
     # Web Search
     WEB_GROUNDING: Optional[bool] = None
+
+    # LLM Response Cache
+    LLM_RESPONSE_CACHE: Optional[bool] = None
+
+    # LLM Rate Limits
+    LLM_MAX_CONCURRENCY: Optional[int] = None
+    LLM_REQUESTS_PER_MINUTE: Optional[int] = None
+    LLM_TOKENS_PER_MINUTE: Optional[int] = None
+
+    # Slide Generation
+    SLIDE_GENERATION_WINDOW: Optional[int] = None
@@ -15,6 +15,10 @@ from models.sql.image_asset import ImageAsset
 from models.sql.key_value import KeyValueSqlModel
 from models.sql.ollama_pull_status import OllamaPullStatus
 from models.sql.presentation import PresentationModel
+from models.sql.presentation_generation_checkpoint import (
+    PresentationGenerationCheckpointModel,
+)
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
 from models.sql.slide import SlideModel
 from models.sql.presentation_layout_code import PresentationLayoutCodeModel
 from models.sql.template import TemplateModel
@@ -63,6 +67,8 @@ async def create_db_and_tables():
                     TemplateModel.__table__,
                     WebhookSubscription.__table__,
                     AsyncPresentationGenerationTaskModel.__table__,
+                    PresentationGenerationJobModel.__table__,
+                    PresentationGenerationCheckpointModel.__table__,
                 ],
             )
         )
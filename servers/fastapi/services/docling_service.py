@@ -1,3 +1,5 @@
+from typing import Optional, Tuple
+
 from docling.document_converter import (
     DocumentConverter,
     PdfFormatOption,
@@ -28,6 +30,11 @@ class DoclingService:
             },
         )
 
-    def parse_to_markdown(self, file_path: str) -> str:
-        result = self.converter.convert(file_path)
+    def parse_to_markdown(
+        self, file_path: str, page_range: Optional[Tuple[int, int]] = None
+    ) -> str:
+        if page_range:
+            result = self.converter.convert(file_path, page_range=page_range)
+        else:
+            result = self.converter.convert(file_path)
         return result.document.export_to_markdown()
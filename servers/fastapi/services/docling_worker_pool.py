@@ -0,0 +1,309 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from constants.documents import (
+    DEFAULT_DOCUMENT_PARSE_TIMEOUT,
+    DEFAULT_DOCUMENT_PARSER_QUEUE_SIZE,
+    DEFAULT_DOCUMENT_PARSER_WORKERS,
+    DEFAULT_PDF_PARALLEL_MIN_PAGES,
+)
+from services.ooxml_text_extractor import extract_office_markdown
+from services.pdf_text_layer import (
+    PdfTextLayerPage,
+    extract_pdf_text_layer,
+    split_page_range,
+)
+from utils.get_env import (
+    get_document_parse_timeout_env,
+    get_document_parser_queue_size_env,
+    get_document_parser_workers_env,
+    get_pdf_parallel_min_pages_env,
+)
+from utils.parsers import parse_int_or_none
+
+# Converter of the current process, built once and reused for every document
+_docling_service = None
+_docling_service_lock = threading.Lock()
+
+
+def get_document_parser_workers() -> int:
+    workers = parse_int_or_none(get_document_parser_workers_env())
+    if workers is None:
+        return DEFAULT_DOCUMENT_PARSER_WORKERS
+    return max(workers, 0)
+
+
+def get_document_parser_queue_size() -> int:
+    queue_size = parse_int_or_none(get_document_parser_queue_size_env())
+    if queue_size is None:
+        return DEFAULT_DOCUMENT_PARSER_QUEUE_SIZE
+    return max(queue_size, 0)
+
+
+def get_document_parse_timeout() -> int:
+    timeout = parse_int_or_none(get_document_parse_timeout_env())
+    if timeout is None:
+        return DEFAULT_DOCUMENT_PARSE_TIMEOUT
+    return max(timeout, 1)
+
+
+def get_pdf_parallel_min_pages() -> int:
+    min_pages = parse_int_or_none(get_pdf_parallel_min_pages_env())
+    if min_pages is None:
+        return DEFAULT_PDF_PARALLEL_MIN_PAGES
+    return max(min_pages, 0)
+
+
+def get_docling_service():
+    global _docling_service
+    with _docling_service_lock:
+        if _docling_service is None:
+            # Imported here so only the processes that parse load the models
+            from services.docling_service import DoclingService
+
+            _docling_service = DoclingService()
+        return _docling_service
+
+
+def warm_up_docling_worker():
+    get_docling_service()
+
+
+def parse_to_markdown(
+    file_path: str, page_range: Optional[Tuple[int, int]] = None
+) -> str:
+    return get_docling_service().parse_to_markdown(file_path, page_range)
+
+
+class DoclingWorkerPool:
+    """
+    Parses documents with Docling in a pool of worker processes, each
+    holding one converter that is built when the worker starts and reused
+    for every document it parses.
+
+    At most workers documents are parsed at once and up to queue_size more
+    wait for a free worker, documents beyond that are rejected. A document
+    that takes longer than timeout seconds fails and the workers are
+    restarted so it stops using a core. A pool of 0 workers parses in a
+    thread of the API process instead, where timed out parses can't be
+    stopped and keep running in the background.
+
+    PDF page ranges of at least parallel_min_pages pages are split into one
+    part per worker so a long document uses every core.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        parallel_min_pages: Optional[int] = None,
+        parse: Callable[[str, Optional[Tuple[int, int]]], str] = parse_to_markdown,
+        initializer: Optional[Callable[[], None]] = warm_up_docling_worker,
+    ):
+        self._workers = workers
+        self._queue_size = queue_size
+        self._timeout = timeout
+        self._parallel_min_pages = parallel_min_pages
+        self._parse = parse
+        self._initializer = initializer
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.restarts = 0
+        self.split_documents = 0
+        self.total_wait_seconds = 0.0
+        self.total_parse_seconds = 0.0
+
+    @property
+    def workers(self) -> int:
+        if self._workers is None:
+            self._workers = get_document_parser_workers()
+        return self._workers
+
+    @property
+    def queue_size(self) -> int:
+        if self._queue_size is None:
+            self._queue_size = get_document_parser_queue_size()
+        return self._queue_size
+
+    @property
+    def timeout(self) -> float:
+        if self._timeout is None:
+            self._timeout = get_document_parse_timeout()
+        return self._timeout
+
+    @property
+    def parallel_min_pages(self) -> int:
+        if self._parallel_min_pages is None:
+            self._parallel_min_pages = get_pdf_parallel_min_pages()
+        return self._parallel_min_pages
+
+    def _get_executor(self) -> Optional[Executor]:
+        if not self.workers:
+            return None
+        if self._executor is None:
+            # Forking a process with a running event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self._initializer,
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(max(self.workers, 1))
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _restart_executor(self, executor: Executor, terminate: bool = False):
+        # Another parse may have replaced the executor already
+        if self._executor is not executor:
+            return
+        self._executor = None
+        self.restarts += 1
+        if terminate:
+            # ProcessPoolExecutor can't cancel a task that is already running
+            for process in list(executor._processes.values()):
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, function: Callable, *args):
+        executor = self._get_executor()
+        if not executor:
+            return await asyncio.wait_for(
+                asyncio.to_thread(function, *args), self.timeout
+            )
+        try:
+            return await asyncio.wait_for(
+                asyncio.get_running_loop().run_in_executor(executor, function, *args),
+                self.timeout,
+            )
+        except asyncio.TimeoutError:
+            self._restart_executor(executor, terminate=True)
+            raise
+        except BrokenProcessPool:
+            self._restart_executor(executor)
+            raise
+
+    async def parse_to_markdown(
+        self, file_path: str, page_range: Optional[Tuple[int, int]] = None
+    ) -> str:
+        """Parses the pages in the 1 based inclusive page_range, all by default"""
+        return await self._submit(file_path, self._parse, file_path, page_range)
+
+    async def parse_pdf_to_markdown(
+        self, file_path: str, page_range: Tuple[int, int]
+    ) -> str:
+        """Parses long page ranges in parts on all workers and joins them in order"""
+        page_ranges = split_page_range(
+            page_range, self.workers, self.parallel_min_pages
+        )
+        if len(page_ranges) == 1:
+            return await self.parse_to_markdown(file_path, page_range)
+
+        self.split_documents += 1
+        markdowns = await asyncio.gather(
+            *[
+                self.parse_to_markdown(file_path, part_range)
+                for part_range in page_ranges
+            ]
+        )
+        return "\n\n".join(markdown for markdown in markdowns if markdown.strip())
+
+    async def extract_text_layer(self, file_path: str) -> List[PdfTextLayerPage]:
+        return await self._submit(file_path, extract_pdf_text_layer, file_path)
+
+    async def extract_office_markdown(self, file_path: str) -> Optional[str]:
+        return await self._submit(file_path, extract_office_markdown, file_path)
+
+    async def _submit(self, file_path: str, function: Callable, *args):
+        if self._get_semaphore().locked() and self.waiting >= self.queue_size:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many documents are being parsed, please try again later",
+            )
+        semaphore = self._get_semaphore()
+
+        queued_at = time.monotonic()
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.total_wait_seconds += time.monotonic() - queued_at
+
+        self.running += 1
+        started_at = time.monotonic()
+        try:
+            try:
+                result = await self._run(function, *args)
+            except BrokenProcessPool:
+                # Workers are restarted when a parse times out or crashes,
+                # documents parsed by the other workers at the time are retried
+                result = await self._run(function, *args)
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            self.failed += 1
+            raise HTTPException(
+                status_code=504,
+                detail=f"Parsing {os.path.basename(file_path)} took too long",
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.total_parse_seconds += time.monotonic() - started_at
+            self.running -= 1
+            semaphore.release()
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "timeout": self.timeout,
+            "parallel_min_pages": self.parallel_min_pages,
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "restarts": self.restarts,
+            "split_documents": self.split_documents,
+            "average_wait_seconds": (
+                self.total_wait_seconds / finished if finished else 0
+            ),
+            "average_parse_seconds": (
+                self.total_parse_seconds / finished if finished else 0
+            ),
+        }
+
+
+DOCLING_WORKER_POOL = DoclingWorkerPool()
@@ -0,0 +1,288 @@
+import asyncio
+from collections import Counter
+import math
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from constants.documents import (
+    DEFAULT_DOCUMENT_CONTEXT_TOKENS,
+    DOCUMENT_CONTEXT_CHUNK_TOKENS,
+)
+from models.document_chunk import DocumentChunk
+from services.score_based_chunker import ScoreBasedChunker
+from utils.get_env import get_document_context_tokens_env
+from utils.llm_provider import get_llm_provider, get_model
+from utils.parsers import parse_int_or_none
+
+# Words too common to tell chunks apart
+STOP_WORDS = set(
+    (
+        "about and are but can for from has have how into its not our slide "
+        "slides that the their them then there these this those was were what "
+        "when which who why will with you your presentation create make"
+    ).split()
+)
+
+
+class DocumentContextReport(NamedTuple):
+    budget_tokens: int
+    total_tokens: int
+    included_tokens: int
+    total_chunks: int
+    included_chunks: int
+
+    @property
+    def dropped_tokens(self) -> int:
+        return self.total_tokens - self.included_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly 4 characters per token, same as the LLM rate limiter
+    return math.ceil(len(text) / 4)
+
+
+def get_document_context_tokens(provider: str, model: Optional[str]) -> int:
+    """
+    DOCUMENT_CONTEXT_TOKENS is either a single budget or comma separated
+    budgets by provider or model, e.g. "openai=60000,llama3.2:3b=3000".
+    """
+    value = get_document_context_tokens_env()
+    budget = parse_int_or_none(value)
+    if budget is not None:
+        return max(budget, 0)
+
+    budgets = {}
+    for entry in (value or "").split(","):
+        key, _, tokens = entry.rpartition("=")
+        tokens = parse_int_or_none(tokens.strip())
+        if key.strip() and tokens is not None:
+            budgets[key.strip()] = max(tokens, 0)
+
+    if model and model in budgets:
+        return budgets[model]
+    if provider in budgets:
+        return budgets[provider]
+    return DEFAULT_DOCUMENT_CONTEXT_TOKENS.get(
+        provider, DEFAULT_DOCUMENT_CONTEXT_TOKENS["custom"]
+    )
+
+
+def get_terms(text: str) -> List[str]:
+    return [
+        word
+        for word in re.findall(r"\w+", text.lower())
+        if len(word) > 2 and word not in STOP_WORDS
+    ]
+
+
+def get_chunk_text(chunk: DocumentChunk) -> str:
+    if not chunk.heading:
+        return chunk.content
+    return f"{chunk.heading}\n{chunk.content}" if chunk.content else chunk.heading
+
+
+def split_content(content: str, max_tokens: int) -> List[str]:
+    """Splits content on paragraphs into parts of up to max_tokens"""
+    max_chars = max_tokens * 4
+    parts = []
+    part = ""
+    for paragraph in content.split("\n\n"):
+        # Paragraphs longer than a whole part are cut on line or word breaks
+        while len(paragraph) > max_chars:
+            cut = paragraph.rfind("\n", 0, max_chars)
+            if cut <= 0:
+                cut = paragraph.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            parts.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        if part and len(part) + len(paragraph) + 2 > max_chars:
+            parts.append(part)
+            part = ""
+        part = f"{part}\n\n{paragraph}" if part else paragraph
+    if part.strip():
+        parts.append(part)
+    return [part for part in parts if part.strip()]
+
+
+class DocumentContextBuilder:
+
+    def __init__(self, chunk_tokens: int = DOCUMENT_CONTEXT_CHUNK_TOKENS):
+        self.chunk_tokens = chunk_tokens
+        self.chunker = ScoreBasedChunker()
+
+        self.requests = 0
+        self.trimmed_requests = 0
+        self.total_tokens = 0
+        self.dropped_tokens = 0
+
+    def get_document_chunks(self, document: str) -> List[DocumentChunk]:
+        """Splits document into its sections, and long sections into parts"""
+        headings = self.chunker.extract_headings(document)
+        scores = self.chunker.score_headings(headings)
+        sections = self.chunker.get_chunks_from_headings(
+            document, headings, scores, top_k=len(headings)
+        )
+
+        # Text before the first heading, often a summary of the document
+        lines = document.split("\n")
+        first_heading_line = next(
+            (i for i, line in enumerate(lines) if line.strip().startswith("#")),
+            len(lines),
+        )
+        preamble = "\n".join(lines[:first_heading_line]).strip()
+        if preamble or not sections:
+            sections.insert(
+                0,
+                DocumentChunk(
+                    heading="",
+                    content=preamble,
+                    heading_index=-1,
+                    score=max(scores, default=0),
+                ),
+            )
+
+        chunks = []
+        for section in sections:
+            heading_tokens = estimate_tokens(section.heading)
+            parts = split_content(
+                section.content, max(self.chunk_tokens - heading_tokens, 1)
+            )
+            # Every part keeps its heading so it reads on its own
+            for part in parts or [""]:
+                if not part and not section.heading:
+                    continue
+                chunks.append(section.model_copy(update={"content": part}))
+        return chunks
+
+    def rank_chunks(
+        self, chunks: List[Tuple[int, int, DocumentChunk]], query: str
+    ) -> List[float]:
+        """
+        Scores chunks by BM25 relevance to query, with heading scores and
+        earlier positions in the document breaking ties.
+        """
+        query_terms = set(get_terms(query))
+        chunk_terms = [
+            # Headings count twice, they summarise the text below them
+            Counter(get_terms(f"{chunk.heading} {chunk.heading} {chunk.content}"))
+            for _, _, chunk in chunks
+        ]
+        document_frequencies = Counter()
+        for terms in chunk_terms:
+            document_frequencies.update(query_terms & terms.keys())
+
+        average_length = sum(sum(terms.values()) for terms in chunk_terms) / max(
+            len(chunk_terms), 1
+        )
+        max_heading_score = max((chunk.score for _, _, chunk in chunks), default=0)
+        document_lengths = Counter(document_index for document_index, _, _ in chunks)
+
+        ranks = []
+        for (document_index, position, chunk), terms in zip(chunks, chunk_terms):
+            length_norm = 0.25 + 0.75 * sum(terms.values()) / max(average_length, 1)
+            relevance = 0.0
+            for term in query_terms:
+                frequency = terms.get(term, 0)
+                if not frequency:
+                    continue
+                idf = math.log(
+                    1
+                    + (len(chunks) - document_frequencies[term] + 0.5)
+                    / (document_frequencies[term] + 0.5)
+                )
+                relevance += idf * frequency * 2.2 / (frequency + 1.2 * length_norm)
+
+            structure = chunk.score / max_heading_score if max_heading_score else 0
+            order = 1 - position / document_lengths[document_index]
+            ranks.append(relevance + 0.1 * structure + 0.05 * order)
+        return ranks
+
+    def build_context(
+        self, documents: List[str], query: str, budget_tokens: int
+    ) -> Tuple[str, DocumentContextReport]:
+        full_context = "\n\n".join(documents)
+        total_tokens = estimate_tokens(full_context)
+        if total_tokens <= budget_tokens:
+            return full_context, DocumentContextReport(
+                budget_tokens,
+                total_tokens,
+                total_tokens,
+                len(documents),
+                len(documents),
+            )
+
+        chunks = []
+        for document_index, document in enumerate(documents):
+            document_chunks = self.get_document_chunks(document)
+            for position, chunk in enumerate(document_chunks):
+                chunks.append((document_index, position, chunk))
+        ranks = self.rank_chunks(chunks, query)
+
+        # Most relevant chunks first, skipping the ones that no longer fit
+        included = set()
+        included_tokens = 0
+        for index in sorted(range(len(chunks)), key=lambda i: -ranks[i]):
+            tokens = estimate_tokens(get_chunk_text(chunks[index][2])) + 1
+            if included_tokens + tokens <= budget_tokens:
+                included.add(index)
+                included_tokens += tokens
+
+        # Kept chunks go back in document order so the context reads naturally
+        document_blocks: Dict[int, List[str]] = {}
+        for index in sorted(included):
+            document_index, _, chunk = chunks[index]
+            document_blocks.setdefault(document_index, []).append(get_chunk_text(chunk))
+        context = "\n\n".join(
+            "\n\n".join(blocks) for _, blocks in sorted(document_blocks.items())
+        )
+        return context, DocumentContextReport(
+            budget_tokens,
+            total_tokens,
+            estimate_tokens(context),
+            len(chunks),
+            len(included),
+        )
+
+    async def build(
+        self,
+        documents: List[str],
+        query: str,
+        budget_tokens: Optional[int] = None,
+    ) -> Tuple[str, DocumentContextReport]:
+        """
+        Joins documents into the additional context of the outline prompt,
+        keeping the chunks most relevant to query when they exceed the token
+        budget of the selected model.
+        """
+        if budget_tokens is None:
+            budget_tokens = get_document_context_tokens(
+                get_llm_provider().value, get_model()
+            )
+        context, report = await asyncio.to_thread(
+            self.build_context, documents, query, budget_tokens
+        )
+
+        self.requests += 1
+        self.total_tokens += report.total_tokens
+        self.dropped_tokens += report.dropped_tokens
+        if report.dropped_tokens:
+            self.trimmed_requests += 1
+            print(
+                f"Dropped {report.dropped_tokens} of {report.total_tokens} document "
+                f"tokens ({report.total_chunks - report.included_chunks} of "
+                f"{report.total_chunks} chunks) to fit the budget of "
+                f"{report.budget_tokens} tokens"
+            )
+        return context, report
+
+    def get_stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "trimmed_requests": self.trimmed_requests,
+            "total_tokens": self.total_tokens,
+            "dropped_tokens": self.dropped_tokens,
+        }
+
+
+DOCUMENT_CONTEXT_BUILDER = DocumentContextBuilder()
@@ -1,16 +1,25 @@
 import mimetypes
 from fastapi import HTTPException
 import os, asyncio
-from typing import List, Tuple
+from typing import Awaitable, Callable, List, Optional, Tuple
 import pdfplumber
 
 from constants.documents import (
     PDF_MIME_TYPES,
+    PDF_TEXT_LAYER_MAX_LAYOUT_PAGES_RATIO,
     POWERPOINT_TYPES,
     TEXT_MIME_TYPES,
     WORD_TYPES,
 )
-from services.docling_service import DoclingService
+from services.docling_worker_pool import DOCLING_WORKER_POOL
+from services.ooxml_text_extractor import is_native_office_extraction_enabled
+from services.parsed_document_cache import PARSED_DOCUMENT_CACHE
+from services.pdf_text_layer import (
+    get_layout_page_ranges,
+    get_pdf_page_count,
+    is_pdf_text_layer_enabled,
+    merge_page_markdown,
+)
 
 
 class DocumentsLoader:
@@ -18,8 +27,6 @@ class DocumentsLoader:
     def __init__(self, file_paths: List[str]):
         self._file_paths = file_paths
 
-        self.docling_service = DoclingService()
-
         self._documents: List[str] = []
         self._images: List[List[str]] = []
 
@@ -37,35 +44,45 @@ class DocumentsLoader:
         load_text: bool = True,
         load_images: bool = False,
     ):
-        documents: List[str] = []
-        images: List[str] = []
-
         for file_path in self._file_paths:
             if not os.path.exists(file_path):
                 raise HTTPException(
                     status_code=404, detail=f"File {file_path} not found"
                 )
 
-            document = ""
-            imgs = []
-
-            mime_type = mimetypes.guess_type(file_path)[0]
-            if mime_type in PDF_MIME_TYPES:
-                document, imgs = await self.load_pdf(
-                    file_path, load_text, load_images, temp_dir
-                )
-            elif mime_type in TEXT_MIME_TYPES:
-                document = await self.load_text(file_path)
-            elif mime_type in POWERPOINT_TYPES:
-                document = self.load_powerpoint(file_path)
-            elif mime_type in WORD_TYPES:
-                document = self.load_msword(file_path)
-
-            documents.append(document)
-            images.append(imgs)
+        # Files are parsed in parallel by the Docling worker pool
+        results = await asyncio.gather(
+            *[
+                self.load_document(file_path, temp_dir, load_text, load_images)
+                for file_path in self._file_paths
+            ]
+        )
+        self._documents = [document for document, _ in results]
+        self._images = [imgs for _, imgs in results]
 
-        self._documents = documents
-        self._images = images
+    async def load_document(
+        self,
+        file_path: str,
+        temp_dir: str,
+        load_text: bool,
+        load_images: bool,
+    ) -> Tuple[str, List[str]]:
+        document = ""
+        imgs = []
+
+        mime_type = mimetypes.guess_type(file_path)[0]
+        if mime_type in PDF_MIME_TYPES:
+            document, imgs = await self.load_pdf(
+                file_path, load_text, load_images, temp_dir
+            )
+        elif mime_type in TEXT_MIME_TYPES:
+            document = await self.load_text(file_path)
+        elif mime_type in POWERPOINT_TYPES:
+            document = await self.load_powerpoint(file_path)
+        elif mime_type in WORD_TYPES:
+            document = await self.load_msword(file_path)
+
+        return document, imgs
 
     async def load_pdf(
         self,
@@ -78,10 +95,12 @@ class DocumentsLoader:
         document: str = ""
 
         if load_text:
-            document = self.docling_service.parse_to_markdown(file_path)
+            document = await self.parse_to_markdown(file_path, self.parse_pdf)
 
         if load_images:
-            image_paths = await self.get_page_images_from_pdf_async(file_path, temp_dir)
+            image_paths = await self.get_cached_page_images_from_pdf(
+                file_path, temp_dir
+            )
 
         return document, image_paths
 
@@ -89,11 +108,100 @@ class DocumentsLoader:
         with open(file_path, "r") as file:
             return await asyncio.to_thread(file.read)
 
-    def load_msword(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_msword(self, file_path: str) -> str:
+        return await self.parse_to_markdown(file_path, self.parse_office_document)
+
+    async def load_powerpoint(self, file_path: str) -> str:
+        return await self.parse_to_markdown(file_path, self.parse_office_document)
+
+    async def parse_office_document(self, file_path: str) -> str:
+        """
+        Reads headings, paragraphs, lists and tables straight from the xml
+        of Word and PowerPoint files, Docling parses the ones with unusual
+        content, e.g. text boxes or equations.
+        """
+        document = None
+        if is_native_office_extraction_enabled():
+            document = await DOCLING_WORKER_POOL.extract_office_markdown(file_path)
+        if document is None:
+            document = await DOCLING_WORKER_POOL.parse_to_markdown(file_path)
+        return document
+
+    async def parse_pdf(self, file_path: str) -> str:
+        """
+        Uses the text layer of the PDF and parses only the pages it doesn't
+        capture, e.g. tables or scans, with Docling.
+        """
+        if not is_pdf_text_layer_enabled():
+            return await self.parse_pdf_with_docling(file_path)
+        try:
+            text_layer_pages = await DOCLING_WORKER_POOL.extract_text_layer(file_path)
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Could not read the text layer of {file_path}: {e}")
+            return await DOCLING_WORKER_POOL.parse_to_markdown(file_path)
+
+        page_ranges = get_layout_page_ranges(text_layer_pages)
+        layout_pages = sum(end - start + 1 for start, end in page_ranges)
+        if layout_pages > len(text_layer_pages) * PDF_TEXT_LAYER_MAX_LAYOUT_PAGES_RATIO:
+            return await DOCLING_WORKER_POOL.parse_pdf_to_markdown(
+                file_path, (1, len(text_layer_pages))
+            )
+
+        range_markdowns = await asyncio.gather(
+            *[
+                DOCLING_WORKER_POOL.parse_pdf_to_markdown(file_path, page_range)
+                for page_range in page_ranges
+            ]
+        )
+        return merge_page_markdown(text_layer_pages, page_ranges, range_markdowns)
+
+    async def parse_pdf_with_docling(self, file_path: str) -> str:
+        try:
+            page_count = await asyncio.to_thread(get_pdf_page_count, file_path)
+        except Exception:
+            page_count = 0
+        if not page_count:
+            # Docling reports unreadable files itself
+            return await DOCLING_WORKER_POOL.parse_to_markdown(file_path)
+        return await DOCLING_WORKER_POOL.parse_pdf_to_markdown(
+            file_path, (1, page_count)
+        )
 
-    def load_powerpoint(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def parse_to_markdown(
+        self, file_path: str, parse: Optional[Callable[[str], Awaitable[str]]] = None
+    ) -> str:
+        # Parsed once per file content, regenerations reuse the markdown
+        file_hash = await asyncio.to_thread(
+            PARSED_DOCUMENT_CACHE.get_file_hash, file_path
+        )
+        document = await asyncio.to_thread(
+            PARSED_DOCUMENT_CACHE.get_markdown, file_hash
+        )
+        if document is None:
+            parse = parse or DOCLING_WORKER_POOL.parse_to_markdown
+            document = await parse(file_path)
+            await asyncio.to_thread(
+                PARSED_DOCUMENT_CACHE.set_markdown, file_hash, document
+            )
+        return document
+
+    async def get_cached_page_images_from_pdf(
+        self, file_path: str, temp_dir: str
+    ) -> List[str]:
+        file_hash = await asyncio.to_thread(
+            PARSED_DOCUMENT_CACHE.get_file_hash, file_path
+        )
+        image_paths = await asyncio.to_thread(
+            PARSED_DOCUMENT_CACHE.get_page_images, file_hash, temp_dir
+        )
+        if image_paths is None:
+            image_paths = await self.get_page_images_from_pdf_async(file_path, temp_dir)
+            await asyncio.to_thread(
+                PARSED_DOCUMENT_CACHE.set_page_images, file_hash, image_paths
+            )
+        return image_paths
 
     @classmethod
     def get_page_images_from_pdf(cls, file_path: str, temp_dir: str) -> List[str]:
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, List, Mapping, Optional, Set
+import uuid
+
+from constants.presentation import (
+    DEFAULT_EXPORTS_MAX_SIZE_MB,
+    EXPORT_ARTIFACT_CACHE_VERSION,
+)
+from models.sql.slide import SlideModel
+from utils.asset_directory_utils import get_exports_directory
+from utils.get_env import (
+    get_export_image_dpi_env,
+    get_exports_max_size_mb_env,
+)
+from utils.parsers import parse_int_or_none
+
+ARTIFACT_METADATA_FILE = "artifact.json"
+
+
+def get_exports_max_bytes() -> int:
+    max_size_mb = parse_int_or_none(get_exports_max_size_mb_env())
+    if max_size_mb is None:
+        max_size_mb = DEFAULT_EXPORTS_MAX_SIZE_MB
+    return max(max_size_mb, 0) * 1024 * 1024
+
+
+class ExportArtifactCache:
+    """
+    Keeps exported files in the exports directory, each in a folder named
+    after a hash of everything the file is rendered from. Exporting an
+    unchanged presentation returns the existing file.
+
+    Entries of a presentation are dropped when it is updated and the least
+    recently used entries are removed once they grow past
+    EXPORTS_MAX_SIZE_MB. Other files in the exports directory are left alone.
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, max_bytes: Optional[int] = None
+    ):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._presentation_keys: Optional[Dict[str, Set[str]]] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get_directory(self) -> str:
+        return self._directory or get_exports_directory()
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is None:
+            self._max_bytes = get_exports_max_bytes()
+        return self._max_bytes
+
+    def get_key(
+        self,
+        presentation_id: uuid.UUID,
+        layout: Optional[dict],
+        slides: List[SlideModel],
+        export_as: str,
+        layout_versions: Optional[Mapping[str, Optional[str]]] = None,
+    ) -> str:
+        # Entries belong to one presentation, whose title names the file and
+        # whose updates invalidate them
+        payload = json.dumps(
+            {
+                "version": EXPORT_ARTIFACT_CACHE_VERSION,
+                "presentation_id": str(presentation_id),
+                "layout": layout,
+                # Custom templates can be edited without changing the slides
+                "layout_versions": layout_versions or {},
+                "export_as": export_as,
+                # Settings that change the exported file
+                "image_dpi": get_export_image_dpi_env(),
+                "slides": [
+                    {
+                        "index": slide.index,
+                        "layout_group": slide.layout_group,
+                        "layout": slide.layout,
+                        "content": slide.content,
+                        "properties": slide.properties,
+                        "speaker_note": slide.speaker_note,
+                    }
+                    for slide in slides
+                ],
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_artifact_directory(self, key: str) -> str:
+        return os.path.join(self.get_directory(), key)
+
+    def _get_metadata_path(self, key: str) -> str:
+        return os.path.join(self._get_artifact_directory(key), ARTIFACT_METADATA_FILE)
+
+    def _read_metadata(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._get_metadata_path(key)) as metadata_file:
+                return json.load(metadata_file)
+        except (OSError, ValueError):
+            return None
+
+    def _get_presentation_keys(self) -> Dict[str, Set[str]]:
+        # Built from the metadata on disk so entries survive restarts
+        if self._presentation_keys is None:
+            self._presentation_keys = {}
+            with os.scandir(self.get_directory()) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    metadata = self._read_metadata(entry.name)
+                    if metadata:
+                        self._presentation_keys.setdefault(
+                            metadata["presentation_id"], set()
+                        ).add(entry.name)
+        return self._presentation_keys
+
+    def get(self, key: str) -> Optional[str]:
+        metadata = self._read_metadata(key)
+        path = metadata and os.path.join(
+            self._get_artifact_directory(key), metadata["filename"]
+        )
+        if not path or not os.path.exists(path):
+            self.misses += 1
+            return None
+
+        # Marks the entry as recently used
+        os.utime(self._get_metadata_path(key))
+        self.hits += 1
+        return path
+
+    def get_artifact_path(self, key: str, filename: str) -> str:
+        artifact_directory = self._get_artifact_directory(key)
+        os.makedirs(artifact_directory, exist_ok=True)
+        return os.path.join(artifact_directory, filename)
+
+    def get_temp_path(self, key: str, filename: str) -> str:
+        # Concurrent exports of the same content must not write the same file
+        name, extension = os.path.splitext(filename)
+        return self.get_artifact_path(key, f".{name}-{uuid.uuid4()}{extension}")
+
+    def set(
+        self, key: str, presentation_id: uuid.UUID, path: str, filename: str
+    ) -> str:
+        """Moves the exported file at path into the entry of key as filename"""
+        artifact_path = self.get_artifact_path(key, filename)
+        os.replace(path, artifact_path)
+
+        with open(self._get_metadata_path(key), "w") as metadata_file:
+            json.dump(
+                {"presentation_id": str(presentation_id), "filename": filename},
+                metadata_file,
+            )
+        self._get_presentation_keys().setdefault(str(presentation_id), set()).add(key)
+
+        self._evict(keep=key)
+        return artifact_path
+
+    def invalidate(self, presentation_id: uuid.UUID):
+        keys = self._get_presentation_keys().pop(str(presentation_id), set())
+        for key in keys:
+            shutil.rmtree(self._get_artifact_directory(key), ignore_errors=True)
+            self.invalidations += 1
+
+    def _get_entry_size(self, path: str) -> int:
+        size = 0
+        with os.scandir(path) as entries:
+            for entry in entries:
+                size += entry.stat().st_size if entry.is_file() else 0
+        return size
+
+    def _evict(self, keep: Optional[str] = None):
+        entries = []
+        total_size = 0
+        # Only entries with metadata were created by the cache, other files
+        # may be exports whose paths were just returned to clients
+        with os.scandir(self.get_directory()) as directory_entries:
+            for directory_entry in directory_entries:
+                name = directory_entry.name
+                if not directory_entry.is_dir():
+                    continue
+                try:
+                    accessed_at = os.path.getmtime(self._get_metadata_path(name))
+                    size = self._get_entry_size(directory_entry.path)
+                except OSError:
+                    continue
+                total_size += size
+                if name != keep:
+                    entries.append((accessed_at, name, directory_entry.path, size))
+
+        for _, name, path, size in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            for keys in self._get_presentation_keys().values():
+                keys.discard(name)
+            total_size -= size
+            self.evictions += 1
+
+    def get_stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+EXPORT_ARTIFACT_CACHE = ExportArtifactCache()
@@ -0,0 +1,119 @@
+import asyncio
+import copy
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import select
+
+from models.sql.presentation_generation_checkpoint import (
+    PresentationGenerationCheckpointModel,
+)
+from services.database import async_session_maker
+
+
+class GenerationCheckpoints:
+    """
+    Saves each completed stage of an async presentation generation, so a
+    retried or resumed generation can reuse it instead of generating it again.
+
+    Checkpoints are written with their own sessions, as slides and assets
+    complete concurrently. Does nothing when there is no task id.
+    """
+
+    def __init__(
+        self,
+        task_id: Optional[str],
+        session_maker: async_sessionmaker = async_session_maker,
+    ):
+        self.task_id = task_id
+        self.session_maker = session_maker
+        self.reused_stages: List[str] = []
+
+        self._data: Dict[str, dict] = {}
+        self._lock = asyncio.Lock()
+
+    async def load(self):
+        if not self.task_id:
+            return
+
+        async with self.session_maker() as sql_session:
+            checkpoints = await sql_session.scalars(
+                select(PresentationGenerationCheckpointModel).where(
+                    PresentationGenerationCheckpointModel.task_id == self.task_id
+                )
+            )
+            self._data = {
+                checkpoint.stage: checkpoint.data
+                for checkpoint in checkpoints
+                if checkpoint.data is not None
+            }
+
+    async def reuse(self, stage: str) -> Optional[dict]:
+        data = self._data.get(stage)
+        if data is None:
+            return None
+
+        print(f"Reusing checkpoint {stage} of task {self.task_id}")
+        self.reused_stages.append(stage)
+        await self._update(stage, reused=True)
+        return copy.deepcopy(data)
+
+    async def save(self, stage: str, data: dict):
+        if not self.task_id:
+            return
+
+        # Callers keep mutating the data after saving it
+        data = copy.deepcopy(data)
+        self._data[stage] = data
+        async with self._lock:
+            async with self.session_maker() as sql_session:
+                await sql_session.merge(
+                    PresentationGenerationCheckpointModel(
+                        task_id=self.task_id, stage=stage, data=data
+                    )
+                )
+                await sql_session.commit()
+
+    async def complete(self):
+        """
+        Drops checkpointed data but keeps the stages for status reporting.
+        """
+        self._data = {}
+        await self._update(None, data=None)
+
+    async def _update(self, stage: Optional[str], **values):
+        if not self.task_id:
+            return
+
+        query = update(PresentationGenerationCheckpointModel).where(
+            PresentationGenerationCheckpointModel.task_id == self.task_id
+        )
+        if stage:
+            query = query.where(PresentationGenerationCheckpointModel.stage == stage)
+
+        async with self._lock:
+            async with self.session_maker() as sql_session:
+                await sql_session.execute(
+                    query.values(**values).execution_options(synchronize_session=False)
+                )
+                await sql_session.commit()
+
+
+async def get_checkpoint_stages(
+    sql_session: AsyncSession, task_id: str
+) -> Tuple[List[str], List[str]]:
+    """
+    Returns checkpointed and reused stages of a generation task.
+    """
+    checkpoints = (
+        await sql_session.scalars(
+            select(PresentationGenerationCheckpointModel)
+            .where(PresentationGenerationCheckpointModel.task_id == task_id)
+            .order_by(PresentationGenerationCheckpointModel.created_at)
+        )
+    ).all()
+    return (
+        [checkpoint.stage for checkpoint in checkpoints],
+        [checkpoint.stage for checkpoint in checkpoints if checkpoint.reused],
+    )
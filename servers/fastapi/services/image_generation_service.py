@@ -1,12 +1,12 @@
 import asyncio
 import os
-import aiohttp
 from google import genai
 from google.genai.types import GenerateContentConfig
 from openai import AsyncOpenAI
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
-from utils.download_helpers import download_file
+from services.network_asset_store import NETWORK_ASSET_STORE
+from utils.download_helpers import download_file, get_http_session
 from utils.get_env import get_pexels_api_key_env
 from utils.get_env import get_pixabay_api_key_env
 from utils.image_provider import (
@@ -64,6 +64,9 @@ class ImageGenerationService:
                 )
             if image_path:
                 if image_path.startswith("http"):
+                    # Downloaded while the presentation is generated so the
+                    # export finds it in the store
+                    NETWORK_ASSET_STORE.prefetch(image_path)
                     return image_path
                 elif os.path.exists(image_path):
                     return ImageAsset(
@@ -112,20 +115,18 @@ class ImageGenerationService:
         return image_path
 
     async def get_image_from_pexels(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://api.pexels.com/v1/search?query={prompt}&per_page=1",
-                headers={"Authorization": f"{get_pexels_api_key_env()}"},
-            )
+        async with get_http_session().get(
+            f"https://api.pexels.com/v1/search?query={prompt}&per_page=1",
+            headers={"Authorization": f"{get_pexels_api_key_env()}"},
+        ) as response:
             data = await response.json()
             image_url = data["photos"][0]["src"]["large"]
             return image_url
 
     async def get_image_from_pixabay(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://pixabay.com/api/?key={get_pixabay_api_key_env()}&q={prompt}&image_type=photo&per_page=3"
-            )
+        async with get_http_session().get(
+            f"https://pixabay.com/api/?key={get_pixabay_api_key_env()}&q={prompt}&image_type=photo&per_page=3"
+        ) as response:
             data = await response.json()
             image_url = data["hits"][0]["largeImageURL"]
             return image_url
@@ -0,0 +1,143 @@
+import asyncio
+from dataclasses import dataclass
+import time
+from typing import Awaitable, Callable, Dict, Optional
+import uuid
+
+from sqlalchemy import func, select
+
+from constants.presentation import LAYOUT_CACHE_TTL_SECONDS
+from models.presentation_layout import PresentationLayoutModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from services.database import async_session_maker
+
+FetchLayout = Callable[[str], Awaitable[PresentationLayoutModel]]
+
+
+@dataclass
+class LayoutCacheEntry:
+    layout: PresentationLayoutModel
+    version: Optional[str]
+    fetched_at: float
+
+
+async def get_layout_version(layout_name: str) -> Optional[str]:
+    """
+    Custom templates change whenever their layouts are saved. Version is
+    derived from their layout codes, so other processes see the change too.
+    """
+    if not layout_name.startswith("custom-"):
+        return None
+    try:
+        template_id = uuid.UUID(layout_name.replace("custom-", "", 1))
+    except ValueError:
+        return None
+
+    async with async_session_maker() as sql_session:
+        count, updated_at = (
+            await sql_session.execute(
+                select(
+                    func.count(PresentationLayoutCodeModel.id),
+                    func.max(PresentationLayoutCodeModel.updated_at),
+                ).where(PresentationLayoutCodeModel.presentation == template_id)
+            )
+        ).one()
+    return f"{count}:{updated_at}"
+
+
+class LayoutCache:
+    """
+    Caches layouts by name, as fetching one renders the template in Next.js.
+
+    Entries are refetched when their version changes or once older than ttl.
+    Concurrent requests for the same layout share one fetch.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = LAYOUT_CACHE_TTL_SECONDS,
+        get_version: Callable[[str], Awaitable[Optional[str]]] = get_layout_version,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.get_version = get_version
+
+        self._entries: Dict[str, LayoutCacheEntry] = {}
+        self._loading: Dict[str, asyncio.Task] = {}
+        # Loads started before an invalidation are not cached
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.shared_loads = 0
+
+    async def get(
+        self, layout_name: str, fetch_layout: FetchLayout
+    ) -> PresentationLayoutModel:
+        version = await self.get_version(layout_name)
+
+        entry = self._entries.get(layout_name)
+        if (
+            entry
+            and entry.version == version
+            and time.monotonic() - entry.fetched_at < self.ttl_seconds
+        ):
+            self.hits += 1
+            return entry.layout.model_copy(deep=True)
+
+        task = self._loading.get(layout_name)
+        if task and task.get_loop() is asyncio.get_running_loop():
+            self.shared_loads += 1
+        else:
+            task = asyncio.create_task(
+                self._load(layout_name, version, fetch_layout, self._generation)
+            )
+            self._loading[layout_name] = task
+            task.add_done_callback(
+                lambda _: (
+                    self._loading.pop(layout_name, None)
+                    if self._loading.get(layout_name) is task
+                    else None
+                )
+            )
+
+        # Cancelling one request must not cancel the fetch of the others
+        layout = await asyncio.shield(task)
+        return layout.model_copy(deep=True)
+
+    async def _load(
+        self,
+        layout_name: str,
+        version: Optional[str],
+        fetch_layout: FetchLayout,
+        generation: int,
+    ) -> PresentationLayoutModel:
+        layout = await fetch_layout(layout_name)
+        self.misses += 1
+
+        if generation == self._generation:
+            self._entries[layout_name] = LayoutCacheEntry(
+                layout=layout,
+                version=version,
+                fetched_at=time.monotonic(),
+            )
+        return layout
+
+    def invalidate(self, layout_name: Optional[str] = None):
+        self._generation += 1
+        if layout_name:
+            self._entries.pop(layout_name, None)
+            self._loading.pop(layout_name, None)
+        else:
+            self._entries.clear()
+            self._loading.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_loads": self.shared_loads,
+        }
+
+
+LAYOUT_CACHE = LayoutCache()
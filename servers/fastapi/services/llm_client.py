@@ -39,9 +39,14 @@ from models.llm_tool_call import (
     OpenAIToolCallFunction,
 )
 from models.llm_tools import LLMDynamicTool, LLMTool
+from models.structured_stream_chunk import StructuredStreamChunk
+from services.llm_client_registry import LLM_CLIENT_REGISTRY
+from services.llm_rate_limiter import LLM_RATE_LIMITER
+from services.llm_response_cache import LLM_RESPONSE_CACHE
 from services.llm_tool_calls_handler import LLMToolCallsHandler
 from utils.async_iterator import iterator_to_async
 from utils.dummy_functions import do_nothing_async
+from utils.incremental_json_parser import IncrementalJsonParser
 from utils.get_env import (
     get_anthropic_api_key_env,
     get_custom_llm_api_key_env,
@@ -66,6 +71,7 @@ class LLMClient:
     def __init__(self):
         self.llm_provider = get_llm_provider()
         self._client = self._get_client()
+        LLM_CLIENT_REGISTRY.hold(self, self._client)
         self.tool_calls_handler = LLMToolCallsHandler(self)
 
     # ? Use tool calls
@@ -87,6 +93,34 @@ class LLMClient:
     def disable_thinking(self) -> bool:
         return parse_bool_or_none(get_disable_thinking_env()) or False
 
+    # ? Rate limits
+    def _estimate_tokens(
+        self, messages: List[LLMMessage], max_tokens: Optional[int] = None
+    ) -> int:
+        # Roughly 4 characters per token, good enough for tokens per minute limits
+        characters = sum(
+            len(message.content)
+            for message in messages
+            if isinstance(getattr(message, "content", None), str)
+        )
+        return characters // 4 + (max_tokens or 0)
+
+    # ? Response cache
+    def _get_response_cache_key(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool,
+        tools: Optional[List],
+    ) -> Optional[str]:
+        # Tool calls (e.g. web search) can change the response, so skip caching
+        if tools or not LLM_RESPONSE_CACHE.is_enabled():
+            return None
+        return LLM_RESPONSE_CACHE.get_key(
+            self.llm_provider, model, messages, response_format, strict
+        )
+
     # ? Clients
     def _get_client(self):
         match self.llm_provider:
@@ -112,7 +146,7 @@ class LLMClient:
                 status_code=400,
                 detail="OpenAI API Key is not set",
             )
-        return AsyncOpenAI()
+        return LLM_CLIENT_REGISTRY.get_openai_client(get_openai_api_key_env())
 
     def _get_google_client(self):
         if not get_google_api_key_env():
@@ -120,7 +154,7 @@ class LLMClient:
                 status_code=400,
                 detail="Google API Key is not set",
             )
-        return genai.Client()
+        return LLM_CLIENT_REGISTRY.get_google_client(get_google_api_key_env())
 
     def _get_anthropic_client(self):
         if not get_anthropic_api_key_env():
@@ -128,12 +162,13 @@ class LLMClient:
                 status_code=400,
                 detail="Anthropic API Key is not set",
             )
-        return AsyncAnthropic()
+        return LLM_CLIENT_REGISTRY.get_anthropic_client(get_anthropic_api_key_env())
 
     def _get_ollama_client(self):
-        return AsyncOpenAI(
-            base_url=(get_ollama_url_env() or "http://localhost:11434") + "/v1",
+        return LLM_CLIENT_REGISTRY.get_openai_client(
             api_key="ollama",
+            base_url=(get_ollama_url_env() or "http://localhost:11434") + "/v1",
+            provider=LLMProvider.OLLAMA,
         )
 
     def _get_custom_client(self):
@@ -142,9 +177,10 @@ class LLMClient:
                 status_code=400,
                 detail="Custom LLM URL is not set",
             )
-        return AsyncOpenAI(
-            base_url=get_custom_llm_url_env(),
+        return LLM_CLIENT_REGISTRY.get_openai_client(
             api_key=get_custom_llm_api_key_env() or "null",
+            base_url=get_custom_llm_url_env(),
+            provider=LLMProvider.CUSTOM,
         )
 
     # ? Prompts
@@ -403,6 +439,20 @@ class LLMClient:
         messages: List[LLMMessage],
         max_tokens: Optional[int] = None,
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+    ):
+        return await LLM_RATE_LIMITER.run(
+            self.llm_provider,
+            model,
+            self._estimate_tokens(messages, max_tokens),
+            lambda: self._generate(model, messages, max_tokens, tools),
+        )
+
+    async def _generate(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
     ):
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
@@ -774,6 +824,35 @@ class LLMClient:
         strict: bool = False,
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
         max_tokens: Optional[int] = None,
+    ) -> dict:
+        cache_key = self._get_response_cache_key(
+            model, messages, response_format, strict, tools
+        )
+        if cache_key:
+            cached_content = await LLM_RESPONSE_CACHE.get(cache_key)
+            if cached_content is not None:
+                return dict(dirtyjson.loads(cached_content))
+
+        content = await LLM_RATE_LIMITER.run(
+            self.llm_provider,
+            model,
+            self._estimate_tokens(messages, max_tokens),
+            lambda: self._generate_structured(
+                model, messages, response_format, strict, tools, max_tokens
+            ),
+        )
+        if cache_key:
+            await LLM_RESPONSE_CACHE.set(cache_key, json.dumps(content))
+        return content
+
+    async def _generate_structured(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool = False,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        max_tokens: Optional[int] = None,
     ) -> dict:
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
@@ -1094,6 +1173,20 @@ class LLMClient:
         messages: List[LLMMessage],
         max_tokens: Optional[int] = None,
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+    ):
+        return LLM_RATE_LIMITER.stream(
+            self.llm_provider,
+            model,
+            self._estimate_tokens(messages, max_tokens),
+            lambda: self._stream(model, messages, max_tokens, tools),
+        )
+
+    def _stream(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
     ):
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
@@ -1510,6 +1603,29 @@ class LLMClient:
             depth=depth,
         )
 
+    async def _stream_structured_with_cache(
+        self, cache_key: str, stream: AsyncGenerator[str, None]
+    ) -> AsyncGenerator[str, None]:
+        cached_content = await LLM_RESPONSE_CACHE.get(cache_key)
+        if cached_content is not None:
+            for chunk in LLM_RESPONSE_CACHE.iter_chunks(cached_content):
+                yield chunk
+            return
+
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+
+        await LLM_RESPONSE_CACHE.set_streamed(cache_key, "".join(chunks))
+
+    async def _stream_structured_incremental(
+        self, stream: AsyncGenerator[str, None], incremental_path: str
+    ) -> AsyncGenerator[StructuredStreamChunk, None]:
+        parser = IncrementalJsonParser(incremental_path)
+        async for chunk in stream:
+            yield StructuredStreamChunk(chunk=chunk, items=parser.feed(chunk))
+
     def stream_structured(
         self,
         model: str,
@@ -1518,6 +1634,52 @@ class LLMClient:
         strict: bool = False,
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
         max_tokens: Optional[int] = None,
+        incremental_path: Optional[str] = None,
+    ):
+        """
+        Streams structured output as text chunks. If incremental_path is given
+        (e.g. "slides[*]"), StructuredStreamChunk objects are yielded instead,
+        carrying every element of that array completed by the chunk.
+        """
+        stream = self._stream_structured_text(
+            model, messages, response_format, strict, tools, max_tokens
+        )
+        if incremental_path:
+            return self._stream_structured_incremental(stream, incremental_path)
+        return stream
+
+    def _stream_structured_text(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool = False,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        max_tokens: Optional[int] = None,
+    ):
+        stream = LLM_RATE_LIMITER.stream(
+            self.llm_provider,
+            model,
+            self._estimate_tokens(messages, max_tokens),
+            lambda: self._stream_structured(
+                model, messages, response_format, strict, tools, max_tokens
+            ),
+        )
+        cache_key = self._get_response_cache_key(
+            model, messages, response_format, strict, tools
+        )
+        if cache_key:
+            return self._stream_structured_with_cache(cache_key, stream)
+        return stream
+
+    def _stream_structured(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool = False,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        max_tokens: Optional[int] = None,
     ):
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
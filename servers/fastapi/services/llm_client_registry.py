@@ -0,0 +1,178 @@
+import asyncio
+from collections import OrderedDict
+import threading
+import weakref
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient as AnthropicHttpxClient
+from google import genai
+from google.genai.types import HttpOptions as GoogleHttpOptions
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient as OpenAIHttpxClient
+
+from constants.llm import (
+    LLM_CLIENT_REGISTRY_MAX_CLIENTS,
+    LLM_HTTP_KEEPALIVE_EXPIRY,
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+)
+from enums.llm_provider import LLMProvider
+
+
+def get_llm_http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+async def close_llm_client(client: Any):
+    if isinstance(client, genai.Client):
+        client.close()
+        await client.aio.aclose()
+    else:
+        await client.close()
+
+
+class LLMClientRegistry:
+    """
+    Hands out long-lived provider clients so that every LLMClient shares one
+    HTTP connection pool per provider instead of opening a new one per call.
+
+    A client is keyed by provider, base url, api key and the running event loop,
+    and the least recently used clients are evicted past max_clients. An evicted
+    client is closed once no LLMClient holds it anymore, so in-flight requests
+    finish on it first.
+    """
+
+    def __init__(self, max_clients: int = LLM_CLIENT_REGISTRY_MAX_CLIENTS):
+        self.max_clients = max_clients
+        self._clients: OrderedDict[tuple, Any] = OrderedDict()
+        # Holders and evicted clients are tracked by id of the client
+        self._holders: Dict[int, int] = {}
+        self._evicted: Dict[int, Tuple[Any, Optional[asyncio.AbstractEventLoop]]] = {}
+        self._closing: Set[asyncio.Task] = set()
+        # Reentrant, as releases can run from garbage collection inside the lock
+        self._lock = threading.RLock()
+
+    def _get_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        # Async http clients are bound to the loop they were first used in
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _get_or_create(
+        self,
+        provider: LLMProvider,
+        base_url: Optional[str],
+        api_key: Optional[str],
+        factory: Callable[[], Any],
+    ):
+        key = (provider, base_url, api_key, self._get_loop())
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                return client
+
+            client = factory()
+            self._clients[key] = client
+
+            for each in [
+                each for each in self._clients if each[3] and each[3].is_closed()
+            ]:
+                self._evict(each)
+            while len(self._clients) > self.max_clients:
+                self._evict(next(iter(self._clients)))
+            return client
+
+    def _evict(self, key: tuple):
+        client = self._clients.pop(key)
+        if self._holders.get(id(client)):
+            self._evicted[id(client)] = (client, key[3])
+        else:
+            self._close(client, key[3])
+
+    def _close(self, client: Any, loop: Optional[asyncio.AbstractEventLoop]):
+        # Pools of a loop that is gone (or never ran) are dropped with it
+        if loop is None or loop.is_closed() or not loop.is_running():
+            return
+
+        if self._get_loop() is loop:
+            task = loop.create_task(close_llm_client(client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(close_llm_client(client), loop)
+
+    def hold(self, holder: Any, client: Any):
+        """
+        Keeps client open while holder is alive, even if it gets evicted.
+        """
+        with self._lock:
+            self._holders[id(client)] = self._holders.get(id(client), 0) + 1
+        weakref.finalize(holder, self.release, client)
+
+    def release(self, client: Any):
+        with self._lock:
+            holders = self._holders.get(id(client), 0) - 1
+            if holders > 0:
+                self._holders[id(client)] = holders
+                return
+
+            self._holders.pop(id(client), None)
+            evicted = self._evicted.pop(id(client), None)
+            if evicted:
+                self._close(*evicted)
+
+    def get_openai_client(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        provider: LLMProvider = LLMProvider.OPENAI,
+    ) -> AsyncOpenAI:
+        return self._get_or_create(
+            provider,
+            base_url,
+            api_key,
+            lambda: AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=OpenAIHttpxClient(limits=get_llm_http_limits()),
+            ),
+        )
+
+    def get_anthropic_client(self, api_key: Optional[str]) -> AsyncAnthropic:
+        return self._get_or_create(
+            LLMProvider.ANTHROPIC,
+            None,
+            api_key,
+            lambda: AsyncAnthropic(
+                api_key=api_key,
+                http_client=AnthropicHttpxClient(limits=get_llm_http_limits()),
+            ),
+        )
+
+    def get_google_client(self, api_key: Optional[str]) -> genai.Client:
+        return self._get_or_create(
+            LLMProvider.GOOGLE,
+            None,
+            api_key,
+            lambda: genai.Client(
+                api_key=api_key,
+                http_options=GoogleHttpOptions(
+                    client_args={"limits": get_llm_http_limits()},
+                    async_client_args={"limits": get_llm_http_limits()},
+                ),
+            ),
+        )
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._clients):
+                self._evict(key)
+
+
+LLM_CLIENT_REGISTRY = LLMClientRegistry()
@@ -0,0 +1,343 @@
+import asyncio
+import time
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Optional,
+    Tuple,
+)
+from collections import deque
+
+from constants.llm import (
+    LLM_CONCURRENCY_DECREASE_FACTOR,
+    LLM_DEFAULT_MAX_CONCURRENCY,
+    LLM_LATENCY_DECREASE_FACTOR,
+    LLM_LATENCY_DEGRADATION_FACTOR,
+    LLM_MIN_CONCURRENCY,
+    LLM_RATE_LIMIT_DEFAULT_BACKOFF_SECONDS,
+    LLM_RATE_LIMIT_MAX_RETRIES,
+)
+from enums.llm_provider import LLMProvider
+from utils.get_env import (
+    get_llm_max_concurrency_env,
+    get_llm_requests_per_minute_env,
+    get_llm_tokens_per_minute_env,
+)
+from utils.parsers import parse_int_or_none
+
+
+RATE_LIMIT_STATUS_CODES = (429, 529)
+
+
+def get_rate_limit_status_code(e: Exception) -> Optional[int]:
+    # OpenAI and Anthropic errors expose status_code, Google errors expose code
+    status_code = getattr(e, "status_code", None) or getattr(e, "code", None)
+    if status_code in RATE_LIMIT_STATUS_CODES:
+        return status_code
+    return None
+
+
+def get_retry_after_seconds(e: Exception) -> Optional[float]:
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+    try:
+        return max(float(retry_after), 0)
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self.tokens = float(per_minute)
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.per_minute,
+            self.tokens + (now - self.updated_at) * self.per_minute / 60,
+        )
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1):
+        amount = min(amount, self.per_minute)
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) * 60 / self.per_minute)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency and rate limiter for one provider and model.
+
+    Concurrency grows additively on healthy responses and shrinks
+    multiplicatively on 429/529 responses or when latency degrades.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+
+        self.requests_bucket: Optional[TokenBucket] = None
+        self.tokens_bucket: Optional[TokenBucket] = None
+
+        self.latency_ewma: Optional[float] = None
+        self.total_requests = 0
+        self.rate_limited_requests = 0
+
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def configure(
+        self,
+        max_concurrency: int,
+        requests_per_minute: Optional[int],
+        tokens_per_minute: Optional[int],
+    ):
+        if max_concurrency != self.max_concurrency:
+            self.max_concurrency = max_concurrency
+            self.concurrency = min(self.concurrency, max_concurrency)
+            self._wake_waiters()
+
+        if (self.requests_bucket and self.requests_bucket.per_minute) != (
+            requests_per_minute or None
+        ):
+            self.requests_bucket = (
+                TokenBucket(requests_per_minute) if requests_per_minute else None
+            )
+        if (self.tokens_bucket and self.tokens_bucket.per_minute) != (
+            tokens_per_minute or None
+        ):
+            self.tokens_bucket = (
+                TokenBucket(tokens_per_minute) if tokens_per_minute else None
+            )
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < max(int(self.concurrency), LLM_MIN_CONCURRENCY)
+
+    def _wake_waiters(self):
+        available = max(int(self.concurrency), LLM_MIN_CONCURRENCY) - self.in_flight
+        while self._waiters and available > 0:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                available -= 1
+
+    async def acquire(self, estimated_tokens: int):
+        while True:
+            wait_for = self.blocked_until - time.monotonic()
+            if wait_for > 0:
+                await asyncio.sleep(wait_for)
+                continue
+            if self._has_capacity():
+                break
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass the wake up on to the next waiter
+                self._wake_waiters()
+                raise
+
+        self.in_flight += 1
+        try:
+            if self.requests_bucket:
+                await self.requests_bucket.acquire(1)
+            if self.tokens_bucket:
+                await self.tokens_bucket.acquire(estimated_tokens)
+        except BaseException:
+            self.release()
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def on_success(self, latency: float):
+        self.total_requests += 1
+        if (
+            self.latency_ewma is not None
+            and latency > self.latency_ewma * LLM_LATENCY_DEGRADATION_FACTOR
+        ):
+            self.concurrency = max(
+                LLM_MIN_CONCURRENCY, self.concurrency * LLM_LATENCY_DECREASE_FACTOR
+            )
+        else:
+            self.concurrency = min(
+                self.max_concurrency, self.concurrency + 1 / self.concurrency
+            )
+        self.latency_ewma = (
+            latency
+            if self.latency_ewma is None
+            else self.latency_ewma * 0.8 + latency * 0.2
+        )
+        self._wake_waiters()
+
+    def on_rate_limited(self, retry_after: Optional[float]) -> float:
+        self.total_requests += 1
+        self.rate_limited_requests += 1
+        self.concurrency = max(
+            LLM_MIN_CONCURRENCY, self.concurrency * LLM_CONCURRENCY_DECREASE_FACTOR
+        )
+        backoff = (
+            retry_after
+            if retry_after is not None
+            else LLM_RATE_LIMIT_DEFAULT_BACKOFF_SECONDS
+        )
+        self.blocked_until = max(self.blocked_until, time.monotonic() + backoff)
+        return backoff
+
+    def get_state(self) -> dict:
+        return {
+            "concurrency": round(self.concurrency, 2),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": len([each for each in self._waiters if not each.done()]),
+            "blocked_for_seconds": round(
+                max(self.blocked_until - time.monotonic(), 0), 2
+            ),
+            "latency_ewma_seconds": (
+                round(self.latency_ewma, 3) if self.latency_ewma is not None else None
+            ),
+            "requests_per_minute": (
+                self.requests_bucket.per_minute if self.requests_bucket else None
+            ),
+            "tokens_per_minute": (
+                self.tokens_bucket.per_minute if self.tokens_bucket else None
+            ),
+            "total_requests": self.total_requests,
+            "rate_limited_requests": self.rate_limited_requests,
+        }
+
+
+class LLMRateLimiter:
+    def __init__(self):
+        self._limiters: Dict[
+            asyncio.AbstractEventLoop,
+            Dict[Tuple[LLMProvider, str], AdaptiveLimiter],
+        ] = {}
+
+    def _get_loop_limiters(self) -> Dict[Tuple[LLMProvider, str], AdaptiveLimiter]:
+        # Waiters are futures of the running loop, so each loop keeps its own state
+        loop = asyncio.get_running_loop()
+        for each_loop in [each for each in self._limiters if each.is_closed()]:
+            self._limiters.pop(each_loop, None)
+        return self._limiters.setdefault(loop, {})
+
+    def get_limiter(self, provider: LLMProvider, model: str) -> AdaptiveLimiter:
+        limiters = self._get_loop_limiters()
+        max_concurrency = max(
+            parse_int_or_none(get_llm_max_concurrency_env())
+            or LLM_DEFAULT_MAX_CONCURRENCY,
+            LLM_MIN_CONCURRENCY,
+        )
+        limiter = limiters.get((provider, model))
+        if not limiter:
+            limiter = AdaptiveLimiter(max_concurrency)
+            limiters[(provider, model)] = limiter
+
+        limiter.configure(
+            max_concurrency,
+            parse_int_or_none(get_llm_requests_per_minute_env()),
+            parse_int_or_none(get_llm_tokens_per_minute_env()),
+        )
+        return limiter
+
+    async def run(
+        self,
+        provider: LLMProvider,
+        model: str,
+        estimated_tokens: int,
+        call: Callable[[], Awaitable[Any]],
+    ):
+        limiter = self.get_limiter(provider, model)
+        attempt = 0
+        while True:
+            await limiter.acquire(estimated_tokens)
+            started_at = time.monotonic()
+            try:
+                result = await call()
+            except Exception as e:
+                if (
+                    get_rate_limit_status_code(e) is None
+                    or attempt >= LLM_RATE_LIMIT_MAX_RETRIES
+                ):
+                    raise
+                limiter.on_rate_limited(get_retry_after_seconds(e))
+                attempt += 1
+                continue
+            finally:
+                limiter.release()
+
+            limiter.on_success(time.monotonic() - started_at)
+            return result
+
+    async def stream(
+        self,
+        provider: LLMProvider,
+        model: str,
+        estimated_tokens: int,
+        get_stream: Callable[[], AsyncGenerator[Any, None]],
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Holds a concurrency slot until the stream is exhausted or closed,
+        including while the caller handles each chunk. Callers should keep
+        per chunk work short and close the stream when they stop reading
+        early, instead of leaving it to garbage collection.
+        """
+        limiter = self.get_limiter(provider, model)
+        attempt = 0
+        while True:
+            await limiter.acquire(estimated_tokens)
+            started_at = time.monotonic()
+            first_chunk_latency = None
+            try:
+                async for chunk in get_stream():
+                    if first_chunk_latency is None:
+                        first_chunk_latency = time.monotonic() - started_at
+                    yield chunk
+            except Exception as e:
+                # Streams can only be retried if nothing was sent to the caller yet
+                if (
+                    first_chunk_latency is not None
+                    or get_rate_limit_status_code(e) is None
+                    or attempt >= LLM_RATE_LIMIT_MAX_RETRIES
+                ):
+                    raise
+                limiter.on_rate_limited(get_retry_after_seconds(e))
+                attempt += 1
+                continue
+            finally:
+                limiter.release()
+
+            # Time to first chunk is comparable across short and long streams
+            limiter.on_success(
+                first_chunk_latency
+                if first_chunk_latency is not None
+                else time.monotonic() - started_at
+            )
+            return
+
+    def get_state(self) -> dict:
+        return {
+            f"{provider.value}/{model}": limiter.get_state()
+            for (provider, model), limiter in self._get_loop_limiters().items()
+        }
+
+
+LLM_RATE_LIMITER = LLMRateLimiter()
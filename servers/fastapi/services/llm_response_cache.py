@@ -0,0 +1,244 @@
+import asyncio
+from collections import OrderedDict
+from contextvars import ContextVar
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterator, List, Optional
+
+import dirtyjson
+
+from constants.llm import (
+    LLM_RESPONSE_CACHE_DISK_MAX_BYTES,
+    LLM_RESPONSE_CACHE_MEMORY_ITEMS,
+    LLM_RESPONSE_CACHE_REPLAY_CHUNK_SIZE,
+    LLM_RESPONSE_CACHE_TTL_SECONDS,
+)
+from enums.llm_provider import LLMProvider
+from models.llm_message import LLMMessage
+from utils.asset_directory_utils import get_cache_directory
+from utils.get_env import get_llm_response_cache_env
+from utils.parsers import parse_bool_or_none
+
+
+# Set per request by LLMCacheBypassMiddleware
+LLM_CACHE_BYPASS: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+# Prompts embed the current date and time, only the date is kept in cache keys
+DATETIME_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})[ T]\d{2}:\d{2}:\d{2}")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_cache_text(text: str) -> str:
+    text = DATETIME_PATTERN.sub(r"\1", text)
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+class LLMResponseCache:
+    """
+    Content addressed cache for structured LLM responses.
+
+    Responses are stored as json text in an in-memory LRU tier backed by a
+    SQLite tier on disk, which is evicted by TTL and total size.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        memory_items: int = LLM_RESPONSE_CACHE_MEMORY_ITEMS,
+        max_disk_bytes: int = LLM_RESPONSE_CACHE_DISK_MAX_BYTES,
+        ttl_seconds: int = LLM_RESPONSE_CACHE_TTL_SECONDS,
+    ):
+        self._db_path = db_path
+        self._memory_items = memory_items
+        self._max_disk_bytes = max_disk_bytes
+        self._ttl_seconds = ttl_seconds
+
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.writes = 0
+
+    def is_enabled(self) -> bool:
+        return parse_bool_or_none(get_llm_response_cache_env()) or False
+
+    def is_bypassed(self) -> bool:
+        return LLM_CACHE_BYPASS.get()
+
+    def get_key(
+        self,
+        provider: LLMProvider,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool,
+    ) -> str:
+        normalized_messages = []
+        for message in messages:
+            dumped = message.model_dump(mode="json")
+            if isinstance(dumped.get("content"), str):
+                dumped["content"] = normalize_cache_text(dumped["content"])
+            normalized_messages.append(dumped)
+
+        payload = json.dumps(
+            {
+                "provider": provider.value,
+                "model": model,
+                "messages": normalized_messages,
+                "response_format": response_format,
+                "strict": strict,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ? Disk tier
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            db_path = self._db_path or os.path.join(
+                get_cache_directory(), "llm_responses.db"
+            )
+            self._connection = sqlite3.connect(db_path, check_same_thread=False)
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.commit()
+        return self._connection
+
+    def _get_from_disk(self, key: str) -> Optional[str]:
+        with self._lock:
+            connection = self._get_connection()
+            row = connection.execute(
+                "SELECT value, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+
+            now = time.time()
+            if now - row[1] > self._ttl_seconds:
+                connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                connection.commit()
+                return None
+
+            connection.execute(
+                "UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            connection.commit()
+            return row[0]
+
+    def _set_on_disk(self, key: str, value: str):
+        with self._lock:
+            connection = self._get_connection()
+            now = time.time()
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._evict_from_disk(connection, now)
+            connection.commit()
+
+    def _evict_from_disk(self, connection: sqlite3.Connection, now: float):
+        connection.execute(
+            "DELETE FROM llm_responses WHERE created_at < ?",
+            (now - self._ttl_seconds,),
+        )
+        total_size = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM llm_responses"
+        ).fetchone()[0]
+        if total_size <= self._max_disk_bytes:
+            return
+
+        keys_to_delete = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM llm_responses ORDER BY accessed_at ASC"
+        ):
+            if total_size <= self._max_disk_bytes:
+                break
+            keys_to_delete.append((key,))
+            total_size -= size
+        connection.executemany("DELETE FROM llm_responses WHERE key = ?", keys_to_delete)
+
+    # ? Memory tier
+    def _set_in_memory(self, key: str, value: str):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_items:
+            self._memory.popitem(last=False)
+
+    # ? Public
+    async def get(self, key: str) -> Optional[str]:
+        if self.is_bypassed():
+            self.bypasses += 1
+            return None
+
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return value
+
+        value = await asyncio.to_thread(self._get_from_disk, key)
+        if value is not None:
+            self._set_in_memory(key, value)
+            self.disk_hits += 1
+            return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str):
+        self._set_in_memory(key, value)
+        await asyncio.to_thread(self._set_on_disk, key, value)
+        self.writes += 1
+
+    async def set_streamed(self, key: str, text: str):
+        # Only complete responses are stored, partial streams are not replayed
+        try:
+            parsed = dirtyjson.loads(text)
+        except Exception:
+            return
+        if isinstance(parsed, dict):
+            await self.set(key, text)
+
+    def iter_chunks(self, value: str) -> Iterator[str]:
+        for start in range(0, len(value), LLM_RESPONSE_CACHE_REPLAY_CHUNK_SIZE):
+            yield value[start : start + LLM_RESPONSE_CACHE_REPLAY_CHUNK_SIZE]
+
+    def get_stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": self.is_enabled(),
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "writes": self.writes,
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+            "memory_items": len(self._memory),
+        }
+
+    def clear_memory(self):
+        self._memory.clear()
+
+
+LLM_RESPONSE_CACHE = LLMResponseCache()
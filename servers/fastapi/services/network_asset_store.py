@@ -0,0 +1,267 @@
+import asyncio
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+import uuid
+
+import aiohttp
+
+from constants.presentation import (
+    NETWORK_ASSET_REVALIDATE_SECONDS,
+    NETWORK_ASSET_STORE_MAX_BYTES,
+)
+from utils.asset_directory_utils import get_cache_directory
+from utils.download_helpers import get_http_session
+
+
+class NetworkAssetStore:
+    """
+    Persistent store for images referenced by url, e.g. stock photos.
+
+    Each url is downloaded once into a file named after the hash of its
+    bytes, so urls serving the same image share a file. Entries older than
+    revalidate_seconds are checked with a conditional request and the least
+    recently used ones are removed once the store grows past max_bytes.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = NETWORK_ASSET_STORE_MAX_BYTES,
+        revalidate_seconds: int = NETWORK_ASSET_REVALIDATE_SECONDS,
+    ):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._revalidate_seconds = revalidate_seconds
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        # Concurrent requests for the same url share one download
+        self._in_flight: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._prefetches: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.revalidations = 0
+        self.downloads = 0
+        self.failures = 0
+        self.evictions = 0
+
+    def get_directory(self) -> str:
+        if not self._directory:
+            self._directory = os.path.join(get_cache_directory(), "network_assets")
+        os.makedirs(self._directory, exist_ok=True)
+        return self._directory
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(
+                os.path.join(self.get_directory(), "assets.db"),
+                check_same_thread=False,
+            )
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS network_assets (
+                    url TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """)
+            self._connection.commit()
+        return self._connection
+
+    def _get_entry(self, url: str) -> Optional[tuple]:
+        with self._lock:
+            return (
+                self._get_connection()
+                .execute(
+                    "SELECT filename, etag, last_modified, fetched_at "
+                    "FROM network_assets WHERE url = ?",
+                    (url,),
+                )
+                .fetchone()
+            )
+
+    def _touch_entry(self, url: str, revalidated: bool = False):
+        with self._lock:
+            connection = self._get_connection()
+            now = time.time()
+            if revalidated:
+                connection.execute(
+                    "UPDATE network_assets SET fetched_at = ?, accessed_at = ? "
+                    "WHERE url = ?",
+                    (now, now, url),
+                )
+            else:
+                connection.execute(
+                    "UPDATE network_assets SET accessed_at = ? WHERE url = ?",
+                    (now, url),
+                )
+            connection.commit()
+
+    def _set_entry(
+        self,
+        url: str,
+        filename: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        size: int,
+    ):
+        with self._lock:
+            connection = self._get_connection()
+            now = time.time()
+            connection.execute(
+                "INSERT OR REPLACE INTO network_assets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, filename, etag, last_modified, size, now, now),
+            )
+            self._evict(connection)
+            connection.commit()
+
+    def _evict(self, connection: sqlite3.Connection):
+        # Urls sharing a file are counted once
+        total_size = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM "
+            "(SELECT size FROM network_assets GROUP BY filename)"
+        ).fetchone()[0]
+        if total_size <= self._max_bytes:
+            return
+
+        rows = connection.execute(
+            "SELECT url, filename, size FROM network_assets ORDER BY accessed_at ASC"
+        ).fetchall()
+        # The entry just added is the most recent one and is kept
+        for url, filename, size in rows[:-1]:
+            if total_size <= self._max_bytes:
+                break
+            connection.execute("DELETE FROM network_assets WHERE url = ?", (url,))
+            self.evictions += 1
+            shared = connection.execute(
+                "SELECT 1 FROM network_assets WHERE filename = ?", (filename,)
+            ).fetchone()
+            if shared:
+                continue
+            try:
+                os.remove(os.path.join(self.get_directory(), filename))
+            except OSError:
+                pass
+            total_size -= size
+
+    async def _save(
+        self, url: str, response: aiohttp.ClientResponse
+    ) -> Tuple[str, int]:
+        extension = os.path.splitext(urlparse(url).path)[1]
+        if not extension:
+            content_type = response.headers.get("Content-Type", "")
+            extension = mimetypes.guess_extension(content_type.split(";")[0]) or ""
+
+        temp_path = os.path.join(self.get_directory(), f".{uuid.uuid4()}")
+        content_hash = hashlib.sha256()
+        size = 0
+        try:
+            with open(temp_path, "wb") as file:
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    content_hash.update(chunk)
+                    file.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        filename = f"{content_hash.hexdigest()}{extension.lower()}"
+        os.replace(temp_path, os.path.join(self.get_directory(), filename))
+        return filename, size
+
+    async def _fetch(self, url: str) -> Optional[str]:
+        entry = await asyncio.to_thread(self._get_entry, url)
+        path = entry and os.path.join(self.get_directory(), entry[0])
+        if path and not os.path.exists(path):
+            entry = path = None
+
+        if entry and time.time() - entry[3] < self._revalidate_seconds:
+            await asyncio.to_thread(self._touch_entry, url)
+            self.hits += 1
+            return path
+
+        headers = {}
+        if entry and entry[1]:
+            headers["If-None-Match"] = entry[1]
+        if entry and entry[2]:
+            headers["If-Modified-Since"] = entry[2]
+
+        try:
+            async with get_http_session().get(url, headers=headers) as response:
+                if entry and response.status == 304:
+                    await asyncio.to_thread(self._touch_entry, url, True)
+                    self.revalidations += 1
+                    return path
+                if response.status != 200:
+                    print(f"Failed to fetch {url}. HTTP status: {response.status}")
+                    self.failures += 1
+                    # A stale copy is better than no image
+                    return path
+
+                filename, size = await self._save(url, response)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            self.failures += 1
+            return path
+
+        await asyncio.to_thread(
+            self._set_entry, url, filename, etag, last_modified, size
+        )
+        self.downloads += 1
+        return os.path.join(self.get_directory(), filename)
+
+    async def fetch(self, url: str) -> Optional[str]:
+        """Returns the local path of the asset at url, downloading it if needed"""
+        key = (id(asyncio.get_running_loop()), url)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(url))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def fetch_many(self, urls: List[str]) -> List[Optional[str]]:
+        results = await asyncio.gather(
+            *[self.fetch(url) for url in urls], return_exceptions=True
+        )
+        return [None if isinstance(each, BaseException) else each for each in results]
+
+    def prefetch(self, url: str):
+        """Starts fetching url in the background, e.g. while slides are generated"""
+        task = asyncio.create_task(self.fetch(url))
+        self._prefetches.add(task)
+        task.add_done_callback(self._prefetches.discard)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            assets, size = (
+                self._get_connection()
+                .execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM "
+                    "(SELECT size FROM network_assets GROUP BY filename)"
+                )
+                .fetchone()
+            )
+        return {
+            "assets": assets,
+            "size_bytes": size,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "downloads": self.downloads,
+            "failures": self.failures,
+            "evictions": self.evictions,
+        }
+
+
+NETWORK_ASSET_STORE = NetworkAssetStore()
@@ -0,0 +1,246 @@
+import re
+from typing import Dict, List, Optional
+import zipfile
+
+from lxml import etree
+from pptx import Presentation
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.shapes.base import BaseShape
+from pptx.shapes.group import GroupShape
+
+from utils.get_env import get_native_office_extraction_env
+from utils.parsers import parse_bool_or_none
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+M = "{http://schemas.openxmlformats.org/officeDocument/2006/math}"
+
+# Content Docling handles and this extractor doesn't
+UNUSUAL_DOCX_TAGS = {
+    f"{W}txbxContent": "text boxes",
+    f"{M}oMath": "equations",
+    f"{W}object": "embedded objects",
+    f"{W}altChunk": "imported content",
+}
+TITLE_PLACEHOLDERS = {PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE}
+LIST_PLACEHOLDERS = {PP_PLACEHOLDER.BODY, PP_PLACEHOLDER.OBJECT}
+
+
+class UnusualContentError(Exception):
+    pass
+
+
+def is_native_office_extraction_enabled() -> bool:
+    enabled = parse_bool_or_none(get_native_office_extraction_env())
+    return True if enabled is None else enabled
+
+
+def get_heading(text: str, level: int) -> str:
+    # Same levels as Docling, the title is # and sections start at ##
+    return f"{'#' * min(level, 6)} {text}"
+
+
+def get_markdown_table(rows: List[List[str]]) -> str:
+    rows = [row for row in rows if any(cell.strip() for cell in row)]
+    if not rows:
+        return ""
+    columns = max(len(row) for row in rows)
+    lines = []
+    for index, row in enumerate(rows):
+        cells = [
+            cell.replace("|", "\\|").replace("\n", " ").strip()
+            for cell in row + [""] * (columns - len(row))
+        ]
+        lines.append(f"| {' | '.join(cells)} |")
+        if index == 0:
+            lines.append(f"|{'|'.join(['---'] * columns)}|")
+    return "\n".join(lines)
+
+
+def get_outline_heading_level(properties: etree._Element) -> Optional[int]:
+    outline_level = properties.find(f"{W}outlineLvl")
+    if outline_level is None:
+        return None
+    value = int(outline_level.get(f"{W}val"))
+    # Level 9 is body text
+    return value + 2 if value < 9 else None
+
+
+def get_docx_heading_levels(archive: zipfile.ZipFile) -> Dict[str, int]:
+    """Maps paragraph style ids to markdown heading levels"""
+    try:
+        styles = etree.fromstring(archive.read("word/styles.xml"))
+    except KeyError:
+        return {}
+
+    levels = {}
+    for style in styles.iter(f"{W}style"):
+        style_id = style.get(f"{W}styleId")
+        name = style.find(f"{W}name")
+        name = (name.get(f"{W}val") if name is not None else "").lower()
+        properties = style.find(f"{W}pPr")
+        if name == "title":
+            levels[style_id] = 1
+        elif re.fullmatch(r"heading \d", name):
+            levels[style_id] = int(name[-1]) + 1
+        elif properties is not None and get_outline_heading_level(properties):
+            levels[style_id] = get_outline_heading_level(properties)
+    return levels
+
+
+def get_docx_text(element: etree._Element) -> str:
+    parts = []
+    for child in element.iter(f"{W}t", f"{W}tab", f"{W}br", f"{W}cr"):
+        parts.append(child.text or "" if child.tag == f"{W}t" else " ")
+    return re.sub(r"[ \t]+", " ", "".join(parts)).strip()
+
+
+def get_docx_paragraph(
+    paragraph: etree._Element, heading_levels: Dict[str, int]
+) -> str:
+    text = get_docx_text(paragraph)
+    if not text:
+        return ""
+
+    properties = paragraph.find(f"{W}pPr")
+    if properties is not None:
+        style = properties.find(f"{W}pStyle")
+        level = get_outline_heading_level(properties)
+        if level is None and style is not None:
+            level = heading_levels.get(style.get(f"{W}val"))
+        if level:
+            return get_heading(text, level)
+
+        numbering = properties.find(f"{W}numPr")
+        if numbering is not None:
+            indent = numbering.find(f"{W}ilvl")
+            indent = int(indent.get(f"{W}val")) if indent is not None else 0
+            return f"{'  ' * indent}- {text}"
+    return text
+
+
+def get_docx_table(table: etree._Element) -> str:
+    if table.find(f".//{W}tc//{W}tbl") is not None:
+        raise UnusualContentError("nested tables")
+
+    rows = []
+    for row in table.iter(f"{W}tr"):
+        cells = []
+        for cell in row.iter(f"{W}tc"):
+            text = " ".join(
+                filter(None, (get_docx_text(p) for p in cell.iter(f"{W}p")))
+            )
+            span = cell.find(f"{W}tcPr/{W}gridSpan")
+            # Merged cells repeat their text like Docling does
+            cells.extend([text] * (int(span.get(f"{W}val")) if span is not None else 1))
+        rows.append(cells)
+    return get_markdown_table(rows)
+
+
+def get_docx_blocks(
+    container: etree._Element, heading_levels: Dict[str, int]
+) -> List[str]:
+    blocks = []
+    for child in container:
+        if child.tag == f"{W}p":
+            blocks.append(get_docx_paragraph(child, heading_levels))
+        elif child.tag == f"{W}tbl":
+            blocks.append(get_docx_table(child))
+        elif child.tag == f"{W}sdt":
+            # Content controls wrap regular paragraphs and tables
+            content = child.find(f"{W}sdtContent")
+            if content is not None:
+                blocks.extend(get_docx_blocks(content, heading_levels))
+    return blocks
+
+
+def join_blocks(blocks: List[str]) -> str:
+    markdown = ""
+    previous_block = ""
+    for block in filter(None, blocks):
+        # Items of the same list stay together
+        is_list_item = block.lstrip().startswith("- ")
+        in_list = is_list_item and previous_block.lstrip().startswith("- ")
+        separator = "\n" if in_list else "\n\n"
+        markdown = f"{markdown}{separator}{block}" if markdown else block
+        previous_block = block
+    return markdown
+
+
+def extract_docx_markdown(file_path: str) -> str:
+    with zipfile.ZipFile(file_path) as archive:
+        document = etree.fromstring(archive.read("word/document.xml"))
+        heading_levels = get_docx_heading_levels(archive)
+
+    for tag, description in UNUSUAL_DOCX_TAGS.items():
+        if document.find(f".//{tag}") is not None:
+            raise UnusualContentError(description)
+
+    body = document.find(f"{W}body")
+    return join_blocks(get_docx_blocks(body, heading_levels))
+
+
+def get_pptx_shape_blocks(shape: BaseShape) -> List[str]:
+    if isinstance(shape, GroupShape):
+        blocks = []
+        for child in shape.shapes:
+            blocks.extend(get_pptx_shape_blocks(child))
+        return blocks
+
+    if getattr(shape, "has_table", False):
+        return [
+            get_markdown_table(
+                [[cell.text for cell in row.cells] for row in shape.table.rows]
+            )
+        ]
+
+    if not getattr(shape, "has_text_frame", False):
+        return []
+
+    placeholder_type = shape.placeholder_format.type if shape.is_placeholder else None
+    paragraphs = [
+        (paragraph.level, paragraph.text.replace("\v", " ").strip())
+        for paragraph in shape.text_frame.paragraphs
+    ]
+    paragraphs = [(level, text) for level, text in paragraphs if text]
+    if not paragraphs:
+        return []
+
+    if placeholder_type in TITLE_PLACEHOLDERS:
+        return [get_heading(" ".join(text for _, text in paragraphs), 1)]
+    if placeholder_type == PP_PLACEHOLDER.SUBTITLE:
+        return [get_heading(" ".join(text for _, text in paragraphs), 2)]
+    if placeholder_type in LIST_PLACEHOLDERS:
+        return [f"{'  ' * level}- {text}" for level, text in paragraphs]
+    return ["\n".join(text for _, text in paragraphs)]
+
+
+def extract_pptx_markdown(file_path: str) -> str:
+    blocks = []
+    for slide in Presentation(file_path).slides:
+        # Titles come first so every slide starts a section
+        shapes = sorted(
+            slide.shapes,
+            key=lambda shape: not (
+                shape.is_placeholder
+                and shape.placeholder_format.type in TITLE_PLACEHOLDERS
+            ),
+        )
+        for shape in shapes:
+            blocks.extend(get_pptx_shape_blocks(shape))
+    return join_blocks(blocks)
+
+
+def extract_office_markdown(file_path: str) -> Optional[str]:
+    """
+    Converts a Word or PowerPoint file to markdown straight from its xml.
+    Returns None when the file has content only Docling handles.
+    """
+    try:
+        if file_path.lower().endswith(".pptx"):
+            return extract_pptx_markdown(file_path)
+        return extract_docx_markdown(file_path)
+    except UnusualContentError as e:
+        print(f"Parsing {file_path} with Docling, it contains {e}")
+    except Exception as e:
+        print(f"Could not read {file_path}, parsing it with Docling: {e}")
+    return None
@@ -0,0 +1,249 @@
+from collections import OrderedDict
+import functools
+import hashlib
+from importlib import metadata
+import os
+import shutil
+import threading
+import uuid
+from typing import List, Optional, Tuple
+
+from constants.documents import (
+    DOCUMENT_PARSER_VERSION,
+    PARSED_DOCUMENT_CACHE_FILE_HASHES,
+    PARSED_DOCUMENT_CACHE_MAX_BYTES,
+)
+from services.ooxml_text_extractor import is_native_office_extraction_enabled
+from services.pdf_text_layer import is_pdf_text_layer_enabled
+from utils.asset_directory_utils import get_cache_directory
+
+MARKDOWN_FILE = "document.md"
+PAGES_DIRECTORY = "pages"
+
+
+@functools.cache
+def get_docling_version() -> Optional[str]:
+    try:
+        return metadata.version("docling")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def get_parser_version() -> str:
+    # Upgrading Docling or switching parsing tiers may change the markdown
+    # of the same file
+    tiers = [
+        tier
+        for tier, enabled in [
+            ("text-layer", is_pdf_text_layer_enabled()),
+            ("native-office", is_native_office_extraction_enabled()),
+        ]
+        if enabled
+    ]
+    return f"{DOCUMENT_PARSER_VERSION}-{get_docling_version()}-{'+'.join(tiers)}"
+
+
+class ParsedDocumentCache:
+    """
+    Disk cache for the markdown and page images of parsed documents.
+
+    Entries are keyed by a hash of the file bytes and the parser version,
+    so the same upload is parsed once no matter where it is stored. Each
+    entry is a folder whose modification time is its last access, the least
+    recently used folders are removed once the cache grows past max_bytes.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = PARSED_DOCUMENT_CACHE_MAX_BYTES,
+        parser_version: Optional[str] = None,
+    ):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._parser_version = parser_version
+        self._size: Optional[int] = None
+        # Documents of a request are stored from several threads at once
+        self._lock = threading.Lock()
+        # Avoids re-reading unchanged files, keyed by path, mtime and size
+        self._file_hashes: OrderedDict[Tuple[str, int, int], str] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_directory(self) -> str:
+        if not self._directory:
+            self._directory = os.path.join(get_cache_directory(), "parsed_documents")
+        os.makedirs(self._directory, exist_ok=True)
+        return self._directory
+
+    @property
+    def parser_version(self) -> str:
+        return self._parser_version or get_parser_version()
+
+    def get_file_hash(self, path: str) -> str:
+        stat = os.stat(path)
+        stat_key = (path, stat.st_mtime_ns, stat.st_size)
+        file_hash = self._file_hashes.get(stat_key)
+        if file_hash:
+            self._file_hashes.move_to_end(stat_key)
+            return file_hash
+
+        # Read in chunks so large uploads are never held in memory
+        file_hash = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                file_hash.update(chunk)
+
+        self._file_hashes[stat_key] = file_hash.hexdigest()
+        while len(self._file_hashes) > PARSED_DOCUMENT_CACHE_FILE_HASHES:
+            self._file_hashes.popitem(last=False)
+        return self._file_hashes[stat_key]
+
+    def _get_entry_directory(self, file_hash: str) -> str:
+        key = hashlib.sha256(
+            f"{self.parser_version}:{file_hash}".encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.get_directory(), key)
+
+    def _touch(self, entry_directory: str):
+        # Marks the entry as recently used
+        try:
+            os.utime(entry_directory)
+        except OSError:
+            pass
+
+    def get_markdown(self, file_hash: str) -> Optional[str]:
+        entry_directory = self._get_entry_directory(file_hash)
+        try:
+            with open(os.path.join(entry_directory, MARKDOWN_FILE)) as file:
+                markdown = file.read()
+        except OSError:
+            self.misses += 1
+            return None
+
+        self._touch(entry_directory)
+        self.hits += 1
+        return markdown
+
+    def set_markdown(self, file_hash: str, markdown: str):
+        self._get_size()
+        entry_directory = self._get_entry_directory(file_hash)
+        os.makedirs(entry_directory, exist_ok=True)
+        # Concurrent requests may read the entry while it is being written
+        temp_path = os.path.join(entry_directory, f".{uuid.uuid4()}")
+        with open(temp_path, "w") as file:
+            file.write(markdown)
+        os.replace(temp_path, os.path.join(entry_directory, MARKDOWN_FILE))
+        self._add_size(os.path.getsize(os.path.join(entry_directory, MARKDOWN_FILE)))
+
+    def get_page_images(self, file_hash: str, temp_dir: str) -> Optional[List[str]]:
+        """Copies the cached page images into temp_dir and returns their paths"""
+        entry_directory = self._get_entry_directory(file_hash)
+        pages_directory = os.path.join(entry_directory, PAGES_DIRECTORY)
+        try:
+            names = sorted(
+                os.listdir(pages_directory),
+                key=lambda name: int(name.split("_")[1].split(".")[0]),
+            )
+            image_paths = []
+            for name in names:
+                image_path = os.path.join(temp_dir, name)
+                shutil.copyfile(os.path.join(pages_directory, name), image_path)
+                image_paths.append(image_path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        self._touch(entry_directory)
+        self.hits += 1
+        return image_paths
+
+    def set_page_images(self, file_hash: str, image_paths: List[str]):
+        self._get_size()
+        entry_directory = self._get_entry_directory(file_hash)
+        os.makedirs(entry_directory, exist_ok=True)
+        # Pages appear all at once, readers never see part of them
+        temp_directory = os.path.join(entry_directory, f".{uuid.uuid4()}")
+        os.makedirs(temp_directory)
+        size = 0
+        for index, image_path in enumerate(image_paths):
+            shutil.copyfile(
+                image_path, os.path.join(temp_directory, f"page_{index + 1}.png")
+            )
+            size += os.path.getsize(image_path)
+        try:
+            os.rename(temp_directory, os.path.join(entry_directory, PAGES_DIRECTORY))
+        except OSError:
+            # Stored by a concurrent request already
+            shutil.rmtree(temp_directory, ignore_errors=True)
+            return
+        self._add_size(size)
+
+    def _get_size(self) -> int:
+        # Measured before the first write so no entry is counted twice
+        with self._lock:
+            if self._size is None:
+                self._size = self._get_directory_size()
+            return self._size
+
+    def _add_size(self, size: int):
+        with self._lock:
+            self._size += size
+            if self._size > self._max_bytes:
+                self._evict()
+
+    def _get_entry_size(self, path: str) -> int:
+        size = 0
+        for directory, _, names in os.walk(path):
+            for name in names:
+                try:
+                    size += os.path.getsize(os.path.join(directory, name))
+                except OSError:
+                    continue
+        return size
+
+    def _get_entries(self) -> List[Tuple[float, str, int]]:
+        entries = []
+        with os.scandir(self.get_directory()) as directory_entries:
+            for entry in directory_entries:
+                if not entry.is_dir():
+                    continue
+                try:
+                    accessed_at = entry.stat().st_mtime
+                except OSError:
+                    continue
+                entries.append(
+                    (accessed_at, entry.path, self._get_entry_size(entry.path))
+                )
+        return entries
+
+    def _get_directory_size(self) -> int:
+        return sum(size for _, _, size in self._get_entries())
+
+    def _evict(self):
+        entries = sorted(self._get_entries())
+        self._size = sum(size for _, _, size in entries)
+        # The entry just written is the most recent one and is kept
+        for _, path, size in entries[:-1]:
+            if self._size <= self._max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            self._size -= size
+            self.evictions += 1
+
+    def get_stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "parser_version": self.parser_version,
+            "size_bytes": self._get_size(),
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0,
+            "evictions": self.evictions,
+        }
+
+
+PARSED_DOCUMENT_CACHE = ParsedDocumentCache()
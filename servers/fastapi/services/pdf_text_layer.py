@@ -0,0 +1,180 @@
+from collections import Counter
+import math
+from typing import List, NamedTuple, Optional, Tuple
+
+import pdfplumber
+
+from constants.documents import (
+    PDF_HEADING_MAX_CHARS,
+    PDF_HEADING_SIZE_RATIOS,
+    PDF_TEXT_LAYER_MAX_GARBLED_RATIO,
+    PDF_TEXT_LAYER_MIN_CHARS,
+)
+from utils.get_env import get_pdf_text_layer_env
+from utils.parsers import parse_bool_or_none
+
+
+class PdfTextLayerPage(NamedTuple):
+    markdown: str
+    # Why the page needs Docling, None when its text layer is usable
+    issue: Optional[str]
+
+
+def is_pdf_text_layer_enabled() -> bool:
+    enabled = parse_bool_or_none(get_pdf_text_layer_env())
+    return True if enabled is None else enabled
+
+
+def get_line_size(line: dict) -> float:
+    sizes = [char["size"] for char in line["chars"] if not char["text"].isspace()]
+    return round(sum(sizes) / len(sizes), 1) if sizes else 0
+
+
+def get_body_size(pages_lines: List[List[dict]]) -> float:
+    # The size most characters are set in
+    sizes = Counter()
+    for lines in pages_lines:
+        for line in lines:
+            sizes[get_line_size(line)] += len(line["text"])
+    return sizes.most_common(1)[0][0] if sizes else 0
+
+
+def get_heading_level(line: dict, body_size: float) -> Optional[int]:
+    if not body_size or len(line["text"]) > PDF_HEADING_MAX_CHARS:
+        return None
+    size = get_line_size(line)
+    for ratio, level in PDF_HEADING_SIZE_RATIOS:
+        if size >= body_size * ratio:
+            return level
+    return None
+
+
+def get_page_markdown(lines: List[dict], body_size: float) -> str:
+    blocks: List[str] = []
+    paragraph: List[str] = []
+    previous_line = None
+
+    for line in lines:
+        heading_level = get_heading_level(line, body_size)
+        line_height = line["bottom"] - line["top"]
+        starts_paragraph = (
+            previous_line is None
+            or heading_level is not None
+            or get_heading_level(previous_line, body_size) is not None
+            or line["top"] - previous_line["bottom"] > line_height * 0.8
+        )
+        if starts_paragraph and paragraph:
+            blocks.append("\n".join(paragraph))
+            paragraph = []
+
+        if heading_level is not None:
+            blocks.append(f"{'#' * heading_level} {line['text']}")
+        else:
+            paragraph.append(line["text"])
+        previous_line = line
+
+    if paragraph:
+        blocks.append("\n".join(paragraph))
+    return "\n\n".join(blocks)
+
+
+def get_garbled_ratio(text: str) -> float:
+    if not text:
+        return 0
+    # Fonts without a unicode mapping come out as (cid:12) or replacement chars
+    garbled = text.count("(cid:") * 6 + text.count("�")
+    garbled += sum(1 for char in text if not char.isprintable() and not char.isspace())
+    return garbled / len(text)
+
+
+def get_page_issue(page: pdfplumber.page.Page, text: str) -> Optional[str]:
+    if get_garbled_ratio(text) > PDF_TEXT_LAYER_MAX_GARBLED_RATIO:
+        return "garbled"
+    if len(text.strip()) < PDF_TEXT_LAYER_MIN_CHARS and page.images:
+        # Most of the page is in pictures, e.g. scans or charts
+        return "sparse"
+    if page.find_tables():
+        return "tables"
+    return None
+
+
+def extract_pdf_text_layer(file_path: str) -> List[PdfTextLayerPage]:
+    """
+    Converts the text layer of each page to markdown, with headings
+    inferred from font sizes, and flags the pages whose text layer doesn't
+    capture their content.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        pages_lines = [page.extract_text_lines() for page in pdf.pages]
+        body_size = get_body_size(pages_lines)
+
+        text_layer_pages = []
+        for page, lines in zip(pdf.pages, pages_lines):
+            text = "\n".join(line["text"] for line in lines)
+            text_layer_pages.append(
+                PdfTextLayerPage(
+                    markdown=get_page_markdown(lines, body_size),
+                    issue=get_page_issue(page, text),
+                )
+            )
+            # Parsed page objects hold on to every character otherwise
+            page.close()
+        return text_layer_pages
+
+
+def get_layout_page_ranges(
+    text_layer_pages: List[PdfTextLayerPage],
+) -> List[Tuple[int, int]]:
+    """Returns the 1 based inclusive ranges of consecutive pages with issues"""
+    page_ranges = []
+    for page_number, page in enumerate(text_layer_pages, start=1):
+        if not page.issue:
+            continue
+        if page_ranges and page_ranges[-1][1] == page_number - 1:
+            page_ranges[-1] = (page_ranges[-1][0], page_number)
+        else:
+            page_ranges.append((page_number, page_number))
+    return page_ranges
+
+
+def split_page_range(
+    page_range: Tuple[int, int], parts: int, min_pages: int
+) -> List[Tuple[int, int]]:
+    """Splits page_range into up to parts ranges of about the same length"""
+    start, end = page_range
+    pages = end - start + 1
+    if min_pages <= 0 or pages < min_pages or parts <= 1:
+        return [page_range]
+    part_pages = math.ceil(pages / parts)
+    return [
+        (part_start, min(part_start + part_pages - 1, end))
+        for part_start in range(start, end + 1, part_pages)
+    ]
+
+
+def get_pdf_page_count(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def merge_page_markdown(
+    text_layer_pages: List[PdfTextLayerPage],
+    page_ranges: List[Tuple[int, int]],
+    range_markdowns: List[str],
+) -> str:
+    """Replaces the pages of each range with its Docling markdown, in order"""
+    range_starts = {
+        start: (end, markdown)
+        for (start, end), markdown in zip(page_ranges, range_markdowns)
+    }
+    blocks = []
+    page_number = 1
+    while page_number <= len(text_layer_pages):
+        if page_number in range_starts:
+            end, markdown = range_starts[page_number]
+            blocks.append(markdown)
+            page_number = end + 1
+            continue
+        blocks.append(text_layer_pages[page_number - 1].markdown)
+        page_number += 1
+    return "\n\n".join(block for block in blocks if block.strip())
@@ -0,0 +1,258 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+import multiprocessing
+import os
+import time
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException
+
+from constants.presentation import DEFAULT_EXPORT_CONCURRENCY, DEFAULT_EXPORT_QUEUE_SIZE
+from models.pptx_models import PptxPresentationModel
+from services.pptx_presentation_creator import PptxPresentationCreator
+from utils.get_env import get_export_concurrency_env, get_export_queue_size_env
+from utils.parsers import parse_int_or_none
+
+
+def get_export_concurrency() -> int:
+    concurrency = parse_int_or_none(get_export_concurrency_env())
+    if concurrency is None:
+        return DEFAULT_EXPORT_CONCURRENCY
+    return max(concurrency, 0)
+
+
+def get_export_queue_size() -> int:
+    queue_size = parse_int_or_none(get_export_queue_size_env())
+    if queue_size is None:
+        return DEFAULT_EXPORT_QUEUE_SIZE
+    return max(queue_size, 0)
+
+
+class UnseekableFile:
+    """
+    Write only view of a file that zipfile can't seek back in. Every zip
+    entry is final once written, so the file can be streamed while it grows.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._file.write(data)
+        self._file.flush()
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, *args):
+        raise OSError("File is not seekable")
+
+    def seekable(self) -> bool:
+        return False
+
+    def flush(self):
+        self._file.flush()
+
+
+def build_pptx(
+    pptx_model: PptxPresentationModel,
+    temp_dir: str,
+    pptx_path: str,
+    streaming: bool = False,
+) -> dict:
+    # Runs in the worker process, network assets are already downloaded
+    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
+    pptx_creator.add_slides()
+    if streaming:
+        with open(pptx_path, "wb") as pptx_file:
+            pptx_creator.save(UnseekableFile(pptx_file))
+    else:
+        pptx_creator.save(pptx_path)
+    return {
+        **pptx_creator.get_picture_report(),
+        "pptx_bytes": os.path.getsize(pptx_path),
+    }
+
+
+class PptxExportExecutor:
+    """
+    Builds PPTX files in a process pool so image processing, xml
+    manipulation and zip writing don't block the event loop.
+
+    At most concurrency exports run at once and up to queue_size more wait
+    for a free worker or download their assets, exports beyond that are
+    rejected. A concurrency of 0 builds files in a thread of the API process
+    instead.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ):
+        self._concurrency = concurrency
+        self._queue_size = queue_size
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_build_seconds = 0.0
+        self.picture_bytes_before = 0
+        self.picture_bytes_after = 0
+        self.pptx_bytes = 0
+        self.media_parts = 0
+
+    @property
+    def concurrency(self) -> int:
+        if self._concurrency is None:
+            self._concurrency = get_export_concurrency()
+        return self._concurrency
+
+    @property
+    def queue_size(self) -> int:
+        if self._queue_size is None:
+            self._queue_size = get_export_queue_size()
+        return self._queue_size
+
+    def _get_executor(self) -> Optional[Executor]:
+        if not self.concurrency:
+            return None
+        if self._executor is None:
+            # Forking a process with a running event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.concurrency,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(max(self.concurrency, 1))
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def reserve(self):
+        """Takes a place in the export queue, raises when the queue is full"""
+        if self.running + self.waiting >= max(self.concurrency, 1) + self.queue_size:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many exports in progress, please try again later",
+            )
+        self.waiting += 1
+
+    def release(self):
+        """Gives back a place taken with reserve that won't be used"""
+        self.waiting -= 1
+
+    async def create_pptx(
+        self,
+        pptx_model: PptxPresentationModel,
+        temp_dir: str,
+        pptx_path: str,
+        streaming: bool = False,
+        reserved: bool = False,
+    ) -> str:
+        """
+        Builds the PPTX file at pptx_path. Streaming builds write the file so
+        it can be read while it is being written. reserved is True when the
+        caller already took a place in the queue with reserve.
+        """
+        if not reserved:
+            self.reserve()
+        try:
+            semaphore = self._get_semaphore()
+
+            # Downloads are I/O bound and stay on the event loop
+            pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
+            await pptx_creator.fetch_network_assets()
+
+            queued_at = time.monotonic()
+            await semaphore.acquire()
+        finally:
+            self.release()
+
+        wait_seconds = time.monotonic() - queued_at
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+        self.running += 1
+        started_at = time.monotonic()
+        try:
+            executor = self._get_executor()
+            if executor:
+                report = await asyncio.get_running_loop().run_in_executor(
+                    executor, build_pptx, pptx_model, temp_dir, pptx_path, streaming
+                )
+            else:
+                report = await asyncio.to_thread(
+                    build_pptx, pptx_model, temp_dir, pptx_path, streaming
+                )
+            self.completed += 1
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.total_build_seconds += time.monotonic() - started_at
+            self.running -= 1
+            semaphore.release()
+
+        self.record_report(pptx_path, report)
+        return pptx_path
+
+    def record_report(self, pptx_path: str, report: dict):
+        saved_bytes = report["picture_bytes_before"] - report["picture_bytes_after"]
+        self.picture_bytes_before += report["picture_bytes_before"]
+        self.picture_bytes_after += report["picture_bytes_after"]
+        self.pptx_bytes += report["pptx_bytes"]
+        self.media_parts += report["media_parts"]
+        print(
+            f"Exported {pptx_path}: {report['pptx_bytes'] + saved_bytes} bytes "
+            f"before and {report['pptx_bytes']} bytes after picture optimization"
+        )
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "average_wait_seconds": (
+                self.total_wait_seconds / finished if finished else 0
+            ),
+            "max_wait_seconds": self.max_wait_seconds,
+            "average_build_seconds": (
+                self.total_build_seconds / finished if finished else 0
+            ),
+            "picture_bytes_before": self.picture_bytes_before,
+            "picture_bytes_after": self.picture_bytes_after,
+            # Size the exported files would have had without picture optimization
+            "pptx_bytes_before": self.pptx_bytes
+            + self.picture_bytes_before
+            - self.picture_bytes_after,
+            "pptx_bytes_after": self.pptx_bytes,
+            "media_parts": self.media_parts,
+        }
+
+
+PPTX_EXPORT_EXECUTOR = PptxExportExecutor()
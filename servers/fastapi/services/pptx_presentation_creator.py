@@ -1,5 +1,7 @@
+import io
 import os
-from typing import List, Optional
+import shutil
+from typing import Dict, List, Optional
 from lxml import etree
 from services.html_to_text_runs_service import (
     parse_html_text_to_text_runs as parse_inline_html_to_runs,
@@ -10,6 +12,7 @@ from pptx.shapes.autoshape import Shape
 from pptx.slide import Slide
 from pptx.text.text import _Paragraph, TextFrame, Font, _Run
 from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.parts.image import Image as PptxImage, ImagePart
 from lxml.etree import fromstring, tostring
 from PIL import Image
 from pptx.oxml.xmlchemy import OxmlElement
@@ -17,14 +20,20 @@ from pptx.oxml.xmlchemy import OxmlElement
 from pptx.util import Pt
 from pptx.dml.color import RGBColor
 
+from constants.presentation import (
+    DEFAULT_EXPORT_IMAGE_DPI,
+    EXPORT_IMAGE_JPEG_QUALITY,
+)
 from models.pptx_models import (
     PptxAutoShapeBoxModel,
     PptxBoxShapeEnum,
     PptxConnectorModel,
     PptxFillModel,
     PptxFontModel,
+    PptxObjectFitModel,
     PptxParagraphModel,
     PptxPictureBoxModel,
+    PptxPictureModel,
     PptxPositionModel,
     PptxPresentationModel,
     PptxShadowModel,
@@ -34,7 +43,9 @@ from models.pptx_models import (
     PptxTextBoxModel,
     PptxTextRunModel,
 )
-from utils.download_helpers import download_files
+from services.network_asset_store import NETWORK_ASSET_STORE
+from services.processed_image_cache import PROCESSED_IMAGE_CACHE
+from utils.get_env import get_export_image_dpi_env
 from utils.image_utils import (
     clip_image,
     create_circle_image,
@@ -43,11 +54,25 @@ from utils.image_utils import (
     round_image_corners,
     set_image_opacity,
 )
+from utils.parsers import parse_int_or_none
 import uuid
 
 BLANK_SLIDE_LAYOUT = 6
 
 
+def get_export_image_dpi() -> int:
+    dpi = parse_int_or_none(get_export_image_dpi_env())
+    if dpi is None:
+        return DEFAULT_EXPORT_IMAGE_DPI
+    return max(dpi, 0)
+
+
+def get_export_image_scale() -> float:
+    # Pixels per point of processed pictures, 0 dpi keeps them at point size
+    dpi = get_export_image_dpi()
+    return dpi / 72 if dpi else 1
+
+
 class PptxPresentationCreator:
 
     def __init__(self, ppt_model: PptxPresentationModel, temp_dir: str):
@@ -55,6 +80,11 @@ class PptxPresentationCreator:
 
         self._ppt_model = ppt_model
         self._slide_models = ppt_model.slides
+        self._picture_bytes_before = 0
+        self._picture_bytes_after = 0
+        self._processed_pictures: Dict[str, str] = {}
+        self._image_sha1s: Dict[str, str] = {}
+        self._image_parts: Dict[str, ImagePart] = {}
 
         self._ppt = Presentation()
         self._ppt.slide_width = Pt(1280)
@@ -102,7 +132,8 @@ class PptxPresentationCreator:
                         models_with_network_asset.append(each_shape)
 
         if image_urls:
-            image_paths = await download_files(image_urls, self._temp_dir)
+            # Fetched once into the shared store and reused by later exports
+            image_paths = await NETWORK_ASSET_STORE.fetch_many(image_urls)
 
             for each_shape, each_image_path in zip(
                 models_with_network_asset, image_paths
@@ -113,11 +144,13 @@ class PptxPresentationCreator:
 
     async def create_ppt(self):
         await self.fetch_network_assets()
+        self.add_slides()
 
+    def add_slides(self):
         for slide_model in self._slide_models:
             # Adding global shapes to slide
             if self._ppt_model.shapes:
-                slide_model.shapes.append(self._ppt_model.shapes)
+                slide_model.shapes.extend(self._ppt_model.shapes)
 
             self.add_and_populate_slide(slide_model)
 
@@ -176,8 +209,117 @@ class PptxPresentationCreator:
         self.set_fill_opacity(connector_shape, connector_model.opacity)
 
     def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
+        image_path = self.process_picture(picture_model, self._temp_dir)
+        if not image_path:
+            return
+
+        margined_position = self.get_margined_position(
+            picture_model.position, picture_model.margin
+        )
+
+        # Pictures repeated across slides share one media part and the
+        # relationship to it is reused within a slide
+        image_part = self.get_or_add_image_part(image_path)
+        rId = slide.part.relate_to(image_part, RT.IMAGE)
+        slide.shapes._add_pic_from_image_part(
+            image_part, rId, *margined_position.to_pt_list()
+        )
+
+    def get_or_add_image_part(self, image_path: str) -> ImagePart:
+        # python-pptx finds existing parts by hashing every image in the
+        # package on each add, this keeps a single lookup per picture
+        sha1 = self._image_sha1s.get(image_path)
+        if sha1 is None:
+            image = PptxImage.from_file(image_path)
+            sha1 = image.sha1
+            self._image_sha1s[image_path] = sha1
+            if sha1 not in self._image_parts:
+                self._image_parts[sha1] = ImagePart.new(self._ppt.part.package, image)
+        return self._image_parts[sha1]
+
+    def get_picture_operations(self, picture_model: PptxPictureBoxModel) -> List[list]:
+        """Ordered image operations the picture needs, as json serializable lists"""
+        operations = []
+        scale = get_export_image_scale()
+        width = max(round(picture_model.position.width * scale), 1)
+        height = max(round(picture_model.position.height * scale), 1)
+        border_radius = picture_model.border_radius and [
+            round(radius * scale) for radius in picture_model.border_radius
+        ]
+        # ? Applying border radius twice to support both clip and object fit
+        if border_radius:
+            operations.append(["round_corners", border_radius])
+        if picture_model.object_fit:
+            operations.append(
+                ["fit", width, height, picture_model.object_fit.model_dump(mode="json")]
+            )
+        elif picture_model.clip:
+            operations.append(["clip", width, height])
+        if border_radius:
+            operations.append(["round_corners", border_radius])
+        if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
+            operations.append(["circle"])
+        if picture_model.invert:
+            operations.append(["invert"])
+        if picture_model.opacity:
+            operations.append(["opacity", picture_model.opacity])
+        return operations
+
+    def apply_picture_operations(
+        self, image: Image.Image, operations: List[list]
+    ) -> Image.Image:
+        image = image.convert("RGBA")
+        for name, *args in operations:
+            if name == "round_corners":
+                image = round_image_corners(image, *args)
+            elif name == "fit":
+                width, height, object_fit = args
+                image = fit_image(
+                    image, width, height, PptxObjectFitModel(**object_fit)
+                )
+            elif name == "clip":
+                image = clip_image(image, *args)
+            elif name == "circle":
+                image = create_circle_image(image)
+            elif name == "invert":
+                image = invert_image(image)
+            elif name == "opacity":
+                image = set_image_opacity(image, *args)
+        return image
+
+    def process_picture(
+        self, picture_model: PptxPictureBoxModel, directory: str
+    ) -> Optional[str]:
+        # Same picture in the same size, e.g. a logo on every slide
+        picture_key = picture_model.model_dump_json(
+            exclude={"position": {"left", "top"}}
+        )
+        image_path = self._processed_pictures.get(picture_key)
+        if image_path is None:
+            image_path = self.transform_picture(picture_model, directory)
+            if not image_path:
+                return None
+
+            image_path = self.optimize_picture(
+                image_path,
+                self.get_margined_position(
+                    picture_model.position, picture_model.margin
+                ),
+                directory,
+            )
+            self._processed_pictures[picture_key] = image_path
+
+        self._picture_bytes_before += self.get_picture_file_size(picture_model.picture)
+        self._picture_bytes_after += self.get_picture_file_size(
+            PptxPictureModel(is_network=False, path=image_path)
+        )
+        return image_path
+
+    def transform_picture(
+        self, picture_model: PptxPictureBoxModel, directory: str
+    ) -> Optional[str]:
         image_path = picture_model.picture.path
-        if (
+        if not (
             picture_model.clip
             or picture_model.border_radius
             or picture_model.invert
@@ -185,45 +327,163 @@ class PptxPresentationCreator:
             or picture_model.object_fit
             or picture_model.shape
         ):
-            try:
-                image = Image.open(image_path)
-            except:
-                print(f"Could not open image: {image_path}")
-                return
+            return image_path
+
+        operations = self.get_picture_operations(picture_model)
+        scale = get_export_image_scale()
+        width = max(int(picture_model.position.width * scale), 1)
+        height = max(int(picture_model.position.height * scale), 1)
+        source_hash = PROCESSED_IMAGE_CACHE.get_source_hash(image_path)
+        if source_hash:
+            cache_key = PROCESSED_IMAGE_CACHE.get_key(
+                source_hash, operations, (width, height), get_export_image_dpi()
+            )
+            cached_path = PROCESSED_IMAGE_CACHE.get(cache_key)
+            if cached_path:
+                return cached_path
 
-            image = image.convert("RGBA")
-            # ? Applying border radius twice to support both clip and object fit
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.object_fit:
-                image = fit_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                    picture_model.object_fit,
-                )
-            elif picture_model.clip:
-                image = clip_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                )
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                image = create_circle_image(image)
-            if picture_model.invert:
-                image = invert_image(image)
-            if picture_model.opacity:
-                image = set_image_opacity(image, picture_model.opacity)
-            image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
-            image.save(image_path)
+        try:
+            image = Image.open(image_path)
+        except:
+            print(f"Could not open image: {image_path}")
+            return None
+
+        if image.format == "JPEG":
+            # Decodes large jpegs at a reduced scale that still covers the box
+            image.draft(None, (width, height))
+        image = self.apply_picture_operations(image, operations)
+        if source_hash:
+            return PROCESSED_IMAGE_CACHE.set(cache_key, image)
+
+        image_path = os.path.join(directory, f"{uuid.uuid4()}.png")
+        image.save(image_path)
+        return image_path
+
+    def optimize_picture(
+        self, image_path: str, position: PptxPositionModel, directory: str
+    ) -> str:
+        """
+        Resamples the picture to the pixels it covers on the slide at the
+        export dpi and re-encodes opaque pictures as jpeg.
+        Returns image_path when the picture can't be made smaller.
+        """
+        dpi = get_export_image_dpi()
+        if not dpi:
+            return image_path
+
+        width = max(round(position.width * dpi / 72), 1)
+        height = max(round(position.height * dpi / 72), 1)
+        operations = [["optimize", width, height, EXPORT_IMAGE_JPEG_QUALITY]]
+
+        source_hash = PROCESSED_IMAGE_CACHE.get_source_hash(image_path)
+        if not source_hash:
+            return image_path
+        cache_key = PROCESSED_IMAGE_CACHE.get_key(
+            source_hash, operations, (width, height), dpi
+        )
+        cached_path = PROCESSED_IMAGE_CACHE.get(cache_key)
+        if cached_path:
+            return cached_path
 
-        margined_position = self.get_margined_position(
-            picture_model.position, picture_model.margin
+        try:
+            image = Image.open(image_path)
+        except:
+            print(f"Could not open image: {image_path}")
+            return image_path
+
+        source_format = image.format
+        resized = image.width > width or image.height > height
+        if source_format == "JPEG":
+            image.draft(None, (width, height))
+
+        if image.mode == "P" and "transparency" in image.info:
+            image = image.convert("RGBA")
+        opaque = image.mode not in ("RGBA", "LA", "PA") or (
+            image.getchannel("A").getextrema()[0] == 255
         )
+        # Re-encoding a jpeg at the same size only loses quality
+        if not resized and (not opaque or source_format == "JPEG"):
+            return image_path
+
+        if image.width > width or image.height > height:
+            image = image.resize(
+                (min(image.width, width), min(image.height, height)), Image.LANCZOS
+            )
+
+        buffer = io.BytesIO()
+        if opaque:
+            image.convert("RGB").save(
+                buffer, "JPEG", quality=EXPORT_IMAGE_JPEG_QUALITY, optimize=True
+            )
+            extension = ".jpg"
+        else:
+            image.convert("RGBA").save(buffer, "PNG", optimize=True)
+            extension = ".png"
 
-        slide.shapes.add_picture(image_path, *margined_position.to_pt_list())
+        data = buffer.getvalue()
+        if not resized and len(data) >= os.path.getsize(image_path):
+            return image_path
+        return PROCESSED_IMAGE_CACHE.set_bytes(cache_key, data, extension)
+
+    def get_picture_file_size(self, picture: PptxPictureModel) -> int:
+        if picture.original_size is not None:
+            return picture.original_size
+        try:
+            return os.path.getsize(picture.path)
+        except OSError:
+            return 0
+
+    def get_picture_report(self) -> dict:
+        return {
+            "picture_bytes_before": self._picture_bytes_before,
+            "picture_bytes_after": self._picture_bytes_after,
+            "media_parts": len(self._image_parts),
+        }
+
+    async def prepare_pictures(self, directory: str) -> bool:
+        """
+        Downloads and processes the pictures of every slide into directory.
+        The slide models then point at the final images and can be rendered
+        again later without repeating the work. Returns False when a picture
+        could not be resolved and was left out.
+        """
+        await self.fetch_network_assets()
+
+        resolved = True
+        for slide_model in self._slide_models:
+            shapes = []
+            for shape in slide_model.shapes:
+                if isinstance(shape, PptxPictureBoxModel):
+                    original_size = self.get_picture_file_size(shape.picture)
+                    image_path = self.process_picture(shape, directory)
+                    if not image_path:
+                        resolved = False
+                        continue
+                    if not image_path.startswith(directory):
+                        copied_path = os.path.join(
+                            directory,
+                            f"{uuid.uuid4()}{os.path.splitext(image_path)[1]}",
+                        )
+                        try:
+                            shutil.copyfile(image_path, copied_path)
+                        except OSError:
+                            print(f"Could not copy image: {image_path}")
+                            resolved = False
+                            continue
+                        image_path = copied_path
+                    shape = PptxPictureBoxModel(
+                        position=shape.position,
+                        margin=shape.margin,
+                        clip=False,
+                        picture=PptxPictureModel(
+                            is_network=False,
+                            path=image_path,
+                            original_size=original_size,
+                        ),
+                    )
+                shapes.append(shape)
+            slide_model.shapes = shapes
+        return resolved
 
     def add_autoshape(self, slide: Slide, autoshape_box_model: PptxAutoShapeBoxModel):
         position = autoshape_box_model.position
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, Optional
+
+from constants.presentation import PPTX_SLIDE_CACHE_MAX_SLIDES
+from models.pptx_models import PptxSlideModel
+from models.sql.slide import SlideModel
+from utils.asset_directory_utils import get_cache_directory
+
+
+def is_process_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Running under another user
+        return True
+    return True
+
+
+def remove_orphaned_directories(root: str):
+    """Removes the picture directories of processes that are gone"""
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return
+    for name in names:
+        if name.isdigit() and is_process_running(int(name)):
+            continue
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+class PptxSlideCache:
+    """
+    Caches the PPTX model of every exported slide, keyed by a hash of what
+    the slide renders from: its layout, content, properties and note.
+
+    Cached models point at pictures that are already downloaded and
+    processed, so re-exporting a deck skips Next.js when no slide changed
+    and only prepares the pictures of the slides that did.
+    Entries live in memory, so every process keeps its pictures in its own
+    directory.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_slides: int = PPTX_SLIDE_CACHE_MAX_SLIDES,
+    ):
+        self._directory = directory
+        self._max_slides = max_slides
+        self._slides: OrderedDict[str, PptxSlideModel] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_directory(self) -> str:
+        if not self._directory:
+            root = os.path.join(get_cache_directory(), "pptx_slides")
+            self._directory = os.path.join(root, str(os.getpid()))
+            # Pictures of a previous process with the same pid are orphans
+            shutil.rmtree(self._directory, ignore_errors=True)
+            remove_orphaned_directories(root)
+        os.makedirs(self._directory, exist_ok=True)
+        return self._directory
+
+    def get_key(
+        self,
+        slide: SlideModel,
+        layout_versions: Optional[Dict[str, Optional[str]]] = None,
+    ) -> str:
+        """
+        layout_versions maps layout groups to their version, so slides of
+        edited custom templates are converted again.
+        """
+        payload = json.dumps(
+            {
+                "layout_group": slide.layout_group,
+                "layout_version": (layout_versions or {}).get(slide.layout_group),
+                "layout": slide.layout,
+                "content": slide.content,
+                "properties": slide.properties,
+                "speaker_note": slide.speaker_note,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[PptxSlideModel]:
+        slide_model = self._slides.get(key)
+        if slide_model is None:
+            self.misses += 1
+            return None
+
+        self._slides.move_to_end(key)
+        self.hits += 1
+        # Creating the presentation mutates the models
+        return slide_model.model_copy(deep=True)
+
+    def get_slide_directory(self, key: str) -> str:
+        slide_directory = os.path.join(self.get_directory(), key)
+        os.makedirs(slide_directory, exist_ok=True)
+        return slide_directory
+
+    def set(self, key: str, slide_model: PptxSlideModel):
+        self._slides[key] = slide_model.model_copy(deep=True)
+        self._slides.move_to_end(key)
+
+        while len(self._slides) > self._max_slides:
+            evicted_key, _ = self._slides.popitem(last=False)
+            shutil.rmtree(
+                os.path.join(self.get_directory(), evicted_key), ignore_errors=True
+            )
+            self.evictions += 1
+
+    def get_stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "slides": len(self._slides),
+            "max_slides": self._max_slides,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0,
+            "evictions": self.evictions,
+        }
+
+
+PPTX_SLIDE_CACHE = PptxSlideCache()
@@ -0,0 +1,513 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import os
+import secrets
+import socket
+import traceback
+from typing import Awaitable, Callable, List, Optional
+import uuid
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from constants.presentation import (
+    DEFAULT_GENERATION_JOB_MAX_ATTEMPTS,
+    DEFAULT_GENERATION_WORKERS,
+    GENERATION_JOB_LEASE_SECONDS,
+    GENERATION_JOB_POLL_INTERVAL_SECONDS,
+    GENERATION_JOB_RETRY_BACKOFF_SECONDS,
+)
+from enums.presentation_generation_job_status import PresentationGenerationJobStatus
+from models.api_error_model import APIErrorModel
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
+from services.database import async_session_maker
+from utils.datetime_utils import get_current_utc_datetime
+from utils.get_env import (
+    get_generation_job_max_attempts_env,
+    get_generation_workers_env,
+)
+from utils.parsers import parse_int_or_none
+
+
+def get_generation_workers() -> int:
+    workers = parse_int_or_none(get_generation_workers_env())
+    if workers is None:
+        return DEFAULT_GENERATION_WORKERS
+    return max(workers, 0)
+
+
+def get_generation_job_max_attempts() -> int:
+    return max(
+        parse_int_or_none(get_generation_job_max_attempts_env())
+        or DEFAULT_GENERATION_JOB_MAX_ATTEMPTS,
+        1,
+    )
+
+
+# Runs a claimed job and returns whether the presentation was generated.
+# The last argument tells if the job will be retried when it raises.
+RunGenerationJob = Callable[
+    [PresentationGenerationJobModel, AsyncSession, bool], Awaitable[bool]
+]
+
+
+class PresentationGenerationQueue:
+    """
+    DB backed queue of presentation generations.
+
+    Workers claim a job with a lease and keep renewing it while the job runs.
+    Jobs of crashed workers are claimed again once their lease expires, until
+    they run out of attempts.
+    """
+
+    def __init__(
+        self,
+        lease_seconds: float = GENERATION_JOB_LEASE_SECONDS,
+        retry_backoff_seconds: float = GENERATION_JOB_RETRY_BACKOFF_SECONDS,
+    ):
+        self.lease_seconds = lease_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+    async def enqueue(
+        self,
+        sql_session: AsyncSession,
+        request: GeneratePresentationRequest,
+        presentation_id: uuid.UUID,
+    ) -> AsyncPresentationGenerationTaskModel:
+        async_status = AsyncPresentationGenerationTaskModel(
+            status="pending",
+            message="Queued for generation",
+            data=None,
+        )
+        job = PresentationGenerationJobModel(
+            id=async_status.id,
+            presentation_id=presentation_id,
+            request=request.model_dump(mode="json"),
+            max_attempts=get_generation_job_max_attempts(),
+        )
+        sql_session.add(async_status)
+        sql_session.add(job)
+        await sql_session.commit()
+        return async_status
+
+    def _get_claimable_condition(self, now):
+        return or_(
+            and_(
+                PresentationGenerationJobModel.status
+                == PresentationGenerationJobStatus.QUEUED.value,
+                PresentationGenerationJobModel.available_at <= now,
+            ),
+            and_(
+                PresentationGenerationJobModel.status
+                == PresentationGenerationJobStatus.RUNNING.value,
+                PresentationGenerationJobModel.lease_expires_at < now,
+                PresentationGenerationJobModel.attempts
+                < PresentationGenerationJobModel.max_attempts,
+            ),
+        )
+
+    async def claim(
+        self, sql_session: AsyncSession, worker_id: str
+    ) -> Optional[PresentationGenerationJobModel]:
+        now = get_current_utc_datetime()
+        claimable = self._get_claimable_condition(now)
+
+        candidate_ids = (
+            await sql_session.scalars(
+                select(PresentationGenerationJobModel.id)
+                .where(claimable)
+                .order_by(PresentationGenerationJobModel.available_at)
+                .limit(5)
+            )
+        ).all()
+
+        for job_id in candidate_ids:
+            # Only one worker can win the conditional update
+            result = await sql_session.execute(
+                update(PresentationGenerationJobModel)
+                .execution_options(synchronize_session=False)
+                .where(PresentationGenerationJobModel.id == job_id, claimable)
+                .values(
+                    status=PresentationGenerationJobStatus.RUNNING.value,
+                    attempts=PresentationGenerationJobModel.attempts + 1,
+                    lease_owner=worker_id,
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                    updated_at=now,
+                )
+            )
+            await sql_session.commit()
+            if result.rowcount == 1:
+                return await sql_session.get(
+                    PresentationGenerationJobModel, job_id, populate_existing=True
+                )
+
+        return None
+
+    async def _update_leased_job(
+        self,
+        sql_session: AsyncSession,
+        job_id: str,
+        worker_id: str,
+        async_status: Optional[dict] = None,
+        **values,
+    ) -> bool:
+        """
+        Updates the job while worker_id holds its lease. async_status values
+        are committed along with the job, so clients never see a stale status.
+        """
+        result = await sql_session.execute(
+            update(PresentationGenerationJobModel)
+            .execution_options(synchronize_session=False)
+            .where(
+                PresentationGenerationJobModel.id == job_id,
+                PresentationGenerationJobModel.lease_owner == worker_id,
+                PresentationGenerationJobModel.status
+                == PresentationGenerationJobStatus.RUNNING.value,
+            )
+            .values(updated_at=get_current_utc_datetime(), **values)
+        )
+        updated = result.rowcount == 1
+        if updated and async_status:
+            await self._update_async_status(sql_session, job_id, **async_status)
+        await sql_session.commit()
+        return updated
+
+    async def renew_lease(
+        self, sql_session: AsyncSession, job_id: str, worker_id: str
+    ) -> bool:
+        return await self._update_leased_job(
+            sql_session,
+            job_id,
+            worker_id,
+            lease_expires_at=get_current_utc_datetime()
+            + timedelta(seconds=self.lease_seconds),
+        )
+
+    async def complete(
+        self,
+        sql_session: AsyncSession,
+        job: PresentationGenerationJobModel,
+        worker_id: str,
+        succeeded: bool,
+    ):
+        await self._update_leased_job(
+            sql_session,
+            job.id,
+            worker_id,
+            status=(
+                PresentationGenerationJobStatus.COMPLETED.value
+                if succeeded
+                else PresentationGenerationJobStatus.FAILED.value
+            ),
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+
+    async def retry(
+        self,
+        sql_session: AsyncSession,
+        job: PresentationGenerationJobModel,
+        worker_id: str,
+    ):
+        backoff = self.retry_backoff_seconds * 2 ** max(job.attempts - 1, 0)
+        await self._update_leased_job(
+            sql_session,
+            job.id,
+            worker_id,
+            async_status={
+                "message": f"Retrying presentation generation (attempt {job.attempts + 1} of {job.max_attempts})",
+            },
+            status=PresentationGenerationJobStatus.QUEUED.value,
+            available_at=get_current_utc_datetime() + timedelta(seconds=backoff),
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+
+    async def release(
+        self,
+        sql_session: AsyncSession,
+        job: PresentationGenerationJobModel,
+        worker_id: str,
+    ):
+        # Worker is shutting down, so this attempt is not counted
+        await self._update_leased_job(
+            sql_session,
+            job.id,
+            worker_id,
+            status=PresentationGenerationJobStatus.QUEUED.value,
+            attempts=PresentationGenerationJobModel.attempts - 1,
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+
+    async def fail(
+        self,
+        sql_session: AsyncSession,
+        job: PresentationGenerationJobModel,
+        worker_id: str,
+        error: APIErrorModel,
+    ):
+        await self._update_leased_job(
+            sql_session,
+            job.id,
+            worker_id,
+            async_status={
+                "status": "error",
+                "message": "Presentation generation failed",
+                "error": error.model_dump(mode="json"),
+            },
+            status=PresentationGenerationJobStatus.FAILED.value,
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+
+    async def requeue(self, sql_session: AsyncSession, job_id: str) -> bool:
+        """
+        Queues a failed job again with a fresh set of attempts.
+        """
+        result = await sql_session.execute(
+            update(PresentationGenerationJobModel)
+            .execution_options(synchronize_session=False)
+            .where(
+                PresentationGenerationJobModel.id == job_id,
+                PresentationGenerationJobModel.status
+                == PresentationGenerationJobStatus.FAILED.value,
+            )
+            .values(
+                status=PresentationGenerationJobStatus.QUEUED.value,
+                attempts=0,
+                available_at=get_current_utc_datetime(),
+                updated_at=get_current_utc_datetime(),
+            )
+        )
+        if result.rowcount != 1:
+            await sql_session.commit()
+            return False
+
+        await self._update_async_status(
+            sql_session,
+            job_id,
+            status="pending",
+            message="Queued for generation",
+            error=None,
+        )
+        await sql_session.commit()
+        return True
+
+    async def fail_abandoned(self, sql_session: AsyncSession):
+        """
+        Fails jobs whose lease expired after their last attempt.
+        """
+        now = get_current_utc_datetime()
+        abandoned = and_(
+            PresentationGenerationJobModel.status
+            == PresentationGenerationJobStatus.RUNNING.value,
+            PresentationGenerationJobModel.lease_expires_at < now,
+            PresentationGenerationJobModel.attempts
+            >= PresentationGenerationJobModel.max_attempts,
+        )
+        job_ids = (
+            await sql_session.scalars(
+                select(PresentationGenerationJobModel.id).where(abandoned)
+            )
+        ).all()
+
+        for job_id in job_ids:
+            result = await sql_session.execute(
+                update(PresentationGenerationJobModel)
+                .execution_options(synchronize_session=False)
+                .where(PresentationGenerationJobModel.id == job_id, abandoned)
+                .values(
+                    status=PresentationGenerationJobStatus.FAILED.value,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    updated_at=now,
+                )
+            )
+            if result.rowcount == 1:
+                await self._update_async_status(
+                    sql_session,
+                    job_id,
+                    status="error",
+                    message="Presentation generation failed",
+                    error=APIErrorModel(
+                        status_code=500,
+                        detail="Presentation generation worker stopped responding",
+                    ).model_dump(mode="json"),
+                )
+            await sql_session.commit()
+
+    async def _update_async_status(
+        self, sql_session: AsyncSession, job_id: str, **values
+    ):
+        # Committed by the caller in the same transaction as the job
+        async_status = await sql_session.get(
+            AsyncPresentationGenerationTaskModel, job_id, populate_existing=True
+        )
+        if not async_status:
+            return
+        async_status.sqlmodel_update(values)
+        async_status.updated_at = datetime.now()
+        sql_session.add(async_status)
+
+    async def get_stats(self, sql_session: AsyncSession) -> dict:
+        counts = {status.value: 0 for status in PresentationGenerationJobStatus}
+        rows = await sql_session.execute(
+            select(
+                PresentationGenerationJobModel.status,
+                func.count(PresentationGenerationJobModel.id),
+            ).group_by(PresentationGenerationJobModel.status)
+        )
+        for status, count in rows.all():
+            counts[status] = count
+
+        oldest_queued_at = await sql_session.scalar(
+            select(func.min(PresentationGenerationJobModel.created_at)).where(
+                PresentationGenerationJobModel.status
+                == PresentationGenerationJobStatus.QUEUED.value
+            )
+        )
+        oldest_queued_seconds = None
+        if oldest_queued_at:
+            if oldest_queued_at.tzinfo is None:
+                # SQLite returns naive datetimes
+                oldest_queued_at = oldest_queued_at.replace(tzinfo=timezone.utc)
+            oldest_queued_seconds = round(
+                (get_current_utc_datetime() - oldest_queued_at).total_seconds(), 3
+            )
+
+        return {
+            "depth": counts[PresentationGenerationJobStatus.QUEUED.value]
+            + counts[PresentationGenerationJobStatus.RUNNING.value],
+            "jobs": counts,
+            "oldest_queued_seconds": oldest_queued_seconds,
+        }
+
+
+PRESENTATION_GENERATION_QUEUE = PresentationGenerationQueue()
+
+
+class PresentationGenerationWorkerPool:
+    """
+    Runs up to `workers` claimed jobs of the queue at a time. Can run inside
+    the API process or standalone through worker.py.
+    """
+
+    def __init__(
+        self,
+        run_job: RunGenerationJob,
+        workers: int,
+        queue: PresentationGenerationQueue = PRESENTATION_GENERATION_QUEUE,
+        session_maker: async_sessionmaker = async_session_maker,
+        poll_interval: float = GENERATION_JOB_POLL_INTERVAL_SECONDS,
+    ):
+        self.run_job = run_job
+        self.workers = workers
+        self.queue = queue
+        self.session_maker = session_maker
+        self.poll_interval = poll_interval
+
+        self.id = f"{socket.gethostname()}-{os.getpid()}-{secrets.token_hex(4)}"
+        self.running_jobs = 0
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._work(f"{self.id}-{i}")))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self, worker_id: str):
+        while True:
+            try:
+                async with self.session_maker() as sql_session:
+                    await self.queue.fail_abandoned(sql_session)
+                    job = await self.queue.claim(sql_session, worker_id)
+
+                if not job:
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                await self._run_job(job, worker_id)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                traceback.print_exc()
+                await asyncio.sleep(self.poll_interval)
+
+    async def _run_job(self, job: PresentationGenerationJobModel, worker_id: str):
+        print(f"Worker {worker_id} running job {job.id}, attempt {job.attempts}")
+
+        lease_lost = asyncio.Event()
+        self.running_jobs += 1
+        try:
+            async with self.session_maker() as sql_session:
+                retry_on_error = job.attempts < job.max_attempts
+                job_task = asyncio.create_task(
+                    self.run_job(job, sql_session, retry_on_error)
+                )
+                lease_renewal = asyncio.create_task(
+                    self._renew_lease(job.id, worker_id, job_task, lease_lost)
+                )
+                try:
+                    succeeded = await job_task
+                except asyncio.CancelledError:
+                    await sql_session.rollback()
+                    if lease_lost.is_set() and job_task.cancelled():
+                        # Another worker may have claimed the job, it owns
+                        # every write from here on
+                        print(f"Worker {worker_id} stopped job {job.id}")
+                        return
+                    await self.queue.release(sql_session, job, worker_id)
+                    raise
+                except Exception as e:
+                    traceback.print_exc()
+                    await sql_session.rollback()
+                    if lease_lost.is_set():
+                        return
+                    if retry_on_error:
+                        await self.queue.retry(sql_session, job, worker_id)
+                    else:
+                        await self.queue.fail(
+                            sql_session,
+                            job,
+                            worker_id,
+                            APIErrorModel.from_exception(e),
+                        )
+                    return
+                finally:
+                    lease_renewal.cancel()
+
+                if not lease_lost.is_set():
+                    await self.queue.complete(sql_session, job, worker_id, succeeded)
+        finally:
+            self.running_jobs -= 1
+
+    async def _renew_lease(
+        self,
+        job_id: str,
+        worker_id: str,
+        job_task: asyncio.Task,
+        lease_lost: asyncio.Event,
+    ):
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            try:
+                async with self.session_maker() as sql_session:
+                    if not await self.queue.renew_lease(sql_session, job_id, worker_id):
+                        print(f"Worker {worker_id} lost the lease of job {job_id}")
+                        # The job must not keep running next to a new claim
+                        lease_lost.set()
+                        job_task.cancel()
+                        return
+            except Exception:
+                traceback.print_exc()
@@ -0,0 +1,173 @@
+from collections import OrderedDict
+import hashlib
+import io
+import json
+import os
+import uuid
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+from constants.presentation import (
+    PROCESSED_IMAGE_CACHE_MAX_BYTES,
+    PROCESSED_IMAGE_CACHE_SOURCE_HASHES,
+)
+from utils.asset_directory_utils import get_cache_directory
+
+PROCESSED_IMAGE_EXTENSIONS = (".png", ".jpg")
+
+
+class ProcessedImageCache:
+    """
+    Content addressed disk cache for pictures processed during PPTX export.
+
+    Entries are keyed by a hash of the source image bytes, the ordered list
+    of operations applied to it, the target size and the export dpi. The
+    modification time of each file is its last access, the least recently
+    used files are removed once the directory grows past max_bytes. State
+    lives on disk so export worker processes share the cache.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = PROCESSED_IMAGE_CACHE_MAX_BYTES,
+    ):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._size: Optional[int] = None
+        # Avoids re-reading unchanged sources, keyed by path, mtime and size
+        self._source_hashes: OrderedDict[Tuple[str, int, int], str] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_directory(self) -> str:
+        if not self._directory:
+            self._directory = os.path.join(get_cache_directory(), "processed_images")
+        os.makedirs(self._directory, exist_ok=True)
+        return self._directory
+
+    def get_source_hash(self, path: str) -> Optional[str]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        stat_key = (path, stat.st_mtime_ns, stat.st_size)
+        source_hash = self._source_hashes.get(stat_key)
+        if source_hash:
+            self._source_hashes.move_to_end(stat_key)
+            return source_hash
+
+        source_hash = hashlib.sha256()
+        try:
+            with open(path, "rb") as source:
+                for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                    source_hash.update(chunk)
+        except OSError:
+            return None
+
+        self._source_hashes[stat_key] = source_hash.hexdigest()
+        while len(self._source_hashes) > PROCESSED_IMAGE_CACHE_SOURCE_HASHES:
+            self._source_hashes.popitem(last=False)
+        return self._source_hashes[stat_key]
+
+    def get_key(
+        self,
+        source_hash: str,
+        operations: List[list],
+        size: Tuple[float, float],
+        dpi: Optional[int] = None,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "source": source_hash,
+                "operations": operations,
+                "size": list(size),
+                "dpi": dpi,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_path(self, key: str, extension: str) -> str:
+        return os.path.join(self.get_directory(), f"{key}{extension}")
+
+    def get(self, key: str) -> Optional[str]:
+        for extension in PROCESSED_IMAGE_EXTENSIONS:
+            path = self._get_path(key, extension)
+            try:
+                # Marks the entry as recently used
+                os.utime(path)
+            except OSError:
+                continue
+            self.hits += 1
+            return path
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, image: Image.Image) -> str:
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG")
+        return self.set_bytes(key, buffer.getvalue(), ".png")
+
+    def set_bytes(self, key: str, data: bytes, extension: str) -> str:
+        path = self._get_path(key, extension)
+        # Another process may read the entry while it is being written
+        temp_path = os.path.join(self.get_directory(), f".{uuid.uuid4()}")
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+        if self._size is None:
+            self._size = self._get_directory_size()
+        else:
+            self._size += len(data)
+        if self._size > self._max_bytes:
+            self._evict()
+        return path
+
+    def _get_entries(self) -> List[os.DirEntry]:
+        with os.scandir(self.get_directory()) as entries:
+            return [
+                entry
+                for entry in entries
+                if entry.is_file() and not entry.name.startswith(".")
+            ]
+
+    def _get_directory_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._get_entries())
+
+    def _evict(self):
+        # Other processes write here too, so the directory is the source of truth
+        entries = sorted(self._get_entries(), key=lambda entry: entry.stat().st_mtime)
+        self._size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if self._size <= self._max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    def get_stats(self) -> dict:
+        requests = self.hits + self.misses
+        if self._size is None:
+            self._size = self._get_directory_size()
+        return {
+            "size_bytes": self._size,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0,
+            "evictions": self.evictions,
+        }
+
+
+PROCESSED_IMAGE_CACHE = ProcessedImageCache()
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from services import documents_loader
+from services.docling_worker_pool import DoclingWorkerPool
+from services.documents_loader import DocumentsLoader
+from services.parsed_document_cache import ParsedDocumentCache
+
+PARSE_SECONDS = 0.5
+
+
+def fake_parse(file_path: str, page_range=None) -> str:
+    if "slow" in file_path:
+        time.sleep(60)
+    time.sleep(PARSE_SECONDS)
+    return f"# {os.path.basename(file_path)} parsed by {os.getpid()}"
+
+
+def write_files(directory, names):
+    paths = []
+    for name in names:
+        path = os.path.join(directory, name)
+        with open(path, "w") as file:
+            file.write(name)
+        paths.append(path)
+    return paths
+
+
+def test_documents_are_parsed_in_parallel_by_warm_workers(tmp_path, monkeypatch):
+    # Every file goes to the parse function
+    monkeypatch.setenv("PDF_TEXT_LAYER", "false")
+    monkeypatch.setenv("NATIVE_OFFICE_EXTRACTION", "false")
+    pool = DoclingWorkerPool(workers=2, parse=fake_parse, initializer=None)
+    monkeypatch.setattr(documents_loader, "DOCLING_WORKER_POOL", pool)
+    monkeypatch.setattr(
+        documents_loader,
+        "PARSED_DOCUMENT_CACHE",
+        ParsedDocumentCache(str(tmp_path / "cache")),
+    )
+    paths = write_files(tmp_path, ["a.pdf", "b.docx", "c.pptx", "d.pdf"])
+
+    async def load():
+        # Starts both workers, they are reused for the documents after
+        await asyncio.gather(*[pool.parse_to_markdown(path) for path in paths[:2]])
+
+        loader = DocumentsLoader(paths)
+        started_at = time.monotonic()
+        await loader.load_documents(str(tmp_path))
+        return loader.documents, time.monotonic() - started_at
+
+    try:
+        documents, elapsed = asyncio.run(load())
+    finally:
+        pool.shutdown()
+
+    assert [document.split()[1] for document in documents] == [
+        "a.pdf",
+        "b.docx",
+        "c.pptx",
+        "d.pdf",
+    ]
+    assert os.getpid() not in {int(document.split()[-1]) for document in documents}
+    assert elapsed < PARSE_SECONDS * 3.5
+    assert pool.get_stats()["completed"] == 6
+
+
+def test_documents_that_take_too_long_fail_without_blocking_others(tmp_path):
+    pool = DoclingWorkerPool(workers=2, timeout=3, parse=fake_parse, initializer=None)
+    slow_path, fast_path = write_files(tmp_path, ["slow.pdf", "fast.pdf"])
+
+    async def parse():
+        return await asyncio.gather(
+            pool.parse_to_markdown(slow_path),
+            pool.parse_to_markdown(fast_path),
+            return_exceptions=True,
+        )
+
+    try:
+        slow_result, fast_result = asyncio.run(parse())
+        # The restarted workers keep parsing
+        assert asyncio.run(pool.parse_to_markdown(fast_path)).startswith("# fast")
+    finally:
+        pool.shutdown()
+
+    assert isinstance(slow_result, HTTPException)
+    assert slow_result.status_code == 504
+    assert fast_result.startswith("# fast.pdf")
+    stats = pool.get_stats()
+    assert stats["timed_out"] == 1
+    assert stats["restarts"] == 1
+
+
+def test_documents_beyond_the_queue_are_rejected(tmp_path):
+    release = threading.Event()
+    pool = DoclingWorkerPool(
+        workers=0,
+        queue_size=1,
+        parse=lambda file_path, _: release.wait(5) and file_path,
+        initializer=None,
+    )
+
+    async def parse():
+        first = asyncio.create_task(pool.parse_to_markdown("first.pdf"))
+        second = asyncio.create_task(pool.parse_to_markdown("second.pdf"))
+        await asyncio.sleep(0.1)
+        with pytest.raises(HTTPException) as error:
+            await pool.parse_to_markdown("third.pdf")
+        release.set()
+        return error.value, await first, await second
+
+    error, first, second = asyncio.run(parse())
+
+    assert error.status_code == 503
+    assert (first, second) == ("first.pdf", "second.pdf")
+    assert pool.get_stats()["rejected"] == 1
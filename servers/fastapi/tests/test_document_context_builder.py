@@ -0,0 +1,76 @@
+import asyncio
+
+from services.document_context_builder import (
+    DocumentContextBuilder,
+    estimate_tokens,
+    get_document_context_tokens,
+)
+
+FILLER = "Quarterly numbers were reviewed by the board in detail. " * 30
+
+
+def get_report_document() -> str:
+    return "\n\n".join(
+        [
+            "Annual report of the company.",
+            f"# Revenue\n\n{FILLER}",
+            f"## Solar panel sales\n\nSolar panel sales doubled in Europe. {FILLER}",
+            f"## Hiring\n\n{FILLER}",
+            f"# Outlook\n\n{FILLER}",
+        ]
+    )
+
+
+def test_documents_within_the_budget_are_sent_whole():
+    documents = ["# First\n\nSome text", "No headings here"]
+    context, report = asyncio.run(
+        DocumentContextBuilder().build(documents, "anything", budget_tokens=1000)
+    )
+
+    assert context == "\n\n".join(documents)
+    assert report.dropped_tokens == 0
+
+
+def test_chunks_relevant_to_the_prompt_are_kept_in_document_order():
+    document = get_report_document()
+    context, report = asyncio.run(
+        DocumentContextBuilder(chunk_tokens=500).build(
+            [document], "Presentation about our solar panel sales", budget_tokens=900
+        )
+    )
+
+    assert "## Solar panel sales" in context
+    assert "Solar panel sales doubled in Europe." in context
+    assert estimate_tokens(context) <= 900
+    assert report.dropped_tokens > 0
+    assert report.included_chunks < report.total_chunks
+    assert report.total_tokens == estimate_tokens(document)
+
+
+def test_long_documents_without_headings_are_split_on_paragraphs():
+    builder = DocumentContextBuilder(chunk_tokens=100)
+    paragraphs = [f"Paragraph {i} about topic{i}. {FILLER[:300]}" for i in range(10)]
+    chunks = builder.get_document_chunks("\n\n".join(paragraphs))
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk.content) <= 100 for chunk in chunks)
+
+    context, report = asyncio.run(
+        builder.build(["\n\n".join(paragraphs)], "topic7", budget_tokens=150)
+    )
+    assert "topic7" in context
+    assert report.included_chunks == 1
+
+
+def test_budget_comes_from_the_provider_or_model(monkeypatch):
+    monkeypatch.delenv("DOCUMENT_CONTEXT_TOKENS", raising=False)
+    assert get_document_context_tokens("ollama", "llama3.2:3b") == 6000
+    assert get_document_context_tokens("google", "models/gemini-2.5-flash") == 120000
+
+    monkeypatch.setenv("DOCUMENT_CONTEXT_TOKENS", "ollama=3000,llama3.1:70b=20000")
+    assert get_document_context_tokens("ollama", "llama3.2:3b") == 3000
+    assert get_document_context_tokens("ollama", "llama3.1:70b") == 20000
+    assert get_document_context_tokens("openai", "gpt-4.1") == 48000
+
+    monkeypatch.setenv("DOCUMENT_CONTEXT_TOKENS", "10000")
+    assert get_document_context_tokens("anthropic", "claude-sonnet-4-20250514") == 10000
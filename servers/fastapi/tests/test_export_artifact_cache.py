@@ -0,0 +1,164 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from pptx import Presentation
+
+from models.pptx_models import PptxPresentationModel, PptxSlideModel
+from models.sql.slide import SlideModel
+from services.export_artifact_cache import ExportArtifactCache
+from services.pptx_export_executor import PptxExportExecutor
+from utils import export_utils
+
+PRESENTATION_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def exporter(tmp_path, monkeypatch):
+    slides = [
+        SlideModel(
+            presentation=PRESENTATION_ID,
+            layout_group="general",
+            layout="general:basic-info-slide",
+            index=index,
+            content={"title": f"Slide {index}"},
+        )
+        for index in range(3)
+    ]
+    cache = ExportArtifactCache(str(tmp_path / "exports"), max_bytes=10**9)
+    os.makedirs(cache.get_directory())
+    converted = []
+
+    async def get_presentation_slides(presentation_id):
+        return slides
+
+    async def get_presentation_layout(presentation_id):
+        return {"name": "general"}
+
+    async def get_pptx_model(presentation_id):
+        converted.append(presentation_id)
+        return PptxPresentationModel(slides=[PptxSlideModel(shapes=[]) for _ in slides])
+
+    monkeypatch.setattr(export_utils, "EXPORT_ARTIFACT_CACHE", cache)
+    monkeypatch.setattr(
+        export_utils, "PPTX_EXPORT_EXECUTOR", PptxExportExecutor(concurrency=0)
+    )
+    monkeypatch.setattr(
+        export_utils, "get_presentation_slides", get_presentation_slides
+    )
+    monkeypatch.setattr(
+        export_utils, "get_presentation_layout", get_presentation_layout
+    )
+    monkeypatch.setattr(export_utils, "get_pptx_model", get_pptx_model)
+    return slides, cache, converted
+
+
+def export(
+    title: str = "Quarterly Review", presentation_id: uuid.UUID = PRESENTATION_ID
+) -> str:
+    return asyncio.run(
+        export_utils.export_presentation(presentation_id, title, "pptx")
+    ).path
+
+
+def test_unchanged_presentations_return_the_existing_file(exporter):
+    _, cache, converted = exporter
+
+    first_path = export()
+    second_path = export()
+
+    assert first_path == second_path
+    assert os.path.basename(first_path) == "Quarterly Review.pptx"
+    assert len(Presentation(first_path).slides) == 3
+    assert len(converted) == 1
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_changes_are_exported_again(exporter):
+    slides, _, converted = exporter
+
+    first_path = export()
+    slides[1].content = {"title": "Edited"}
+    second_path = export()
+    # Renames go through update_presentation, which invalidates the exports
+    third_path = export("New title")
+
+    assert first_path != second_path
+    assert third_path == second_path
+    assert len(converted) == 2
+
+
+def test_updates_invalidate_exports_of_the_presentation(exporter):
+    _, cache, converted = exporter
+
+    path = export()
+    cache.invalidate(PRESENTATION_ID)
+
+    assert not os.path.exists(path)
+    export()
+    assert len(converted) == 2
+    assert cache.get_stats()["invalidations"] == 1
+
+
+def test_identical_presentations_have_their_own_exports(exporter):
+    _, cache, converted = exporter
+    other_presentation_id = uuid.uuid4()
+
+    path = export()
+    other_path = export("Copy", other_presentation_id)
+
+    assert other_path != path
+    assert os.path.basename(other_path) == "Copy.pptx"
+    assert len(converted) == 2
+
+    cache.invalidate(PRESENTATION_ID)
+    assert not os.path.exists(path)
+    assert os.path.exists(other_path)
+
+
+def test_invalidation_survives_restarts(exporter):
+    _, cache, _ = exporter
+
+    path = export()
+    ExportArtifactCache(cache.get_directory()).invalidate(PRESENTATION_ID)
+
+    assert not os.path.exists(path)
+
+
+def test_exports_are_capped(exporter, monkeypatch):
+    slides, cache, _ = exporter
+
+    # An export made outside the cache
+    loose_path = os.path.join(cache.get_directory(), "old.pptx")
+    with open(loose_path, "wb") as loose_file:
+        loose_file.write(b"0" * 1024)
+    os.utime(loose_path, (1, 1))
+
+    first_path = export()
+    monkeypatch.setattr(cache, "_max_bytes", os.path.getsize(first_path) * 1.5)
+    slides[0].content = {"title": "Edited"}
+    second_path = export()
+
+    # Files the cache didn't create are left alone
+    assert os.path.exists(loose_path)
+    assert not os.path.exists(first_path)
+    assert os.path.exists(second_path)
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_edited_templates_are_exported_again(exporter, monkeypatch):
+    _, _, converted = exporter
+    layout_version = "1"
+
+    async def get_layout_version(layout_name):
+        return layout_version
+
+    monkeypatch.setattr(export_utils, "get_layout_version", get_layout_version)
+
+    first_path = export()
+    layout_version = "2"
+    second_path = export()
+
+    assert first_path != second_path
+    assert len(converted) == 2
@@ -0,0 +1,160 @@
+import asyncio
+import io
+import os
+import uuid
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pptx import Presentation
+
+from models.pptx_models import (
+    PptxParagraphModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+    PptxTextBoxModel,
+)
+from models.sql.slide import SlideModel
+from services.export_artifact_cache import ExportArtifactCache
+from services.pptx_export_executor import PptxExportExecutor, build_pptx
+from utils import export_utils
+
+PRESENTATION_ID = uuid.uuid4()
+N_SLIDES = 30
+
+
+def get_pptx_model() -> PptxPresentationModel:
+    return PptxPresentationModel(
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    PptxTextBoxModel(
+                        position=PptxPositionModel(
+                            left=40, top=40, width=600, height=80
+                        ),
+                        paragraphs=[PptxParagraphModel(text=f"Slide {index}")],
+                    )
+                ]
+            )
+            for index in range(N_SLIDES)
+        ]
+    )
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    cache = ExportArtifactCache(str(tmp_path / "exports"), max_bytes=10**9)
+    os.makedirs(cache.get_directory())
+    slides = [
+        SlideModel(
+            presentation=PRESENTATION_ID,
+            layout_group="general",
+            layout="general:basic-info-slide",
+            index=0,
+            content={"title": "Slide"},
+        )
+    ]
+
+    async def get_presentation_slides(presentation_id):
+        return slides
+
+    async def get_presentation_layout(presentation_id):
+        return None
+
+    async def get_pptx_model_(presentation_id):
+        return get_pptx_model()
+
+    monkeypatch.setattr(export_utils, "EXPORT_ARTIFACT_CACHE", cache)
+    monkeypatch.setattr(
+        export_utils, "PPTX_EXPORT_EXECUTOR", PptxExportExecutor(concurrency=0)
+    )
+    monkeypatch.setattr(
+        export_utils, "get_presentation_slides", get_presentation_slides
+    )
+    monkeypatch.setattr(
+        export_utils, "get_presentation_layout", get_presentation_layout
+    )
+    monkeypatch.setattr(export_utils, "get_pptx_model", get_pptx_model_)
+
+    app = FastAPI()
+
+    @app.get("/download")
+    async def download(request: Request):
+        return await export_utils.get_export_download_response(
+            PRESENTATION_ID, "Quarterly Review", "pptx", request.headers
+        )
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_first_download_is_streamed_and_then_served_from_cache(client):
+    streamed = client.get("/download")
+    assert streamed.status_code == 200
+    assert "content-length" not in streamed.headers
+    assert "Quarterly%20Review.pptx" in streamed.headers["content-disposition"]
+    assert len(Presentation(io.BytesIO(streamed.content)).slides) == N_SLIDES
+
+    cached = client.get("/download")
+    assert cached.status_code == 200
+    assert cached.headers["etag"] == streamed.headers["etag"]
+    assert int(cached.headers["content-length"]) == len(streamed.content)
+    # Resumed downloads need the exact bytes that were streamed
+    assert cached.content == streamed.content
+
+
+def test_downloads_resume_with_range_requests(client):
+    content = client.get("/download").content
+    etag = client.get("/download").headers["etag"]
+
+    partial = client.get(
+        "/download", headers={"Range": "bytes=1000-", "If-Range": etag}
+    )
+    assert partial.status_code == 206
+    assert partial.content == content[1000:]
+
+    stale = client.get(
+        "/download", headers={"Range": "bytes=1000-", "If-Range": '"stale"'}
+    )
+    assert stale.status_code == 200
+    assert stale.content == content
+
+
+def test_unchanged_downloads_are_not_modified(client):
+    client.get("/download")
+    etag = client.get("/download").headers["etag"]
+
+    response = client.get("/download", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_streaming_starts_before_the_file_is_complete(tmp_path):
+    path = str(tmp_path / "growing.bin")
+    open(path, "wb").close()
+
+    async def write():
+        with open(path, "ab") as file:
+            for _ in range(3):
+                file.write(b"x" * 10)
+                file.flush()
+                await asyncio.sleep(0.1)
+
+    async def run():
+        build = asyncio.create_task(write())
+        chunks = []
+        async for chunk in export_utils.iter_growing_file(path, build):
+            chunks.append((chunk, build.done()))
+        return chunks
+
+    chunks = asyncio.run(run())
+    assert b"".join(chunk for chunk, _ in chunks) == b"x" * 30
+    assert not chunks[0][1]
+
+
+def test_streaming_builds_write_valid_files(tmp_path):
+    pptx_path = str(tmp_path / "streamed.pptx")
+    build_pptx(get_pptx_model(), str(tmp_path), pptx_path, streaming=True)
+
+    presentation = Presentation(pptx_path)
+    assert presentation.slides[29].shapes[0].text_frame.text == "Slide 29"
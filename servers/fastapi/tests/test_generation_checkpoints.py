@@ -0,0 +1,130 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.sql.presentation_generation_checkpoint import (
+    PresentationGenerationCheckpointModel,
+)
+from services.generation_checkpoints import (
+    GenerationCheckpoints,
+    get_checkpoint_stages,
+)
+
+
+def get_session_maker(tmp_path) -> async_sessionmaker:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'checkpoints.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn,
+                    tables=[PresentationGenerationCheckpointModel.__table__],
+                )
+            )
+
+    asyncio.run(create_tables())
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def test_failed_attempt_is_resumed_from_checkpoints(tmp_path):
+    session_maker = get_session_maker(tmp_path)
+    generated = []
+
+    async def generate_slide(checkpoints: GenerationCheckpoints, index: int):
+        slide_content = await checkpoints.reuse(f"slides[{index}]")
+        if slide_content:
+            return slide_content
+
+        if index == 3 and not generated.count(3):
+            generated.append(index)
+            raise Exception("LLM API error")
+
+        generated.append(index)
+        slide_content = {"title": f"Slide {index}"}
+        await checkpoints.save(f"slides[{index}]", slide_content)
+        return slide_content
+
+    async def attempt():
+        checkpoints = GenerationCheckpoints("task-1", session_maker)
+        await checkpoints.load()
+        outlines = await checkpoints.reuse("outlines")
+        if not outlines:
+            outlines = {"slides": [f"Slide {i}" for i in range(5)]}
+            await checkpoints.save("outlines", outlines)
+
+        results = await asyncio.gather(
+            *[generate_slide(checkpoints, i) for i in range(5)],
+            return_exceptions=True,
+        )
+        return checkpoints, results
+
+    async def inner():
+        _, first_results = await attempt()
+        checkpoints, second_results = await attempt()
+        await checkpoints.complete()
+
+        async with session_maker() as sql_session:
+            stages = await get_checkpoint_stages(sql_session, "task-1")
+
+        completed_checkpoints = GenerationCheckpoints("task-1", session_maker)
+        await completed_checkpoints.load()
+        return (
+            first_results,
+            second_results,
+            checkpoints,
+            stages,
+            await completed_checkpoints.reuse("outlines"),
+        )
+
+    first_results, second_results, checkpoints, stages, completed_outlines = (
+        asyncio.run(inner())
+    )
+
+    assert isinstance(first_results[3], Exception)
+    assert second_results == [{"title": f"Slide {i}"} for i in range(5)]
+    # Only the failed slide is generated again
+    assert generated == [0, 1, 2, 3, 4, 3]
+    assert sorted(checkpoints.reused_stages) == [
+        "outlines",
+        "slides[0]",
+        "slides[1]",
+        "slides[2]",
+        "slides[4]",
+    ]
+
+    checkpointed_stages, reused_stages = stages
+    assert sorted(checkpointed_stages) == ["outlines"] + [
+        f"slides[{i}]" for i in range(5)
+    ]
+    assert sorted(reused_stages) == sorted(checkpoints.reused_stages)
+    # Data is dropped once the generation completes
+    assert completed_outlines is None
+
+
+def test_saved_data_is_a_snapshot(tmp_path):
+    session_maker = get_session_maker(tmp_path)
+
+    async def inner():
+        checkpoints = GenerationCheckpoints("task-1", session_maker)
+        content = {"image": {"__image_prompt__": "cat"}}
+        await checkpoints.save("slides[0]", content)
+        content["image"]["__image_url__"] = "/images/cat.png"
+
+        resumed = GenerationCheckpoints("task-1", session_maker)
+        await resumed.load()
+        return await resumed.reuse("slides[0]")
+
+    assert asyncio.run(inner()) == {"image": {"__image_prompt__": "cat"}}
+
+
+def test_no_task_id_does_nothing():
+    async def inner():
+        checkpoints = GenerationCheckpoints(None)
+        await checkpoints.load()
+        await checkpoints.save("outlines", {"slides": []})
+        await checkpoints.complete()
+        return await checkpoints.reuse("missing")
+
+    assert asyncio.run(inner()) is None
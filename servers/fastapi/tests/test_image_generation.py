@@ -11,6 +11,18 @@ from services.image_generation_service import ImageGenerationService
 from models.sql.image_asset import ImageAsset
 
 
+def get_mock_http_session(mock_response):
+    """
+    Mocks the pooled http session, whose get() is used as an async context manager
+    """
+    mock_request = AsyncMock()
+    mock_request.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_request.__aexit__ = AsyncMock(return_value=None)
+    mock_session = Mock()
+    mock_session.get = Mock(return_value=mock_request)
+    return mock_session
+
+
 class TestImageGenerationService:
     """
     Testing the image Generation Service
@@ -133,12 +145,9 @@ class TestImageGenerationService:
                                     }]
                                 })
                                 
-                                mock_session = AsyncMock()
-                                mock_session.get = AsyncMock(return_value=mock_response)
-                                mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-                                mock_session.__aexit__ = AsyncMock(return_value=None)
+                                mock_session = get_mock_http_session(mock_response)
                                 
-                                with patch('aiohttp.ClientSession', return_value=mock_session):
+                                with patch('services.image_generation_service.get_http_session', return_value=mock_session):
                                     result = await service.generate_image(sample_image_prompt)
                                     assert result == "https://example.com/image.jpg"
         
@@ -245,12 +254,9 @@ class TestImageGenerationService:
                     }]
                 })
                 
-                mock_session = AsyncMock()
-                mock_session.get = AsyncMock(return_value=mock_response)
-                mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-                mock_session.__aexit__ = AsyncMock(return_value=None)
+                mock_session = get_mock_http_session(mock_response)
                 
-                with patch('aiohttp.ClientSession', return_value=mock_session):
+                with patch('services.image_generation_service.get_http_session', return_value=mock_session):
                     result = await service.get_image_from_pexels("sunset")
                     
                     assert result == "https://example.com/pexels_image.jpg"
@@ -276,12 +282,9 @@ class TestImageGenerationService:
                     }]
                 })
                 
-                mock_session = AsyncMock()
-                mock_session.get = AsyncMock(return_value=mock_response)
-                mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-                mock_session.__aexit__ = AsyncMock(return_value=None)
+                mock_session = get_mock_http_session(mock_response)
                 
-                with patch('aiohttp.ClientSession', return_value=mock_session):
+                with patch('services.image_generation_service.get_http_session', return_value=mock_session):
                     result = await service.get_image_from_pixabay("sunset")
                     
                     assert result == "https://example.com/pixabay_image.jpg"
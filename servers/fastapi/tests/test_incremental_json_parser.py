@@ -0,0 +1,125 @@
+import asyncio
+import json
+
+import pytest
+
+from enums.llm_provider import LLMProvider
+from models.structured_stream_chunk import StructuredStreamChunk
+from services.llm_client import LLMClient
+from utils.incremental_json_parser import IncrementalJsonParser, parse_item_path
+
+
+def get_outline(n_slides: int = 30) -> dict:
+    return {
+        "slides": [
+            {
+                "content": f"# Slide {i}\n- Point with \"quotes\", [brackets] and {{braces}}\n- Growth: {i * 3.5}%"
+            }
+            for i in range(n_slides)
+        ]
+    }
+
+
+def split_into_chunks(text: str, size: int):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def test_parse_item_path():
+    assert parse_item_path("slides[*]") == ["slides", "*"]
+    assert parse_item_path("data.items[*]") == ["data", "items", "*"]
+    assert parse_item_path("[*]") == ["*"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 16, 64, 10000])
+def test_items_match_full_parse(chunk_size):
+    outline = get_outline(8)
+    text = json.dumps(outline, indent=2)
+
+    parser = IncrementalJsonParser("slides[*]")
+    items = []
+    for chunk in split_into_chunks(text, chunk_size):
+        items.extend(parser.feed(chunk))
+
+    assert items == outline["slides"]
+
+
+def test_items_are_emitted_as_soon_as_they_close():
+    parser = IncrementalJsonParser("slides[*]")
+    assert parser.feed('{"slides": [{"content": "a"}, {"cont') == [{"content": "a"}]
+    assert parser.feed('ent": "b"}') == [{"content": "b"}]
+    assert parser.feed("]}") == []
+
+
+def test_nested_paths_and_primitives():
+    parser = IncrementalJsonParser("data.values[*]")
+    items = parser.feed(
+        '{"other": {"values": [9]}, "data": {"values": [1, -2.5, "x]", true, null]}}'
+    )
+    assert items == [1, -2.5, "x]", True, None]
+
+
+def test_root_array():
+    parser = IncrementalJsonParser("[*]")
+    assert parser.feed('[{"a": [1, 2]}, {"b": "}"}]') == [{"a": [1, 2]}, {"b": "}"}]
+
+
+PROVIDER_STREAM_METHODS = {
+    LLMProvider.OPENAI: "_stream_openai_structured",
+    LLMProvider.GOOGLE: "_stream_google_structured",
+    LLMProvider.ANTHROPIC: "_stream_anthropic_structured",
+    LLMProvider.OLLAMA: "_stream_ollama_structured",
+    LLMProvider.CUSTOM: "_stream_custom_structured",
+}
+
+
+@pytest.mark.parametrize("provider", list(PROVIDER_STREAM_METHODS.keys()))
+def test_llm_client_incremental_mode(provider, monkeypatch):
+    monkeypatch.setenv("LLM", provider.value)
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    monkeypatch.setenv("GOOGLE_API_KEY", "key")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "key")
+    monkeypatch.setenv("CUSTOM_LLM_URL", "http://127.0.0.1:1/v1")
+    monkeypatch.delenv("LLM_RESPONSE_CACHE", raising=False)
+
+    outline = get_outline(5)
+    text = json.dumps(outline)
+
+    def stream(self, **kwargs):
+        async def inner():
+            for chunk in split_into_chunks(text, 5):
+                yield chunk
+
+        return inner()
+
+    monkeypatch.setattr(LLMClient, PROVIDER_STREAM_METHODS[provider], stream)
+
+    async def collect():
+        chunks = []
+        async for each in LLMClient().stream_structured(
+            "model", [], {}, incremental_path="slides[*]"
+        ):
+            chunks.append(each)
+        return chunks
+
+    chunks = asyncio.run(collect())
+
+    assert all(isinstance(each, StructuredStreamChunk) for each in chunks)
+    assert "".join(each.chunk for each in chunks) == text
+    assert [item for each in chunks for item in each.items] == outline["slides"]
+
+
+def test_first_item_is_emitted_long_before_the_stream_ends():
+    outline = get_outline(30)
+    chunks = split_into_chunks(json.dumps(outline), 8)
+
+    parser = IncrementalJsonParser("slides[*]")
+    items = []
+    first_item_chunk = None
+    for index, chunk in enumerate(chunks):
+        items.extend(parser.feed(chunk))
+        if items and first_item_chunk is None:
+            first_item_chunk = index
+
+    assert items == outline["slides"]
+    # A parse at the end of the stream has nothing until the last chunk
+    assert first_item_chunk < len(chunks) / 20
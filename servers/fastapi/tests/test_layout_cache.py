@@ -0,0 +1,122 @@
+import asyncio
+
+from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
+from services.layout_cache import LayoutCache
+
+
+class FakeTemplateServer:
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.revision = 0
+        self.fetches = 0
+
+    async def fetch_layout(self, layout_name: str):
+        self.fetches += 1
+        await asyncio.sleep(self.delay)
+        return PresentationLayoutModel(
+            name=layout_name,
+            ordered=False,
+            slides=[
+                SlideLayoutModel(
+                    id=f"slide-{self.revision}", json_schema={"type": "object"}
+                )
+            ],
+        )
+
+
+def get_cache(versions: dict = None, ttl_seconds: float = 600) -> LayoutCache:
+    versions = versions if versions is not None else {}
+
+    async def get_version(layout_name):
+        return versions.get(layout_name)
+
+    return LayoutCache(ttl_seconds=ttl_seconds, get_version=get_version)
+
+
+def test_concurrent_requests_share_one_fetch():
+    server = FakeTemplateServer()
+    cache = get_cache()
+
+    async def inner():
+        return await asyncio.gather(
+            *[cache.get("general", server.fetch_layout) for _ in range(10)]
+        )
+
+    layouts = asyncio.run(inner())
+
+    assert server.fetches == 1
+    assert all(layout.name == "general" for layout in layouts)
+    # Callers get their own copies
+    assert len({id(layout) for layout in layouts}) == 10
+    assert cache.get_stats()["shared_loads"] == 9
+
+
+def test_cached_layout_is_reused_until_invalidated():
+    server = FakeTemplateServer()
+    cache = get_cache()
+
+    async def inner():
+        first = await cache.get("general", server.fetch_layout)
+        second = await cache.get("general", server.fetch_layout)
+        server.revision += 1
+        cache.invalidate("general")
+        third = await cache.get("general", server.fetch_layout)
+        return first, second, third
+
+    first, second, third = asyncio.run(inner())
+
+    assert server.fetches == 2
+    assert first.slides[0].id == second.slides[0].id == "slide-0"
+    assert third.slides[0].id == "slide-1"
+
+
+def test_version_change_refetches_layout():
+    server = FakeTemplateServer()
+    versions = {"custom-1": "1:2025-01-01"}
+    cache = get_cache(versions)
+
+    async def inner():
+        await cache.get("custom-1", server.fetch_layout)
+        await cache.get("custom-1", server.fetch_layout)
+        # Saved from another process
+        versions["custom-1"] = "2:2025-01-02"
+        server.revision += 1
+        return await cache.get("custom-1", server.fetch_layout)
+
+    layout = asyncio.run(inner())
+
+    assert server.fetches == 2
+    assert layout.slides[0].id == "slide-1"
+
+
+def test_expired_entries_are_refetched():
+    server = FakeTemplateServer()
+    cache = get_cache(ttl_seconds=0)
+
+    async def inner():
+        await cache.get("general", server.fetch_layout)
+        server.revision += 1
+        return await cache.get("general", server.fetch_layout)
+
+    layout = asyncio.run(inner())
+
+    assert server.fetches == 2
+    assert layout.slides[0].id == "slide-1"
+
+
+def test_invalidation_during_fetch_is_not_cached():
+    server = FakeTemplateServer(delay=0.05)
+    cache = get_cache()
+
+    async def inner():
+        stale_fetch = asyncio.create_task(cache.get("general", server.fetch_layout))
+        await asyncio.sleep(0.01)
+        server.revision += 1
+        cache.invalidate("general")
+        await stale_fetch
+        return await cache.get("general", server.fetch_layout)
+
+    layout = asyncio.run(inner())
+
+    assert server.fetches == 2
+    assert layout.slides[0].id == "slide-1"
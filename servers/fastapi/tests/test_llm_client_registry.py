@@ -0,0 +1,159 @@
+import asyncio
+import gc
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from services.llm_client import LLMClient
+from services.llm_client_registry import LLM_CLIENT_REGISTRY
+
+
+class OpenAICompatibleStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # A handler instance is created for every new tcp connection
+        self.server.connections += 1
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.server.requests += 1
+
+        body = json.dumps(
+            {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "stub-model",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "Hello"},
+                    }
+                ],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OpenAICompatibleStubHandler)
+    server.connections = 0
+    server.requests = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def custom_llm_env(monkeypatch, stub_server):
+    monkeypatch.setenv("LLM", "custom")
+    monkeypatch.setenv(
+        "CUSTOM_LLM_URL", f"http://127.0.0.1:{stub_server.server_port}/v1"
+    )
+    monkeypatch.setenv("CUSTOM_LLM_API_KEY", "stub-key")
+    monkeypatch.delenv("DISABLE_THINKING", raising=False)
+    LLM_CLIENT_REGISTRY.clear()
+    yield
+    LLM_CLIENT_REGISTRY.clear()
+
+
+def get_messages():
+    return [
+        LLMSystemMessage(content="You are a stub"),
+        LLMUserMessage(content="Say hello"),
+    ]
+
+
+def test_llm_clients_share_provider_client(custom_llm_env):
+    async def inner():
+        return LLMClient()._client, LLMClient()._client
+
+    first, second = asyncio.run(inner())
+    assert first is second
+
+
+def test_llm_client_reuses_connections(custom_llm_env, stub_server):
+    async def inner():
+        for _ in range(5):
+            response = await LLMClient().generate(
+                model="stub-model", messages=get_messages()
+            )
+            assert response == "Hello"
+
+    asyncio.run(inner())
+
+    assert stub_server.requests == 5
+    assert stub_server.connections == 1
+
+
+def test_llm_client_is_rebuilt_when_config_changes(
+    custom_llm_env, stub_server, monkeypatch
+):
+    async def inner():
+        first = LLMClient()._client
+        monkeypatch.setenv("CUSTOM_LLM_API_KEY", "another-key")
+        second = LLMClient()._client
+        return first, second
+
+    first, second = asyncio.run(inner())
+    assert first is not second
+    assert second.api_key == "another-key"
+
+
+def test_llm_clients_are_kept_per_config(custom_llm_env, monkeypatch):
+    async def inner():
+        clients = []
+        for api_key in ["stub-key", "another-key", "stub-key", "another-key"]:
+            monkeypatch.setenv("CUSTOM_LLM_API_KEY", api_key)
+            clients.append(LLMClient()._client)
+        return clients
+
+    first, second, third, fourth = asyncio.run(inner())
+    assert first is not second
+    assert first is third
+    assert second is fourth
+
+
+def test_evicted_llm_clients_are_closed_once_released(
+    custom_llm_env, stub_server, monkeypatch
+):
+    monkeypatch.setattr(LLM_CLIENT_REGISTRY, "max_clients", 1)
+
+    async def inner():
+        llm_client = LLMClient()
+        evicted = llm_client._client
+
+        monkeypatch.setenv("CUSTOM_LLM_API_KEY", "another-key")
+        LLMClient()
+        assert not evicted.is_closed()
+
+        # Still usable by its holder after eviction
+        response = await llm_client.generate(
+            model="stub-model", messages=get_messages()
+        )
+        assert response == "Hello"
+
+        del llm_client
+        gc.collect()
+        await asyncio.sleep(0.1)
+        return evicted
+
+    evicted = asyncio.run(inner())
+    assert evicted.is_closed()
@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from enums.llm_provider import LLMProvider
+from services.llm_rate_limiter import LLMRateLimiter
+
+
+def get_rate_limit_error(retry_after: str = "0.2"):
+    request = httpx.Request("POST", "http://localhost/v1/chat/completions")
+    response = httpx.Response(
+        429, headers={"retry-after": retry_after}, request=request
+    )
+    return RateLimitError("Rate limited", response=response, body=None)
+
+
+@pytest.fixture
+def rate_limiter(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY", "3")
+    monkeypatch.delenv("LLM_REQUESTS_PER_MINUTE", raising=False)
+    monkeypatch.delenv("LLM_TOKENS_PER_MINUTE", raising=False)
+    return LLMRateLimiter()
+
+
+def test_concurrency_is_capped(rate_limiter):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def call():
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "ok"
+
+    async def inner():
+        return await asyncio.gather(
+            *[
+                rate_limiter.run(LLMProvider.OPENAI, "model", 10, call)
+                for _ in range(12)
+            ]
+        )
+
+    assert asyncio.run(inner()) == ["ok"] * 12
+    assert max_in_flight == 3
+
+
+def test_rate_limited_call_is_retried_after_retry_after(rate_limiter):
+    attempts = []
+
+    async def call():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise get_rate_limit_error("0.2")
+        return "ok"
+
+    async def inner():
+        result = await rate_limiter.run(LLMProvider.OPENAI, "model", 10, call)
+        return result, rate_limiter.get_state()["openai/model"]
+
+    result, state = asyncio.run(inner())
+
+    assert result == "ok"
+    assert attempts[1] - attempts[0] >= 0.2
+    assert state["rate_limited_requests"] == 1
+    assert state["concurrency"] < 3
+
+
+def test_concurrency_grows_back_after_success(rate_limiter):
+    async def inner():
+        limiter = rate_limiter.get_limiter(LLMProvider.OPENAI, "model")
+        limiter.on_rate_limited(0)
+        reduced = limiter.concurrency
+        for _ in range(20):
+            limiter.on_success(0.1)
+        return reduced, limiter.concurrency
+
+    reduced, grown = asyncio.run(inner())
+    assert reduced == 1.5
+    assert grown == 3
+
+
+def test_limiter_state_is_kept_per_loop(rate_limiter):
+    async def get_state_in_other_loop():
+        await rate_limiter.run(
+            LLMProvider.OPENAI, "model", 10, lambda: asyncio.sleep(0)
+        )
+        return rate_limiter.get_state()["openai/model"]
+
+    async def inner():
+        limiter = rate_limiter.get_limiter(LLMProvider.OPENAI, "model")
+        limiter.on_rate_limited(0)
+        other_state = await asyncio.to_thread(asyncio.run, get_state_in_other_loop())
+        return other_state, rate_limiter.get_state()["openai/model"]
+
+    other_state, state = asyncio.run(inner())
+
+    assert other_state["rate_limited_requests"] == 0
+    assert other_state["total_requests"] == 1
+    # The other loop didn't reset the state learned in this one
+    assert state["rate_limited_requests"] == 1
+    assert state["concurrency"] == 1.5
+
+
+def test_stream_is_retried_before_first_chunk(rate_limiter):
+    attempts = 0
+
+    async def get_stream():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise get_rate_limit_error("0")
+        yield "a"
+        yield "b"
+
+    async def inner():
+        return [
+            chunk
+            async for chunk in rate_limiter.stream(
+                LLMProvider.ANTHROPIC, "model", 10, get_stream
+            )
+        ]
+
+    assert asyncio.run(inner()) == ["a", "b"]
+    assert attempts == 2
+
+
+def test_requests_per_minute_bucket(rate_limiter, monkeypatch):
+    monkeypatch.setenv("LLM_REQUESTS_PER_MINUTE", "60")
+
+    async def call():
+        return "ok"
+
+    async def inner():
+        started_at = time.monotonic()
+        for _ in range(61):
+            await rate_limiter.run(LLMProvider.OPENAI, "model", 10, call)
+        return time.monotonic() - started_at
+
+    # Bucket starts full with 60 requests, the 61st waits for a refill
+    assert asyncio.run(inner()) >= 0.9
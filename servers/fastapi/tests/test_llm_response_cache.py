@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+import pytest
+
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from services import llm_client as llm_client_module
+from services.llm_client import LLMClient
+from services.llm_response_cache import LLM_CACHE_BYPASS, LLMResponseCache
+
+
+RESPONSE_FORMAT = {
+    "type": "object",
+    "properties": {"title": {"type": "string"}},
+}
+
+
+@pytest.fixture
+def response_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM", "custom")
+    monkeypatch.setenv("CUSTOM_LLM_URL", "http://127.0.0.1:1/v1")
+    monkeypatch.setenv("LLM_RESPONSE_CACHE", "true")
+    cache = LLMResponseCache(db_path=str(tmp_path / "llm_responses.db"))
+    monkeypatch.setattr(llm_client_module, "LLM_RESPONSE_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    async def generate_structured(self, **kwargs):
+        calls.append("generate")
+        return {"title": "Cached title"}
+
+    async def stream_structured(self, **kwargs):
+        calls.append("stream")
+        for chunk in ['{"title": ', '"Streamed ', 'title"}']:
+            yield chunk
+
+    monkeypatch.setattr(
+        LLMClient, "_generate_custom_structured", generate_structured
+    )
+    monkeypatch.setattr(LLMClient, "_stream_custom_structured", stream_structured)
+    return calls
+
+
+def get_messages(time: str = "10:00:00"):
+    return [
+        LLMSystemMessage(content="Generate a slide"),
+        LLMUserMessage(content=f"Current Date and Time: 2025-01-01 {time}"),
+    ]
+
+
+def test_generate_structured_is_cached(response_cache, llm_calls):
+    async def inner():
+        client = LLMClient()
+        first = await client.generate_structured(
+            "model", get_messages(), RESPONSE_FORMAT
+        )
+        second = await client.generate_structured(
+            "model", get_messages("11:30:15"), RESPONSE_FORMAT
+        )
+        return first, second
+
+    first, second = asyncio.run(inner())
+
+    assert first == second == {"title": "Cached title"}
+    assert llm_calls == ["generate"]
+    assert response_cache.get_stats()["memory_hits"] == 1
+    assert response_cache.get_stats()["misses"] == 1
+
+
+def test_cache_key_depends_on_schema_and_strict(response_cache):
+    messages = get_messages()
+    key = response_cache.get_key(
+        LLMClient().llm_provider, "model", messages, RESPONSE_FORMAT, False
+    )
+    assert key != response_cache.get_key(
+        LLMClient().llm_provider, "model", messages, RESPONSE_FORMAT, True
+    )
+    assert key != response_cache.get_key(
+        LLMClient().llm_provider, "model", messages, {"type": "object"}, False
+    )
+
+
+def test_stream_structured_replays_cached_response(response_cache, llm_calls):
+    async def collect():
+        chunks = []
+        async for chunk in LLMClient().stream_structured(
+            "model", get_messages(), RESPONSE_FORMAT
+        ):
+            chunks.append(chunk)
+        return "".join(chunks)
+
+    async def inner():
+        return await collect(), await collect()
+
+    first, second = asyncio.run(inner())
+
+    assert json.loads(first) == json.loads(second) == {"title": "Streamed title"}
+    assert llm_calls == ["stream"]
+
+
+def test_disk_tier_survives_memory_eviction(response_cache, llm_calls):
+    async def inner():
+        await LLMClient().generate_structured("model", get_messages(), RESPONSE_FORMAT)
+        response_cache.clear_memory()
+        return await LLMClient().generate_structured(
+            "model", get_messages(), RESPONSE_FORMAT
+        )
+
+    assert asyncio.run(inner()) == {"title": "Cached title"}
+    assert llm_calls == ["generate"]
+    assert response_cache.get_stats()["disk_hits"] == 1
+
+
+def test_bypass_skips_cached_response(response_cache, llm_calls):
+    async def inner():
+        await LLMClient().generate_structured("model", get_messages(), RESPONSE_FORMAT)
+        LLM_CACHE_BYPASS.set(True)
+        await LLMClient().generate_structured("model", get_messages(), RESPONSE_FORMAT)
+
+    asyncio.run(inner())
+
+    assert llm_calls == ["generate", "generate"]
+    assert response_cache.get_stats()["bypasses"] == 1
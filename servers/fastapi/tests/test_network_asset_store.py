@@ -0,0 +1,103 @@
+import asyncio
+import os
+
+from aiohttp import web
+
+from services.network_asset_store import NetworkAssetStore
+from utils.download_helpers import close_http_session
+
+IMAGE = b"\x89PNG" + b"0" * 1024
+
+
+async def serve(store: NetworkAssetStore, scenario):
+    requests = []
+    state = {"fail": False}
+
+    async def image(request: web.Request):
+        requests.append((request.path, dict(request.headers)))
+        await asyncio.sleep(0.01)
+        if state["fail"]:
+            return web.Response(status=503)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(
+            body=IMAGE, content_type="image/png", headers={"ETag": '"v1"'}
+        )
+
+    app = web.Application()
+    app.router.add_get("/{name}", image)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        return await scenario(f"http://127.0.0.1:{port}", requests, state)
+    finally:
+        await close_http_session()
+        await runner.cleanup()
+
+
+def test_urls_are_downloaded_once(tmp_path):
+    store = NetworkAssetStore(str(tmp_path))
+
+    async def scenario(base_url, requests, _):
+        paths = await asyncio.gather(
+            *[store.fetch(f"{base_url}/photo") for _ in range(5)]
+        )
+        paths.append(await store.fetch(f"{base_url}/photo"))
+        assert len(requests) == 1
+        return paths
+
+    paths = asyncio.run(serve(store, scenario))
+
+    assert len(set(paths)) == 1
+    assert paths[0].endswith(".png")
+    with open(paths[0], "rb") as file:
+        assert file.read() == IMAGE
+    assert store.get_stats()["downloads"] == 1
+    assert store.get_stats()["hits"] == 1
+
+
+def test_stale_assets_are_revalidated(tmp_path):
+    store = NetworkAssetStore(str(tmp_path), revalidate_seconds=0)
+
+    async def scenario(base_url, requests, state):
+        first_path = await store.fetch(f"{base_url}/photo.png")
+        second_path = await store.fetch(f"{base_url}/photo.png")
+        assert requests[1][1]["If-None-Match"] == '"v1"'
+
+        # The stored copy is used while the origin fails
+        state["fail"] = True
+        third_path = await store.fetch(f"{base_url}/photo.png")
+        return first_path, second_path, third_path
+
+    paths = asyncio.run(serve(store, scenario))
+
+    assert len(set(paths)) == 1
+    stats = store.get_stats()
+    assert stats["downloads"] == 1
+    assert stats["revalidations"] == 1
+    assert stats["failures"] == 1
+
+
+def test_least_recently_used_assets_are_evicted(tmp_path):
+    store = NetworkAssetStore(str(tmp_path), max_bytes=len(IMAGE))
+
+    async def scenario(base_url, requests, _):
+        # Same bytes behind two urls share one file
+        first_path = await store.fetch(f"{base_url}/a.png")
+        second_path = await store.fetch(f"{base_url}/b.png")
+        assert first_path == second_path
+        assert store.get_stats()["evictions"] == 0
+
+        return first_path
+
+    path = asyncio.run(serve(store, scenario))
+    assert os.path.exists(path)
+
+    store._set_entry("http://example.com/other.png", "other.png", None, None, 10)
+    stats = store.get_stats()
+    assert stats["assets"] == 1
+    assert stats["evictions"] == 2
+    assert not os.path.exists(path)
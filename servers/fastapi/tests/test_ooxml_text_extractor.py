@@ -0,0 +1,122 @@
+import asyncio
+import os
+
+import pytest
+
+from benchmarks.sample_documents import (
+    docx_paragraph,
+    docx_table,
+    docx_text_box,
+    write_docx,
+    write_pptx,
+)
+from services import documents_loader
+from services.docling_worker_pool import DoclingWorkerPool
+from services.documents_loader import DocumentsLoader
+from services.ooxml_text_extractor import (
+    extract_docx_markdown,
+    extract_pptx_markdown,
+)
+from services.parsed_document_cache import ParsedDocumentCache
+from services.score_based_chunker import ScoreBasedChunker
+
+
+@pytest.fixture
+def docling_calls(tmp_path, monkeypatch):
+    calls = []
+
+    def parse(file_path, page_range=None):
+        calls.append(os.path.basename(file_path))
+        return "<docling>"
+
+    monkeypatch.setattr(
+        documents_loader,
+        "DOCLING_WORKER_POOL",
+        DoclingWorkerPool(workers=0, parse=parse, initializer=None),
+    )
+    monkeypatch.setattr(
+        documents_loader,
+        "PARSED_DOCUMENT_CACHE",
+        ParsedDocumentCache(str(tmp_path / "cache"), parser_version="1"),
+    )
+    return calls
+
+
+def load(path: str) -> str:
+    loader = DocumentsLoader([path])
+    asyncio.run(loader.load_documents(os.path.dirname(path)))
+    return loader.documents[0]
+
+
+def test_word_files_keep_headings_lists_and_tables(tmp_path):
+    path = os.path.join(tmp_path, "report.docx")
+    write_docx(
+        path,
+        [
+            docx_paragraph("Annual Report", "Title"),
+            docx_paragraph("Overview", "Heading1"),
+            docx_paragraph("Revenue grew."),
+            docx_paragraph("Highlights", "ListParagraph", 0),
+            docx_paragraph("New | pricing", "ListParagraph", 1),
+            docx_paragraph("Details", "Heading2"),
+            docx_table([["Region", "Revenue"], ["North", "120"]]),
+        ],
+    )
+
+    assert extract_docx_markdown(path) == (
+        "# Annual Report\n\n"
+        "## Overview\n\n"
+        "Revenue grew.\n\n"
+        "- Highlights\n"
+        "  - New | pricing\n\n"
+        "### Details\n\n"
+        "| Region | Revenue |\n"
+        "|---|---|\n"
+        "| North | 120 |"
+    )
+
+
+def test_presentations_start_a_section_per_slide(tmp_path):
+    path = os.path.join(tmp_path, "deck.pptx")
+    write_pptx(path, slides=5)
+
+    markdown = extract_pptx_markdown(path)
+    chunks = asyncio.run(ScoreBasedChunker().get_n_chunks(markdown, 5))
+
+    assert [chunk.heading for chunk in chunks] == [
+        f"# Topic {index}" for index in range(1, 6)
+    ]
+    assert chunks[0].content.startswith("- Quarterly revenue")
+    assert "\n  - Quarterly" in chunks[0].content
+    assert "| Cell 0.0 | Cell 0.1 | Cell 0.2 |" in chunks[4].content
+
+
+def test_office_files_skip_docling(tmp_path, docling_calls):
+    docx_path = os.path.join(tmp_path, "report.docx")
+    write_docx(docx_path, [docx_paragraph("Overview", "Heading1")])
+    pptx_path = os.path.join(tmp_path, "deck.pptx")
+    write_pptx(pptx_path, slides=1)
+
+    assert load(docx_path) == "## Overview"
+    assert load(pptx_path).startswith("# Topic 1")
+    assert docling_calls == []
+
+
+def test_unusual_content_is_parsed_by_docling(tmp_path, docling_calls):
+    path = os.path.join(tmp_path, "sidebar.docx")
+    write_docx(path, [docx_paragraph("Overview"), docx_text_box("Quote")])
+    broken_path = os.path.join(tmp_path, "broken.docx")
+    with open(broken_path, "wb") as broken_file:
+        broken_file.write(b"not a zip file")
+
+    assert load(path) == "<docling>"
+    assert load(broken_path) == "<docling>"
+    assert docling_calls == ["sidebar.docx", "broken.docx"]
+
+
+def test_native_extraction_can_be_disabled(tmp_path, docling_calls, monkeypatch):
+    monkeypatch.setenv("NATIVE_OFFICE_EXTRACTION", "false")
+    path = os.path.join(tmp_path, "report.docx")
+    write_docx(path, [docx_paragraph("Overview", "Heading1")])
+
+    assert load(path) == "<docling>"
@@ -0,0 +1,134 @@
+import asyncio
+import os
+
+import pytest
+
+from services import documents_loader
+from services.documents_loader import DocumentsLoader
+from services.parsed_document_cache import ParsedDocumentCache, get_parser_version
+
+
+class FakeParserPool:
+    def __init__(self):
+        self.parsed = []
+
+    async def parse_to_markdown(self, file_path: str) -> str:
+        self.parsed.append(file_path)
+        with open(file_path, "rb") as file:
+            return f"# {file.read().decode()}"
+
+
+@pytest.fixture
+def parser(tmp_path, monkeypatch):
+    cache = ParsedDocumentCache(str(tmp_path / "cache"), parser_version="1")
+    pool = FakeParserPool()
+    monkeypatch.setattr(documents_loader, "PARSED_DOCUMENT_CACHE", cache)
+    monkeypatch.setattr(documents_loader, "DOCLING_WORKER_POOL", pool)
+    return cache, pool
+
+
+def write_file(directory, name: str, content: str) -> str:
+    path = os.path.join(directory, name)
+    with open(path, "w") as file:
+        file.write(content)
+    return path
+
+
+def load(paths, temp_dir, load_images=False):
+    loader = DocumentsLoader(paths)
+    asyncio.run(loader.load_documents(str(temp_dir), load_images=load_images))
+    return loader
+
+
+def test_files_with_the_same_content_are_parsed_once(parser, tmp_path):
+    cache, pool = parser
+    # Every generate request uploads its files to a new temporary path
+    first_path = write_file(tmp_path, "report.pdf", "Report")
+    second_path = write_file(tmp_path, "report copy.docx", "Report")
+
+    assert load([first_path], tmp_path).documents == ["# Report"]
+    assert load([first_path, second_path], tmp_path).documents == [
+        "# Report",
+        "# Report",
+    ]
+    assert pool.parsed == [first_path]
+    assert cache.get_stats()["hits"] == 2
+
+
+def test_parser_upgrades_parse_files_again(parser, tmp_path, monkeypatch):
+    cache, pool = parser
+    path = write_file(tmp_path, "report.pdf", "Report")
+
+    load([path], tmp_path)
+    monkeypatch.setattr(cache, "_parser_version", "2")
+    load([path], tmp_path)
+
+    assert len(pool.parsed) == 2
+
+
+def test_switching_parsing_tiers_parses_files_again(monkeypatch):
+    monkeypatch.delenv("PDF_TEXT_LAYER", raising=False)
+    monkeypatch.delenv("NATIVE_OFFICE_EXTRACTION", raising=False)
+    all_tiers = get_parser_version()
+
+    monkeypatch.setenv("PDF_TEXT_LAYER", "false")
+    without_text_layer = get_parser_version()
+    monkeypatch.setenv("NATIVE_OFFICE_EXTRACTION", "false")
+    docling_only = get_parser_version()
+
+    assert len({all_tiers, without_text_layer, docling_only}) == 3
+
+
+def test_page_images_are_cached(parser, tmp_path, monkeypatch):
+    _, pool = parser
+    path = write_file(tmp_path, "report.pdf", "Report")
+    rendered = []
+
+    def get_page_images_from_pdf(file_path, temp_dir):
+        rendered.append(file_path)
+        image_paths = []
+        for page_number in range(1, 12):
+            image_path = os.path.join(temp_dir, f"page_{page_number}.png")
+            with open(image_path, "wb") as image_file:
+                image_file.write(bytes([page_number]))
+            image_paths.append(image_path)
+        return image_paths
+
+    monkeypatch.setattr(
+        DocumentsLoader, "get_page_images_from_pdf", get_page_images_from_pdf
+    )
+
+    os.makedirs(tmp_path / "first")
+    os.makedirs(tmp_path / "second")
+    load([path], tmp_path / "first", load_images=True)
+    loader = load([path], tmp_path / "second", load_images=True)
+
+    assert len(rendered) == 1
+    assert len(pool.parsed) == 1
+    image_paths = loader.images[0]
+    assert [os.path.basename(image_path) for image_path in image_paths] == [
+        f"page_{page_number}.png" for page_number in range(1, 12)
+    ]
+    assert os.path.dirname(image_paths[0]) == str(tmp_path / "second")
+    with open(image_paths[10], "rb") as image_file:
+        assert image_file.read() == bytes([11])
+
+
+def test_least_recently_used_documents_are_evicted(parser, tmp_path, monkeypatch):
+    cache, pool = parser
+    paths = [
+        write_file(tmp_path, f"{name}.pdf", name * 100) for name in ("a", "b", "c")
+    ]
+    monkeypatch.setattr(cache, "_max_bytes", 250)
+
+    load(paths[:2], tmp_path)
+    # Makes b the least recently used without relying on the clock resolution
+    second_entry = cache._get_entry_directory(cache.get_file_hash(paths[1]))
+    os.utime(second_entry, (1, 1))
+
+    load(paths[2:], tmp_path)
+    load(paths[:1], tmp_path)
+
+    assert not os.path.exists(second_entry)
+    assert len(pool.parsed) == 3
+    assert cache.get_stats()["evictions"] == 1
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import time
+
+from benchmarks.sample_documents import report_page, write_pdf
+from services import documents_loader
+from services.docling_worker_pool import DoclingWorkerPool
+from services.documents_loader import DocumentsLoader
+from services.parsed_document_cache import ParsedDocumentCache
+from services.pdf_text_layer import split_page_range
+
+PARSE_SECONDS_PER_PAGE = 0.02
+
+
+def fake_parse(file_path: str, page_range=None) -> str:
+    start, end = page_range
+    time.sleep((end - start + 1) * PARSE_SECONDS_PER_PAGE)
+    return "\n\n".join(f"Page {page}" for page in range(start, end + 1))
+
+
+def test_long_page_ranges_are_split_into_one_part_per_worker():
+    assert split_page_range((1, 45), 3, 20) == [(1, 15), (16, 30), (31, 45)]
+    assert split_page_range((5, 25), 2, 20) == [(5, 15), (16, 25)]
+    assert split_page_range((1, 19), 3, 20) == [(1, 19)]
+    # A minimum of 0 turns splitting off
+    assert split_page_range((1, 45), 3, 0) == [(1, 45)]
+    assert split_page_range((1, 45), 1, 20) == [(1, 45)]
+
+
+def test_large_pdfs_are_parsed_in_parallel_and_stitched_in_order(tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF_TEXT_LAYER", "false")
+    pool = DoclingWorkerPool(
+        workers=3, parallel_min_pages=20, parse=fake_parse, initializer=None
+    )
+    monkeypatch.setattr(documents_loader, "DOCLING_WORKER_POOL", pool)
+    monkeypatch.setattr(
+        documents_loader,
+        "PARSED_DOCUMENT_CACHE",
+        ParsedDocumentCache(str(tmp_path / "cache"), parser_version="1"),
+    )
+    path = os.path.join(tmp_path, "large.pdf")
+    write_pdf(path, [report_page(f"Chapter {index}", 1) for index in range(60)])
+
+    async def parse():
+        # Starts the workers before measuring
+        await asyncio.gather(*[pool.parse_to_markdown(path, (1, 1)) for _ in range(3)])
+        loader = DocumentsLoader([path])
+        started_at = time.monotonic()
+        await loader.load_documents(str(tmp_path))
+        return loader.documents[0], time.monotonic() - started_at
+
+    try:
+        document, elapsed = asyncio.run(parse())
+    finally:
+        pool.shutdown()
+
+    assert document == "\n\n".join(f"Page {page}" for page in range(1, 61))
+    assert elapsed < 60 * PARSE_SECONDS_PER_PAGE * 0.75
+    assert pool.get_stats()["split_documents"] == 1
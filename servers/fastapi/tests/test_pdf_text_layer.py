@@ -0,0 +1,91 @@
+import asyncio
+import os
+
+import pytest
+
+from benchmarks.sample_documents import (
+    report_page,
+    scanned_page,
+    table_page,
+    write_pdf,
+)
+from services import documents_loader
+from services.docling_worker_pool import DoclingWorkerPool
+from services.documents_loader import DocumentsLoader
+from services.parsed_document_cache import ParsedDocumentCache
+from services.pdf_text_layer import get_garbled_ratio
+
+
+@pytest.fixture
+def docling_calls(tmp_path, monkeypatch):
+    calls = []
+
+    def parse(file_path, page_range=None):
+        calls.append(page_range)
+        return f"<docling {page_range}>"
+
+    monkeypatch.setattr(
+        documents_loader,
+        "DOCLING_WORKER_POOL",
+        DoclingWorkerPool(workers=0, parse=parse, initializer=None),
+    )
+    monkeypatch.setattr(
+        documents_loader,
+        "PARSED_DOCUMENT_CACHE",
+        ParsedDocumentCache(str(tmp_path / "cache"), parser_version="1"),
+    )
+    return calls
+
+
+def parse_pdf(directory, pages) -> str:
+    path = os.path.join(directory, "document.pdf")
+    write_pdf(path, pages)
+    loader = DocumentsLoader([path])
+    asyncio.run(loader.load_documents(str(directory)))
+    return loader.documents[0]
+
+
+def test_born_digital_pdfs_skip_docling(tmp_path, docling_calls):
+    document = parse_pdf(tmp_path, [report_page("Overview"), report_page("Results")])
+
+    assert docling_calls == []
+    assert document.startswith("# Overview\n\n## Section 1\n\nQuarterly revenue")
+    assert "\n# Results\n" in document
+    assert "\n## Section 4\n" in document
+
+
+def test_only_pages_with_tables_are_parsed_by_docling(tmp_path, docling_calls):
+    pages = [
+        report_page("Overview"),
+        table_page("Revenue"),
+        table_page("Costs"),
+        report_page("Outlook"),
+        report_page("Appendix"),
+    ]
+    document = parse_pdf(tmp_path, pages)
+
+    assert docling_calls == [(2, 3)]
+    assert document.index("# Overview") < document.index("<docling (2, 3)>")
+    assert document.index("<docling (2, 3)>") < document.index("# Outlook")
+    assert "Region 1" not in document
+
+
+def test_mostly_scanned_pdfs_are_parsed_by_docling_as_a_whole(tmp_path, docling_calls):
+    document = parse_pdf(tmp_path, [scanned_page(), scanned_page(), report_page("A")])
+
+    assert docling_calls == [(1, 3)]
+    assert document == "<docling (1, 3)>"
+
+
+def test_text_layer_tier_can_be_disabled(tmp_path, docling_calls, monkeypatch):
+    monkeypatch.setenv("PDF_TEXT_LAYER", "false")
+
+    parse_pdf(tmp_path, [report_page("Overview")])
+
+    assert docling_calls == [(1, 1)]
+
+
+def test_garbled_text_is_detected():
+    assert get_garbled_ratio("Quarterly revenue grew") == 0
+    assert get_garbled_ratio("(cid:12)(cid:15)(cid:3) revenue") > 0.5
+    assert get_garbled_ratio("Qu��rterly") > 0.05
@@ -0,0 +1,162 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
+from models.presentation_outline_model import SlideOutlineModel
+from utils.pipelined_generation import PipelinedSlideGeneration
+
+OUTLINE_DELAY = 0.02
+CONTENT_DELAY = 0.05
+
+
+def get_layout(ordered: bool) -> PresentationLayoutModel:
+    return PresentationLayoutModel(
+        name="test",
+        ordered=ordered,
+        slides=[
+            SlideLayoutModel(id=f"layout-{i}", json_schema={"type": "object"})
+            for i in range(3)
+        ],
+    )
+
+
+# Emulates the provider concurrency limit of LLMClient
+CONTENT_CONCURRENCY = 3
+content_semaphores = {}
+
+
+async def fake_slide_content(slide_layout, outline, *args):
+    loop = asyncio.get_running_loop()
+    if loop not in content_semaphores:
+        content_semaphores[loop] = asyncio.Semaphore(CONTENT_CONCURRENCY)
+    async with content_semaphores[loop]:
+        await asyncio.sleep(CONTENT_DELAY)
+    return {"layout": slide_layout.id, "outline": outline.content}
+
+
+async def fake_layout_index(outline, layout, slide_index, n_slides, instructions):
+    return 2
+
+
+async def stream_outlines(n_slides: int):
+    for i in range(n_slides):
+        await asyncio.sleep(OUTLINE_DELAY)
+        yield SlideOutlineModel(content=f"Slide {i}")
+
+
+@patch(
+    "utils.pipelined_generation.get_slide_content_from_type_and_outline",
+    fake_slide_content,
+)
+def test_ordered_layouts_are_mapped_by_index():
+    async def inner():
+        generation = PipelinedSlideGeneration(get_layout(True), 5, "English")
+        async for outline in stream_outlines(5):
+            generation.add_outline(outline)
+        structure = await generation.get_presentation_structure()
+        contents = [
+            await generation.get_content_task(i)
+            for i in range(len(generation.outlines))
+        ]
+        return structure, contents
+
+    structure, contents = asyncio.run(inner())
+
+    assert structure.slides[:3] == [0, 1, 2]
+    assert all(0 <= index < 3 for index in structure.slides)
+    assert [each["outline"] for each in contents] == [f"Slide {i}" for i in range(5)]
+    assert contents[1]["layout"] == "layout-1"
+
+
+@patch(
+    "utils.pipelined_generation.get_slide_layout_index_from_outline",
+    fake_layout_index,
+)
+@patch(
+    "utils.pipelined_generation.get_slide_content_from_type_and_outline",
+    fake_slide_content,
+)
+def test_unordered_layouts_are_selected_per_slide():
+    async def inner():
+        generation = PipelinedSlideGeneration(get_layout(False), 3, "English")
+        async for outline in stream_outlines(4):
+            generation.add_outline(outline)
+        structure = await generation.get_presentation_structure()
+        content = await generation.get_content_task(0)
+        return generation, structure, content
+
+    generation, structure, content = asyncio.run(inner())
+
+    # Outlines beyond the requested number of slides are ignored
+    assert len(generation.outlines) == 3
+    assert structure.slides == [2, 2, 2]
+    assert content["layout"] == "layout-2"
+
+
+@patch(
+    "utils.pipelined_generation.get_slide_content_from_type_and_outline",
+    fake_slide_content,
+)
+def test_pipelined_generation_overlaps_outline_stream():
+    n_slides = 10
+
+    async def sequential():
+        outlines = [outline async for outline in stream_outlines(n_slides)]
+        layout = get_layout(True)
+        await asyncio.gather(
+            *[
+                fake_slide_content(layout.slides[i % 3], outline)
+                for i, outline in enumerate(outlines)
+            ]
+        )
+
+    async def pipelined():
+        generation = PipelinedSlideGeneration(get_layout(True), n_slides, "English")
+        async for outline in stream_outlines(n_slides):
+            generation.add_outline(outline)
+        await asyncio.gather(*[generation.get_content_task(i) for i in range(n_slides)])
+
+    started_at = time.perf_counter()
+    asyncio.run(sequential())
+    sequential_time = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    asyncio.run(pipelined())
+    pipelined_time = time.perf_counter() - started_at
+
+    print(
+        f"\nsequential: {sequential_time * 1000:.0f}ms, "
+        f"pipelined: {pipelined_time * 1000:.0f}ms"
+    )
+    assert pipelined_time < sequential_time - CONTENT_DELAY
+
+
+def test_slide_contents_are_generated_within_the_window():
+    running = 0
+    max_running = 0
+
+    async def counting_slide_content(slide_layout, outline, *args):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(CONTENT_DELAY)
+        running -= 1
+        return {"layout": slide_layout.id, "outline": outline.content}
+
+    async def inner():
+        generation = PipelinedSlideGeneration(
+            get_layout(True), 8, "English", window_size=2
+        )
+        for i in range(8):
+            generation.add_outline(SlideOutlineModel(content=f"Slide {i}"))
+        return await asyncio.gather(*[generation.get_content_task(i) for i in range(8)])
+
+    with patch(
+        "utils.pipelined_generation.get_slide_content_from_type_and_outline",
+        counting_slide_content,
+    ):
+        contents = asyncio.run(inner())
+
+    assert max_running == 2
+    assert [each["outline"] for each in contents] == [f"Slide {i}" for i in range(8)]
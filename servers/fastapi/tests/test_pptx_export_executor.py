@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from pptx import Presentation
+
+from models.pptx_models import (
+    PptxParagraphModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+    PptxTextBoxModel,
+)
+from services import pptx_export_executor
+from services.pptx_export_executor import PptxExportExecutor
+
+
+def get_pptx_model(n_slides: int = 3) -> PptxPresentationModel:
+    return PptxPresentationModel(
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    PptxTextBoxModel(
+                        position=PptxPositionModel(
+                            left=40, top=40, width=600, height=80
+                        ),
+                        paragraphs=[PptxParagraphModel(text=f"Slide {index}")],
+                    )
+                ]
+            )
+            for index in range(n_slides)
+        ]
+    )
+
+
+def test_thread_executor_builds_pptx(tmp_path):
+    executor = PptxExportExecutor(concurrency=0, queue_size=1)
+    pptx_path = str(tmp_path / "thread.pptx")
+
+    asyncio.run(executor.create_pptx(get_pptx_model(), str(tmp_path), pptx_path))
+
+    assert len(Presentation(pptx_path).slides) == 3
+    assert executor.get_stats()["completed"] == 1
+
+
+def test_process_pool_builds_pptx(tmp_path):
+    executor = PptxExportExecutor(concurrency=1, queue_size=1)
+    pptx_path = str(tmp_path / "process.pptx")
+    try:
+        asyncio.run(executor.create_pptx(get_pptx_model(), str(tmp_path), pptx_path))
+    finally:
+        executor.shutdown()
+
+    presentation = Presentation(pptx_path)
+    assert presentation.slides[2].shapes[0].text_frame.text == "Slide 2"
+
+
+def test_exports_beyond_the_queue_are_rejected(tmp_path, monkeypatch):
+    executor = PptxExportExecutor(concurrency=0, queue_size=1)
+
+    async def run():
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def build(*args):
+            started.set()
+            await finish.wait()
+            return {
+                "picture_bytes_before": 0,
+                "picture_bytes_after": 0,
+                "pptx_bytes": 0,
+                "media_parts": 0,
+            }
+
+        def to_thread(function, *args):
+            return build(*args)
+
+        monkeypatch.setattr(pptx_export_executor.asyncio, "to_thread", to_thread)
+
+        model = get_pptx_model(1)
+        running = asyncio.create_task(
+            executor.create_pptx(model, str(tmp_path), "running.pptx")
+        )
+        await started.wait()
+        queued = asyncio.create_task(
+            executor.create_pptx(model, str(tmp_path), "queued.pptx")
+        )
+        await asyncio.sleep(0.05)
+        assert executor.get_stats()["waiting"] == 1
+
+        with pytest.raises(HTTPException) as exc_info:
+            await executor.create_pptx(model, str(tmp_path), "rejected.pptx")
+        assert exc_info.value.status_code == 503
+
+        await asyncio.sleep(0.1)
+        finish.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(run())
+
+    stats = executor.get_stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["waiting"] == 0 and stats["running"] == 0
+    # The queued export waited for the running one to finish
+    assert stats["max_wait_seconds"] >= 0.1
+
+
+def test_exports_downloading_assets_take_a_place_in_the_queue(tmp_path, monkeypatch):
+    executor = PptxExportExecutor(concurrency=0, queue_size=1)
+
+    async def run():
+        downloading = asyncio.Event()
+        finish_downloads = asyncio.Event()
+
+        async def fetch_network_assets(self):
+            downloading.set()
+            await finish_downloads.wait()
+            raise ValueError("Download failed")
+
+        monkeypatch.setattr(
+            pptx_export_executor.PptxPresentationCreator,
+            "fetch_network_assets",
+            fetch_network_assets,
+        )
+
+        model = get_pptx_model(1)
+        exports = [
+            asyncio.create_task(executor.create_pptx(model, str(tmp_path), f"{i}.pptx"))
+            for i in range(2)
+        ]
+        await downloading.wait()
+        assert executor.get_stats()["waiting"] == 2
+
+        with pytest.raises(HTTPException) as exc_info:
+            await executor.create_pptx(model, str(tmp_path), "rejected.pptx")
+        assert exc_info.value.status_code == 503
+
+        finish_downloads.set()
+        results = await asyncio.gather(*exports, return_exceptions=True)
+        assert all(isinstance(each, ValueError) for each in results)
+
+    asyncio.run(run())
+
+    # Failed downloads give their places back
+    assert executor.get_stats()["waiting"] == 0
+    assert executor.get_stats()["rejected"] == 1
@@ -0,0 +1,102 @@
+import shutil
+import zipfile
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+
+from models.pptx_models import (
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services import pptx_presentation_creator
+from services.pptx_presentation_creator import PptxPresentationCreator
+from services.processed_image_cache import ProcessedImageCache
+
+N_SLIDES = 12
+
+
+def get_picture_model(image_path: str, left: int = 40) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(left=left, top=40, width=200, height=100),
+        clip=False,
+        picture=PptxPictureModel(is_network=False, path=image_path),
+    )
+
+
+@pytest.fixture(autouse=True)
+def image_cache(tmp_path, monkeypatch):
+    cache = ProcessedImageCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(pptx_presentation_creator, "PROCESSED_IMAGE_CACHE", cache)
+    return cache
+
+
+def save_pptx(pptx_model: PptxPresentationModel, tmp_path) -> str:
+    pptx_creator = PptxPresentationCreator(pptx_model, str(tmp_path))
+    pptx_creator.add_slides()
+    pptx_path = str(tmp_path / "deck.pptx")
+    pptx_creator.save(pptx_path)
+    return pptx_path
+
+
+def get_media_names(pptx_path: str) -> list:
+    with zipfile.ZipFile(pptx_path) as pptx_zip:
+        return [name for name in pptx_zip.namelist() if name.startswith("ppt/media/")]
+
+
+def test_repeated_pictures_share_one_media_part(tmp_path):
+    background_path = str(tmp_path / "background.png")
+    Image.new("RGB", (200, 100), "navy").save(background_path)
+    logo_path = str(tmp_path / "logo.png")
+    Image.new("RGBA", (100, 50), (255, 0, 0, 128)).save(logo_path)
+
+    slides = []
+    for index in range(N_SLIDES):
+        # Prepared slides point at their own copy of the same image
+        slide_background_path = str(tmp_path / f"background-{index}.png")
+        shutil.copyfile(background_path, slide_background_path)
+        slides.append(
+            PptxSlideModel(
+                shapes=[
+                    get_picture_model(slide_background_path),
+                    get_picture_model(slide_background_path, left=400),
+                ]
+            )
+        )
+    pptx_model = PptxPresentationModel(
+        slides=slides, shapes=[get_picture_model(logo_path, left=1000)]
+    )
+
+    pptx_path = save_pptx(pptx_model, tmp_path)
+
+    assert len(get_media_names(pptx_path)) == 2
+    presentation = Presentation(pptx_path)
+    for slide in presentation.slides:
+        pictures = [shape for shape in slide.shapes if shape.shape_type == 13]
+        assert len(pictures) == 3
+        # Both backgrounds use the same relationship
+        assert pictures[0]._element.blip_rId == pictures[1]._element.blip_rId
+
+
+def test_repeated_pictures_are_processed_once(tmp_path, monkeypatch):
+    logo_path = str(tmp_path / "logo.png")
+    Image.new("RGBA", (100, 50), (255, 0, 0, 128)).save(logo_path)
+    pptx_model = PptxPresentationModel(
+        slides=[PptxSlideModel(shapes=[]) for _ in range(N_SLIDES)],
+        shapes=[get_picture_model(logo_path)],
+    )
+
+    transformed = []
+    original_transform_picture = PptxPresentationCreator.transform_picture
+
+    def transform_picture(self, picture_model, directory):
+        transformed.append(picture_model.picture.path)
+        return original_transform_picture(self, picture_model, directory)
+
+    monkeypatch.setattr(PptxPresentationCreator, "transform_picture", transform_picture)
+    save_pptx(pptx_model, tmp_path)
+
+    assert transformed == [logo_path]
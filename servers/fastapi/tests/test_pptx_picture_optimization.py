@@ -0,0 +1,138 @@
+import asyncio
+import os
+
+import pytest
+from PIL import Image, JpegImagePlugin
+
+from models.pptx_models import (
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services import pptx_presentation_creator
+from services.pptx_export_executor import PptxExportExecutor
+from services.pptx_presentation_creator import PptxPresentationCreator
+from services.processed_image_cache import ProcessedImageCache
+
+
+def get_picture_model(image_path: str) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(left=40, top=40, width=200, height=100),
+        clip=False,
+        picture=PptxPictureModel(is_network=False, path=image_path),
+    )
+
+
+@pytest.fixture
+def creator(tmp_path, monkeypatch):
+    cache = ProcessedImageCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(pptx_presentation_creator, "PROCESSED_IMAGE_CACHE", cache)
+    monkeypatch.setenv("EXPORT_IMAGE_DPI", "144")
+    return PptxPresentationCreator(PptxPresentationModel(slides=[]), str(tmp_path))
+
+
+@pytest.fixture
+def photo_path(tmp_path):
+    photo_path = str(tmp_path / "photo.png")
+    image = Image.effect_noise((1600, 800), 64).convert("RGB")
+    image.save(photo_path)
+    return photo_path
+
+
+def test_opaque_pictures_are_resampled_to_their_box(creator, photo_path, tmp_path):
+    image_path = creator.process_picture(get_picture_model(photo_path), str(tmp_path))
+
+    image = Image.open(image_path)
+    assert image.format == "JPEG"
+    # 200x100pt at 144 dpi
+    assert image.size == (400, 200)
+    report = creator.get_picture_report()
+    assert report["picture_bytes_before"] == os.path.getsize(photo_path)
+    assert report["picture_bytes_after"] == os.path.getsize(image_path)
+    assert report["picture_bytes_after"] < report["picture_bytes_before"] / 10
+
+
+def test_transparent_pictures_stay_png(creator, tmp_path):
+    logo_path = str(tmp_path / "logo.png")
+    Image.new("RGBA", (1200, 600), (255, 0, 0, 0)).save(logo_path)
+
+    image = Image.open(
+        creator.process_picture(get_picture_model(logo_path), str(tmp_path))
+    )
+    assert image.format == "PNG"
+    assert image.size == (400, 200)
+
+
+def test_small_jpegs_are_not_re_encoded(creator, tmp_path):
+    thumbnail_path = str(tmp_path / "thumbnail.jpg")
+    Image.new("RGB", (300, 150), "blue").save(thumbnail_path)
+
+    image_path = creator.process_picture(
+        get_picture_model(thumbnail_path), str(tmp_path)
+    )
+    assert image_path == thumbnail_path
+
+
+def test_large_jpegs_are_draft_decoded(creator, tmp_path, monkeypatch):
+    jpeg_path = str(tmp_path / "large.jpg")
+    Image.new("RGB", (4000, 2000), "green").save(jpeg_path)
+    draft_sizes = []
+    original_draft = JpegImagePlugin.JpegImageFile.draft
+
+    def draft(image, mode, size):
+        draft_sizes.append(size)
+        return original_draft(image, mode, size)
+
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "draft", draft)
+    image_path = creator.process_picture(get_picture_model(jpeg_path), str(tmp_path))
+
+    assert draft_sizes == [(400, 200)]
+    assert Image.open(image_path).size == (400, 200)
+
+
+def test_zero_dpi_disables_optimization(creator, photo_path, tmp_path, monkeypatch):
+    monkeypatch.setenv("EXPORT_IMAGE_DPI", "0")
+    assert (
+        creator.process_picture(get_picture_model(photo_path), str(tmp_path))
+        == photo_path
+    )
+
+
+def test_export_reports_size_before_and_after(creator, photo_path, tmp_path):
+    pptx_model = PptxPresentationModel(
+        slides=[PptxSlideModel(shapes=[get_picture_model(photo_path)])]
+    )
+    executor = PptxExportExecutor(concurrency=0, queue_size=1)
+    asyncio.run(
+        executor.create_pptx(pptx_model, str(tmp_path), str(tmp_path / "deck.pptx"))
+    )
+
+    stats = executor.get_stats()
+    assert stats["pptx_bytes_after"] == os.path.getsize(tmp_path / "deck.pptx")
+    assert stats["pptx_bytes_before"] > stats["pptx_bytes_after"] * 10
+
+
+def test_clipped_pictures_keep_the_export_dpi(creator, tmp_path, monkeypatch):
+    monkeypatch.setenv("EXPORT_IMAGE_DPI", "150")
+    jpeg_path = str(tmp_path / "large.jpg")
+    Image.effect_noise((4000, 3000), 64).convert("RGB").save(jpeg_path)
+    picture_model = PptxPictureBoxModel(
+        position=PptxPositionModel(left=0, top=0, width=400, height=300),
+        clip=True,
+        picture=PptxPictureModel(is_network=False, path=jpeg_path),
+    )
+
+    image_path = creator.process_picture(picture_model, str(tmp_path))
+
+    # 400x300pt at 150 dpi
+    assert Image.open(image_path).size == (833, 625)
+
+    # Pictures processed at another dpi are cached separately
+    monkeypatch.setenv("EXPORT_IMAGE_DPI", "72")
+    other_creator = PptxPresentationCreator(
+        PptxPresentationModel(slides=[]), str(tmp_path)
+    )
+    image_path = other_creator.process_picture(picture_model, str(tmp_path))
+    assert Image.open(image_path).size == (400, 300)
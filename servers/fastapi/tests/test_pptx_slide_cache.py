@@ -0,0 +1,181 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from PIL import Image
+
+from models.pptx_models import (
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxParagraphModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+    PptxTextBoxModel,
+)
+from models.sql.slide import SlideModel
+from services import pptx_slide_cache
+from services.pptx_slide_cache import PptxSlideCache
+from utils import export_utils
+
+N_SLIDES = 20
+
+
+def get_slides(image_path: str) -> list:
+    return [
+        SlideModel(
+            presentation=uuid.uuid4(),
+            layout_group="general",
+            layout="general:basic-info-slide",
+            index=index,
+            content={
+                "title": f"Slide {index}",
+                "image": {"__image_url__": image_path},
+            },
+        )
+        for index in range(N_SLIDES)
+    ]
+
+
+def get_slide_model(slide: SlideModel) -> PptxSlideModel:
+    # Same shapes the Next.js exporter creates for a picture and a title
+    return PptxSlideModel(
+        shapes=[
+            PptxPictureBoxModel(
+                position=PptxPositionModel(width=512, height=320),
+                object_fit=PptxObjectFitModel(fit=PptxObjectFitEnum.COVER),
+                picture=PptxPictureModel(
+                    is_network=False, path=slide.content["image"]["__image_url__"]
+                ),
+            ),
+            PptxTextBoxModel(
+                position=PptxPositionModel(top=340, width=512, height=40),
+                paragraphs=[PptxParagraphModel(text=slide.content["title"])],
+            ),
+        ]
+    )
+
+
+@pytest.fixture
+def exporter(tmp_path, monkeypatch):
+    monkeypatch.setenv("EXPORT_IMAGE_DPI", "144")
+    image_path = str(tmp_path / "image.png")
+    Image.new("RGB", (64, 48), "red").save(image_path)
+
+    slides = get_slides(image_path)
+    cache = PptxSlideCache(str(tmp_path / "cache"))
+    nextjs_calls = []
+
+    async def get_presentation_slides(presentation_id):
+        return slides
+
+    async def get_nextjs_pptx_model(presentation_id):
+        nextjs_calls.append(presentation_id)
+        return PptxPresentationModel(slides=[get_slide_model(each) for each in slides])
+
+    monkeypatch.setattr(export_utils, "PPTX_SLIDE_CACHE", cache)
+    monkeypatch.setattr(
+        export_utils, "get_presentation_slides", get_presentation_slides
+    )
+    monkeypatch.setattr(export_utils, "get_nextjs_pptx_model", get_nextjs_pptx_model)
+    return slides, cache, nextjs_calls
+
+
+def test_only_changed_slides_are_prepared_again(exporter):
+    slides, cache, _ = exporter
+
+    first = asyncio.run(export_utils.get_pptx_model(uuid.uuid4()))
+    slides[7].content = {**slides[7].content, "title": "Edited"}
+    second = asyncio.run(export_utils.get_pptx_model(uuid.uuid4()))
+
+    assert len(second.slides) == N_SLIDES
+    assert cache.get_stats()["hits"] == N_SLIDES - 1
+    assert cache.get_stats()["misses"] == N_SLIDES + 1
+    assert first.slides[0] == second.slides[0]
+    assert second.slides[7].shapes[1].paragraphs[0].text == "Edited"
+
+
+def test_cached_slides_point_at_processed_pictures(exporter):
+    slides, cache, _ = exporter
+
+    pptx_model = asyncio.run(export_utils.get_pptx_model(uuid.uuid4()))
+
+    picture = pptx_model.slides[0].shapes[0]
+    assert isinstance(picture, PptxPictureBoxModel)
+    assert picture.picture.path.startswith(cache.get_directory())
+    assert os.path.exists(picture.picture.path)
+    # Nothing is left to process when the file is assembled
+    assert not (picture.clip or picture.object_fit or picture.border_radius)
+    # 512x320pt at 144 dpi
+    assert Image.open(picture.picture.path).size == (1024, 640)
+
+
+def test_slides_with_missing_pictures_are_not_cached(exporter, tmp_path):
+    slides, cache, _ = exporter
+    missing_image = {"__image_url__": str(tmp_path / "missing.png")}
+    slides[2].content = {**slides[2].content, "image": missing_image}
+
+    asyncio.run(export_utils.get_pptx_model(uuid.uuid4()))
+    asyncio.run(export_utils.get_pptx_model(uuid.uuid4()))
+
+    assert cache.get_stats()["misses"] == N_SLIDES + 1
+    assert cache.get_stats()["slides"] == N_SLIDES - 1
+
+
+def test_nextjs_is_called_only_when_slides_changed(exporter):
+    slides, cache, nextjs_calls = exporter
+
+    asyncio.run(export_utils.get_pptx_model(uuid.uuid4()))
+    asyncio.run(export_utils.get_pptx_model(uuid.uuid4()))
+    assert len(nextjs_calls) == 1
+
+    slides[3].speaker_note = "New note"
+    pptx_model = asyncio.run(export_utils.get_pptx_model(uuid.uuid4()))
+    assert len(nextjs_calls) == 2
+    assert len(pptx_model.slides) == N_SLIDES
+
+
+def test_slides_of_edited_templates_are_prepared_again(exporter, monkeypatch):
+    _, cache, nextjs_calls = exporter
+    layout_version = "1"
+
+    async def get_layout_version(layout_name):
+        return layout_version
+
+    monkeypatch.setattr(export_utils, "get_layout_version", get_layout_version)
+
+    asyncio.run(export_utils.get_pptx_model(uuid.uuid4()))
+    layout_version = "2"
+    asyncio.run(export_utils.get_pptx_model(uuid.uuid4()))
+
+    assert len(nextjs_calls) == 2
+    assert cache.get_stats()["hits"] == 0
+
+
+def test_processes_keep_their_own_pictures(tmp_path, monkeypatch):
+    monkeypatch.setattr(pptx_slide_cache, "get_cache_directory", lambda: str(tmp_path))
+    root = tmp_path / "pptx_slides"
+    # Pictures of another running process, and of one that is gone
+    (root / str(os.getppid()) / "key").mkdir(parents=True)
+    (root / "stale" / "key").mkdir(parents=True)
+
+    directory = PptxSlideCache().get_directory()
+
+    assert directory == str(root / str(os.getpid()))
+    assert (root / str(os.getppid()) / "key").exists()
+    assert not (root / "stale").exists()
+
+
+def test_least_recently_used_slides_are_evicted(tmp_path):
+    cache = PptxSlideCache(str(tmp_path), max_slides=2)
+    for key in ["a", "b", "c"]:
+        cache.get_slide_directory(key)
+        cache.set(key, PptxSlideModel(shapes=[]))
+
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+    assert not os.path.exists(os.path.join(tmp_path, "a"))
+    assert cache.get_stats()["evictions"] == 1
@@ -0,0 +1,241 @@
+import asyncio
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from enums.presentation_generation_job_status import PresentationGenerationJobStatus
+from models.api_error_model import APIErrorModel
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.sql.async_presentation_generation_status import (
+    AsyncPresentationGenerationTaskModel,
+)
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
+from services.presentation_generation_queue import (
+    PresentationGenerationQueue,
+    PresentationGenerationWorkerPool,
+)
+
+
+def get_session_maker(tmp_path) -> async_sessionmaker:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'queue.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn,
+                    tables=[
+                        AsyncPresentationGenerationTaskModel.__table__,
+                        PresentationGenerationJobModel.__table__,
+                    ],
+                )
+            )
+
+    asyncio.run(create_tables())
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def get_request() -> GeneratePresentationRequest:
+    return GeneratePresentationRequest(content="Presentation about queues")
+
+
+async def enqueue(session_maker, queue: PresentationGenerationQueue, n_jobs: int):
+    async with session_maker() as sql_session:
+        return [
+            await queue.enqueue(sql_session, get_request(), uuid.uuid4())
+            for _ in range(n_jobs)
+        ]
+
+
+async def get_job(session_maker, job_id: str) -> PresentationGenerationJobModel:
+    async with session_maker() as sql_session:
+        return await sql_session.get(PresentationGenerationJobModel, job_id)
+
+
+def test_each_job_is_claimed_once(tmp_path):
+    session_maker = get_session_maker(tmp_path)
+    queue = PresentationGenerationQueue()
+
+    async def inner():
+        await enqueue(session_maker, queue, 3)
+
+        async def claim(worker_id):
+            async with session_maker() as sql_session:
+                return await queue.claim(sql_session, worker_id)
+
+        jobs = await asyncio.gather(*[claim(f"worker-{i}") for i in range(5)])
+        async with session_maker() as sql_session:
+            stats = await queue.get_stats(sql_session)
+        return jobs, stats
+
+    jobs, stats = asyncio.run(inner())
+
+    claimed = [job for job in jobs if job]
+    assert len(claimed) == 3
+    assert len({job.id for job in claimed}) == 3
+    assert all(job.attempts == 1 for job in claimed)
+    assert stats["jobs"][PresentationGenerationJobStatus.RUNNING.value] == 3
+    assert stats["depth"] == 3
+
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    session_maker = get_session_maker(tmp_path)
+    queue = PresentationGenerationQueue(lease_seconds=0)
+
+    async def inner():
+        await enqueue(session_maker, queue, 1)
+        async with session_maker() as sql_session:
+            first = await queue.claim(sql_session, "crashed-worker")
+            await asyncio.sleep(0.01)
+            second = await queue.claim(sql_session, "other-worker")
+        return first, second
+
+    first, second = asyncio.run(inner())
+
+    assert first.id == second.id
+    assert second.lease_owner == "other-worker"
+    assert second.attempts == 2
+
+
+def test_worker_pool_retries_transient_failures(tmp_path):
+    session_maker = get_session_maker(tmp_path)
+    queue = PresentationGenerationQueue(retry_backoff_seconds=0)
+    calls = []
+
+    async def run_job(job, sql_session, retry_on_error):
+        calls.append(retry_on_error)
+        if len(calls) == 1:
+            raise HTTPException(status_code=500, detail="LLM API error")
+        return True
+
+    async def inner():
+        (async_status,) = await enqueue(session_maker, queue, 1)
+        worker_pool = PresentationGenerationWorkerPool(
+            run_job, 1, queue, session_maker, poll_interval=0.01
+        )
+        worker_pool.start()
+        for _ in range(200):
+            job = await get_job(session_maker, async_status.id)
+            if job.status == PresentationGenerationJobStatus.COMPLETED.value:
+                break
+            await asyncio.sleep(0.01)
+        await worker_pool.stop()
+        return job
+
+    job = asyncio.run(inner())
+
+    assert job.status == PresentationGenerationJobStatus.COMPLETED.value
+    assert job.attempts == 2
+    assert calls == [True, True]
+
+
+def test_worker_pool_fails_job_after_last_attempt(tmp_path):
+    session_maker = get_session_maker(tmp_path)
+    queue = PresentationGenerationQueue(retry_backoff_seconds=0)
+
+    async def run_job(job, sql_session, retry_on_error):
+        raise HTTPException(status_code=500, detail="LLM API error")
+
+    async def inner():
+        (async_status,) = await enqueue(session_maker, queue, 1)
+        worker_pool = PresentationGenerationWorkerPool(
+            run_job, 2, queue, session_maker, poll_interval=0.01
+        )
+        worker_pool.start()
+        for _ in range(200):
+            async with session_maker() as sql_session:
+                status = await sql_session.get(
+                    AsyncPresentationGenerationTaskModel, async_status.id
+                )
+            if status.status == "error":
+                break
+            await asyncio.sleep(0.01)
+        await worker_pool.stop()
+
+        # The job is failed in the same commit as the status
+        return await get_job(session_maker, async_status.id), status
+
+    job, async_status = asyncio.run(inner())
+
+    assert job.status == PresentationGenerationJobStatus.FAILED.value
+    assert job.attempts == job.max_attempts
+    assert async_status.status == "error"
+    assert async_status.error["detail"] == "LLM API error"
+
+
+def test_worker_pool_stops_job_when_lease_is_lost(tmp_path):
+    session_maker = get_session_maker(tmp_path)
+    queue = PresentationGenerationQueue(lease_seconds=0.3)
+    cancelled = asyncio.Event()
+
+    async def renew_lease(sql_session, job_id, worker_id):
+        # Another worker claimed the job in the meantime
+        return False
+
+    async def run_job(job, sql_session, retry_on_error):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return True
+
+    queue.renew_lease = renew_lease
+
+    async def inner():
+        (async_status,) = await enqueue(session_maker, queue, 1)
+        worker_pool = PresentationGenerationWorkerPool(
+            run_job, 1, queue, session_maker, poll_interval=0.01
+        )
+        worker_pool.start()
+        await asyncio.wait_for(cancelled.wait(), 2)
+        await asyncio.sleep(0.05)
+        running_jobs = worker_pool.running_jobs
+        await worker_pool.stop()
+        return await get_job(session_maker, async_status.id), running_jobs
+
+    job, running_jobs = asyncio.run(inner())
+
+    assert running_jobs == 0
+    # Neither completed nor released, the new lease owner decides
+    assert job.status == PresentationGenerationJobStatus.RUNNING.value
+    assert job.attempts == 1
+
+
+def test_failed_job_can_be_requeued(tmp_path):
+    session_maker = get_session_maker(tmp_path)
+    queue = PresentationGenerationQueue()
+
+    async def inner():
+        (async_status,) = await enqueue(session_maker, queue, 1)
+        async with session_maker() as sql_session:
+            job = await queue.claim(sql_session, "worker")
+            await queue.fail(
+                sql_session,
+                job,
+                "worker",
+                APIErrorModel(status_code=500, detail="LLM API error"),
+            )
+            requeued = await queue.requeue(sql_session, job.id)
+            requeued_again = await queue.requeue(sql_session, job.id)
+            async_status = await sql_session.get(
+                AsyncPresentationGenerationTaskModel,
+                async_status.id,
+                populate_existing=True,
+            )
+        return (
+            requeued,
+            requeued_again,
+            async_status,
+            await get_job(session_maker, job.id),
+        )
+
+    requeued, requeued_again, async_status, job = asyncio.run(inner())
+
+    assert requeued and not requeued_again
+    assert job.status == PresentationGenerationJobStatus.QUEUED.value
+    assert job.attempts == 0
+    assert async_status.status == "pending"
+    assert async_status.error is None
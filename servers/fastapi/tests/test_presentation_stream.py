@@ -0,0 +1,129 @@
+import asyncio
+from datetime import datetime
+import json
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.ppt.endpoints.presentation import PRESENTATION_ROUTER
+from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
+from models.sql.presentation import PresentationModel
+from services.database import get_async_session
+
+
+N_SLIDES = 6
+
+
+def get_presentation() -> PresentationModel:
+    layout = PresentationLayoutModel(
+        name="test",
+        ordered=True,
+        slides=[
+            SlideLayoutModel(id=f"layout-{i}", json_schema={"type": "object"})
+            for i in range(N_SLIDES)
+        ],
+    )
+    return PresentationModel(
+        id=uuid.uuid4(),
+        content="test",
+        n_slides=N_SLIDES,
+        language="English",
+        outlines={"slides": [{"content": f"Slide {i}"} for i in range(N_SLIDES)]},
+        layout=layout.model_dump(),
+        structure={"slides": list(range(N_SLIDES))},
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+
+
+class FakeSession:
+    def __init__(self, presentation: PresentationModel):
+        self.presentation = presentation
+
+    async def get(self, model, id):
+        return self.presentation
+
+    async def execute(self, *args, **kwargs):
+        pass
+
+    async def commit(self):
+        pass
+
+    def add(self, *args):
+        pass
+
+    def add_all(self, *args):
+        pass
+
+
+# First slide is the slowest, so every other slide finishes before it
+async def fake_slide_content(slide_layout, outline, *args):
+    index = int(slide_layout.id.split("-")[1])
+    await asyncio.sleep(0.05 if index == 0 else 0.01)
+    return {"title": outline.content}
+
+
+async def fake_fetch_assets(image_generation_service, slide):
+    return []
+
+
+@pytest.fixture
+def client():
+    presentation = get_presentation()
+    app = FastAPI()
+    app.include_router(PRESENTATION_ROUTER, prefix="/api/v1/ppt")
+    app.dependency_overrides[get_async_session] = lambda: FakeSession(presentation)
+
+    with patch(
+        "api.v1.ppt.endpoints.presentation.get_slide_content_from_type_and_outline",
+        fake_slide_content,
+    ), patch(
+        "api.v1.ppt.endpoints.presentation.process_slide_and_fetch_assets",
+        fake_fetch_assets,
+    ):
+        yield TestClient(app), presentation
+
+
+def get_events(response) -> list:
+    return [
+        json.loads(line[len("data: ") :])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def test_stream_emits_chunks_in_slide_order(client):
+    test_client, presentation = client
+    response = test_client.get(f"/api/v1/ppt/presentation/stream/{presentation.id}")
+    events = get_events(response)
+
+    chunks = "".join(each["chunk"] for each in events if each["type"] == "chunk")
+    slides = json.loads(chunks)["slides"]
+
+    assert [slide["index"] for slide in slides] == list(range(N_SLIDES))
+    assert [slide["content"]["title"] for slide in slides] == [
+        f"Slide {i}" for i in range(N_SLIDES)
+    ]
+    assert not any(each["type"] == "slide" for each in events)
+    assert events[-1]["type"] == "complete"
+
+
+def test_stream_emits_indexed_slides_as_they_finish(client):
+    test_client, presentation = client
+    response = test_client.get(
+        f"/api/v1/ppt/presentation/stream/{presentation.id}?indexed=true"
+    )
+    events = get_events(response)
+
+    indexes = [each["index"] for each in events if each["type"] == "slide"]
+    assert sorted(indexes) == list(range(N_SLIDES))
+    # The slow first slide completes last but is still the first chunk
+    assert indexes[-1] == 0
+
+    chunks = "".join(each["chunk"] for each in events if each["type"] == "chunk")
+    assert [slide["index"] for slide in json.loads(chunks)["slides"]] == list(
+        range(N_SLIDES)
+    )
@@ -0,0 +1,111 @@
+import os
+
+import pytest
+from PIL import Image
+
+from models.pptx_models import (
+    PptxBoxShapeEnum,
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+)
+from services import pptx_presentation_creator
+from services.pptx_presentation_creator import PptxPresentationCreator
+from services.processed_image_cache import ProcessedImageCache
+
+
+def get_picture_model(image_path: str, **kwargs) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(width=120, height=80),
+        picture=PptxPictureModel(is_network=False, path=image_path),
+        object_fit=PptxObjectFitModel(fit=PptxObjectFitEnum.COVER),
+        border_radius=[8, 8, 8, 8],
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def creator(tmp_path, monkeypatch):
+    cache = ProcessedImageCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(pptx_presentation_creator, "PROCESSED_IMAGE_CACHE", cache)
+    monkeypatch.setenv("EXPORT_IMAGE_DPI", "144")
+    creator = PptxPresentationCreator(PptxPresentationModel(slides=[]), str(tmp_path))
+    return creator, cache
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    image_path = str(tmp_path / "image.png")
+    Image.new("RGB", (400, 300), "blue").save(image_path)
+    return image_path
+
+
+def test_repeat_processing_skips_pil(creator, image_path, tmp_path, monkeypatch):
+    creator, cache = creator
+    first_path = creator.transform_picture(get_picture_model(image_path), str(tmp_path))
+    # 120x80pt at 144 dpi
+    assert Image.open(first_path).size == (240, 160)
+
+    def open_image(*args, **kwargs):
+        raise AssertionError("Cached pictures should not be opened")
+
+    monkeypatch.setattr(pptx_presentation_creator.Image, "open", open_image)
+    second_path = creator.transform_picture(
+        get_picture_model(image_path), str(tmp_path)
+    )
+
+    assert second_path == first_path
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_operations_and_source_are_part_of_the_key(creator, image_path, tmp_path):
+    creator, cache = creator
+    directory = str(tmp_path)
+
+    paths = {
+        creator.transform_picture(get_picture_model(image_path), directory),
+        creator.transform_picture(
+            get_picture_model(image_path, invert=True), directory
+        ),
+        creator.transform_picture(
+            get_picture_model(image_path, shape=PptxBoxShapeEnum.CIRCLE), directory
+        ),
+    }
+    assert len(paths) == 3
+
+    # Same path, new content
+    Image.new("RGB", (400, 300), "red").save(image_path)
+    os.utime(image_path, ns=(0, 10**9))
+    paths.add(creator.transform_picture(get_picture_model(image_path), directory))
+    assert len(paths) == 4
+    assert cache.get_stats()["hits"] == 0
+
+
+def test_unprocessed_pictures_are_not_cached(creator, image_path, tmp_path):
+    creator, cache = creator
+    picture_model = PptxPictureBoxModel(
+        position=PptxPositionModel(width=120, height=80),
+        clip=False,
+        picture=PptxPictureModel(is_network=False, path=image_path),
+    )
+    assert creator.transform_picture(picture_model, str(tmp_path)) == image_path
+    assert cache.get_stats()["misses"] == 0
+
+
+def test_least_recently_used_images_are_evicted(tmp_path):
+    image = Image.new("RGBA", (64, 64), "green")
+    image.save(tmp_path / "probe.png")
+    entry_size = os.path.getsize(tmp_path / "probe.png")
+    cache = ProcessedImageCache(str(tmp_path / "cache"), max_bytes=entry_size * 2)
+
+    os.utime(cache.set("a", image), (1, 1))
+    os.utime(cache.set("b", image), (2, 2))
+    cache.get("a")
+    cache.set("c", image)
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.get_stats()["evictions"] == 1
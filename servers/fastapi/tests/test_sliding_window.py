@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from utils.sliding_window import gather_in_sliding_window, iterate_in_sliding_window
+
+
+def get_factory(value, delay: float, running: list, max_running: list):
+    async def factory():
+        running.append(value)
+        max_running[0] = max(max_running[0], len(running))
+        await asyncio.sleep(delay)
+        running.remove(value)
+        return value
+
+    return factory
+
+
+def test_results_are_returned_in_order():
+    running, max_running = [], [0]
+    delays = [0.03, 0.01, 0.02, 0.0, 0.01]
+    factories = [
+        get_factory(i, delay, running, max_running) for i, delay in enumerate(delays)
+    ]
+    completed = []
+
+    results = asyncio.run(
+        gather_in_sliding_window(
+            factories, 2, lambda index, result: completed.append(index)
+        )
+    )
+
+    assert results == [0, 1, 2, 3, 4]
+    assert sorted(completed) == [0, 1, 2, 3, 4]
+    # Slide 1 finishes before slide 0
+    assert completed.index(1) < completed.index(0)
+    assert max_running[0] == 2
+
+
+def test_window_is_refilled_as_soon_as_one_finishes():
+    running, max_running = [], [0]
+    factories = [get_factory(i, 0.01, running, max_running) for i in range(20)]
+
+    async def collect():
+        return [index async for index, _ in iterate_in_sliding_window(factories, 4)]
+
+    indexes = asyncio.run(collect())
+
+    assert sorted(indexes) == list(range(20))
+    assert max_running[0] == 4
+
+
+def test_error_cancels_remaining_work():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def run():
+        with pytest.raises(ValueError):
+            await gather_in_sliding_window([slow, failing, slow, slow], 2)
+        # Cancelled work has finished by the time the error is raised
+        return list(cancelled)
+
+    assert asyncio.run(run()) == [True]
@@ -17,3 +17,10 @@ def get_uploads_directory():
     uploads_directory = os.path.join(get_app_data_directory_env(), "uploads")
     os.makedirs(uploads_directory, exist_ok=True)
     return uploads_directory
+
+def get_cache_directory():
+    cache_directory = os.path.join(
+        get_app_data_directory_env() or "/tmp/presenton", "cache"
+    )
+    os.makedirs(cache_directory, exist_ok=True)
+    return cache_directory
@@ -1,13 +1,90 @@
 import asyncio
 import os
 import mimetypes
-from typing import List, Optional
+from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
 import aiohttp
 
+from constants.presentation import (
+    HTTP_DOWNLOAD_TIMEOUT_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+)
 import uuid
 
+# One pooled session per event loop, sessions can't be shared across loops
+_http_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+_http_session_closers: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+
+
+async def close_session_on_loop_exit(session: aiohttp.ClientSession):
+    # Cancelled with the other pending tasks when asyncio.run finishes
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await session.close()
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Returns the pooled session downloads share, so connections to the same
+    host are reused. Each event loop gets its own session, which is closed
+    when the loop finishes.
+    """
+    loop = asyncio.get_running_loop()
+    for each_loop in [each for each in _http_sessions if each.is_closed()]:
+        _http_sessions.pop(each_loop)
+        _http_session_closers.pop(each_loop, None)
+
+    session = _http_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_MAX_CONNECTIONS,
+                limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+            ),
+            timeout=aiohttp.ClientTimeout(total=HTTP_DOWNLOAD_TIMEOUT_SECONDS),
+            trust_env=True,
+        )
+        _http_sessions[loop] = session
+        closer = _http_session_closers.pop(loop, None)
+        if closer:
+            closer.cancel()
+        _http_session_closers[loop] = loop.create_task(
+            close_session_on_loop_exit(session)
+        )
+    return session
+
+
+async def close_http_session():
+    loop = asyncio.get_running_loop()
+    session = _http_sessions.pop(loop, None)
+    closer = _http_session_closers.pop(loop, None)
+    if closer:
+        closer.cancel()
+    if session and not session.closed:
+        await session.close()
+
+
+def get_download_filename(url: str, response: aiohttp.ClientResponse) -> str:
+    parsed_url = urlparse(url)
+    filename = os.path.basename(parsed_url.path)
+    if filename and "." in filename:
+        return filename
+
+    content_disposition = response.headers.get("Content-Disposition", "")
+    if "filename=" in content_disposition:
+        return content_disposition.split("filename=")[1].strip("\"'")
+
+    content_type = response.headers.get("Content-Type", "")
+    if content_type:
+        extension = mimetypes.guess_extension(content_type.split(";")[0])
+        if extension:
+            return f"{uuid.uuid4()}{extension}"
+
+    return filename or str(uuid.uuid4())
+
 
 async def download_file(
     url: str, save_directory: str, headers: Optional[dict] = None
@@ -15,43 +92,20 @@ async def download_file(
     try:
         os.makedirs(save_directory, exist_ok=True)
 
-        parsed_url = urlparse(url)
-        filename = os.path.basename(parsed_url.path)
-
-        if not filename or "." not in filename:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.head(url, headers=headers) as response:
-                    if response.status == 200:
-                        content_disposition = response.headers.get(
-                            "Content-Disposition", ""
-                        )
-                        if "filename=" in content_disposition:
-                            filename = content_disposition.split("filename=")[1].strip(
-                                "\"'"
-                            )
-                        else:
-                            content_type = response.headers.get("Content-Type", "")
-                            if content_type:
-                                extension = mimetypes.guess_extension(
-                                    content_type.split(";")[0]
-                                )
-                                if extension:
-                                    filename = f"{uuid.uuid4()}{extension}"
-
-        filename = filename or str(uuid.uuid4())
-        save_path = os.path.join(save_directory, filename)
-
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    with open(save_path, "wb") as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            file.write(chunk)
-                    print(f"File downloaded successfully: {save_path}")
-                    return save_path
-                else:
-                    print(f"Failed to download file. HTTP status: {response.status}")
-                    return None
+        # The filename is taken from the GET response, no HEAD request is needed
+        async with get_http_session().get(url, headers=headers) as response:
+            if response.status == 200:
+                save_path = os.path.join(
+                    save_directory, get_download_filename(url, response)
+                )
+                with open(save_path, "wb") as file:
+                    async for chunk in response.content.iter_chunked(8192):
+                        file.write(chunk)
+                print(f"File downloaded successfully: {save_path}")
+                return save_path
+            else:
+                print(f"Failed to download file. HTTP status: {response.status}")
+                return None
 
     except Exception as e:
         print(f"Error downloading file from {url}: {e}")
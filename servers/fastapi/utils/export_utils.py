@@ -1,54 +1,168 @@
+import asyncio
 import json
 import os
 import aiohttp
-from typing import Literal
+from typing import AsyncIterator, Dict, List, Literal, Mapping, Optional
+from urllib.parse import quote
 import uuid
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from pathvalidate import sanitize_filename
+from sqlmodel import select
 
-from models.pptx_models import PptxPresentationModel
+from constants.presentation import (
+    EXPORT_STREAM_CHUNK_SIZE,
+    EXPORT_STREAM_POLL_SECONDS,
+    PPTX_MEDIA_TYPE,
+)
+from models.pptx_models import PptxPresentationModel, PptxSlideModel
 from models.presentation_and_path import PresentationAndPath
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from services.database import async_session_maker
+from services.export_artifact_cache import EXPORT_ARTIFACT_CACHE
+from services.layout_cache import get_layout_version
+from services.pptx_export_executor import PPTX_EXPORT_EXECUTOR
 from services.pptx_presentation_creator import PptxPresentationCreator
+from services.pptx_slide_cache import PPTX_SLIDE_CACHE
 from services.temp_file_service import TEMP_FILE_SERVICE
-from utils.asset_directory_utils import get_exports_directory
 import uuid
 
 
+async def get_presentation_slides(presentation_id: uuid.UUID) -> List[SlideModel]:
+    async with async_session_maker() as sql_session:
+        return list(
+            await sql_session.scalars(
+                select(SlideModel)
+                .where(SlideModel.presentation == presentation_id)
+                .order_by(SlideModel.index)
+            )
+        )
+
+
+async def get_layout_versions(slides: List[SlideModel]) -> Dict[str, Optional[str]]:
+    # Custom templates can be edited without changing their slides
+    layout_groups = sorted({slide.layout_group for slide in slides})
+    versions = await asyncio.gather(
+        *[get_layout_version(layout_group) for layout_group in layout_groups]
+    )
+    return dict(zip(layout_groups, versions))
+
+
+async def cache_slide_model(key: str, slide_model: PptxSlideModel):
+    temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
+    pptx_creator = PptxPresentationCreator(
+        PptxPresentationModel(slides=[slide_model]), temp_dir
+    )
+    resolved = await pptx_creator.prepare_pictures(
+        PPTX_SLIDE_CACHE.get_slide_directory(key)
+    )
+    TEMP_FILE_SERVICE.cleanup_temp_dir(temp_dir)
+    # Slides missing a picture, e.g. after a failed download, are converted
+    # again on the next export
+    if resolved:
+        PPTX_SLIDE_CACHE.set(key, slide_model)
+
+
+async def get_pptx_model(presentation_id: uuid.UUID) -> PptxPresentationModel:
+    """
+    Returns the PPTX model of the presentation, preparing only the slides
+    that changed since they were last exported.
+    """
+    slides = await get_presentation_slides(presentation_id)
+    if not slides:
+        return await get_nextjs_pptx_model(presentation_id)
+
+    layout_versions = await get_layout_versions(slides)
+    keys = [PPTX_SLIDE_CACHE.get_key(each, layout_versions) for each in slides]
+    slide_models = [PPTX_SLIDE_CACHE.get(each) for each in keys]
+    changed = [index for index, each in enumerate(slide_models) if each is None]
+    if not changed:
+        return PptxPresentationModel(slides=slide_models)
+
+    # Next.js always converts the whole deck
+    pptx_model = await get_nextjs_pptx_model(presentation_id)
+    # Slides can only be matched by position
+    if len(pptx_model.slides) != len(slides):
+        return pptx_model
+    changed_models = [pptx_model.slides[index] for index in changed]
+
+    await asyncio.gather(
+        *[
+            cache_slide_model(keys[index], slide_model)
+            for index, slide_model in zip(changed, changed_models)
+        ]
+    )
+    for index, slide_model in zip(changed, changed_models):
+        slide_models[index] = slide_model
+
+    return PptxPresentationModel(slides=slide_models)
+
+
+async def get_nextjs_pptx_model(presentation_id: uuid.UUID) -> PptxPresentationModel:
+    # Get the converted PPTX model from the Next.js service
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                print(f"Failed to get PPTX model: {error_text}")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to convert presentation to PPTX model",
+                )
+            pptx_model_data = await response.json()
+
+    return PptxPresentationModel(**pptx_model_data)
+
+
+async def get_presentation_layout(presentation_id: uuid.UUID) -> Optional[dict]:
+    async with async_session_maker() as sql_session:
+        presentation = await sql_session.get(PresentationModel, presentation_id)
+        return presentation.layout if presentation else None
+
+
+async def get_export_key(
+    presentation_id: uuid.UUID, export_as: Literal["pptx", "pdf"]
+) -> str:
+    slides = await get_presentation_slides(presentation_id)
+    return EXPORT_ARTIFACT_CACHE.get_key(
+        presentation_id,
+        await get_presentation_layout(presentation_id),
+        slides,
+        export_as,
+        await get_layout_versions(slides),
+    )
+
+
+def get_export_filename(title: str, export_as: Literal["pptx", "pdf"]) -> str:
+    return f"{sanitize_filename(title or str(uuid.uuid4()))}.{export_as}"
+
+
 async def export_presentation(
     presentation_id: uuid.UUID, title: str, export_as: Literal["pptx", "pdf"]
 ) -> PresentationAndPath:
-    if export_as == "pptx":
+    filename = get_export_filename(title, export_as)
+    cache_key = await get_export_key(presentation_id, export_as)
+    # Unchanged presentations are not exported again
+    cached_path = EXPORT_ARTIFACT_CACHE.get(cache_key)
+    if cached_path:
+        return PresentationAndPath(presentation_id=presentation_id, path=cached_path)
 
-        # Get the converted PPTX model from the Next.js service
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"Failed to get PPTX model: {error_text}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to convert presentation to PPTX model",
-                    )
-                pptx_model_data = await response.json()
+    if export_as == "pptx":
+        pptx_model = await get_pptx_model(presentation_id)
 
         # Create PPTX file using the converted model
-        pptx_model = PptxPresentationModel(**pptx_model_data)
         temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-        pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-        await pptx_creator.create_ppt()
-
-        export_directory = get_exports_directory()
-        pptx_path = os.path.join(
-            export_directory,
-            f"{sanitize_filename(title or str(uuid.uuid4()))}.pptx",
-        )
-        pptx_creator.save(pptx_path)
+        pptx_path = EXPORT_ARTIFACT_CACHE.get_temp_path(cache_key, filename)
+        await PPTX_EXPORT_EXECUTOR.create_pptx(pptx_model, temp_dir, pptx_path)
 
         return PresentationAndPath(
             presentation_id=presentation_id,
-            path=pptx_path,
+            path=EXPORT_ARTIFACT_CACHE.set(
+                cache_key, presentation_id, pptx_path, filename
+            ),
         )
     else:
         async with aiohttp.ClientSession() as session:
@@ -63,5 +177,98 @@ async def export_presentation(
 
         return PresentationAndPath(
             presentation_id=presentation_id,
-            path=response_json["path"],
+            path=EXPORT_ARTIFACT_CACHE.set(
+                cache_key, presentation_id, response_json["path"], filename
+            ),
+        )
+
+
+async def iter_growing_file(path: str, build: asyncio.Task) -> AsyncIterator[bytes]:
+    """Yields the bytes of path as they are written until build is done"""
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(EXPORT_STREAM_CHUNK_SIZE)
+            if chunk:
+                yield chunk
+            elif build.done():
+                # Raises if the build failed, which aborts the response
+                build.result()
+                while chunk := file.read(EXPORT_STREAM_CHUNK_SIZE):
+                    yield chunk
+                return
+            else:
+                await asyncio.sleep(EXPORT_STREAM_POLL_SECONDS)
+
+
+async def stream_pptx_export(
+    presentation_id: uuid.UUID, cache_key: str, filename: str
+) -> AsyncIterator[bytes]:
+    """
+    Builds the PPTX file of the presentation and streams it while the zip
+    container is being written. The finished file is kept in the export
+    artifact cache, so resumed downloads are served from it.
+    """
+    # Rejected before the response starts, the build keeps the reserved place
+    PPTX_EXPORT_EXECUTOR.reserve()
+    build = None
+    try:
+        pptx_model = await get_pptx_model(presentation_id)
+
+        temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
+        pptx_path = EXPORT_ARTIFACT_CACHE.get_temp_path(cache_key, filename)
+        # Created up front so it can be opened before the worker starts writing
+        open(pptx_path, "wb").close()
+
+        build = asyncio.create_task(
+            PPTX_EXPORT_EXECUTOR.create_pptx(
+                pptx_model, temp_dir, pptx_path, streaming=True, reserved=True
+            )
         )
+    finally:
+        if build is None:
+            PPTX_EXPORT_EXECUTOR.release()
+
+    def on_build_done(build: asyncio.Task):
+        # Runs even when the client disconnected before the end
+        if not build.cancelled() and build.exception() is None:
+            EXPORT_ARTIFACT_CACHE.set(cache_key, presentation_id, pptx_path, filename)
+        elif os.path.exists(pptx_path):
+            os.remove(pptx_path)
+
+    build.add_done_callback(on_build_done)
+    return iter_growing_file(pptx_path, build)
+
+
+async def get_export_download_response(
+    presentation_id: uuid.UUID,
+    title: str,
+    export_as: Literal["pptx", "pdf"],
+    request_headers: Mapping[str, str],
+) -> Response:
+    cache_key = await get_export_key(presentation_id, export_as)
+    etag = f'"{cache_key}"'
+    filename = get_export_filename(title, export_as)
+
+    cached_path = EXPORT_ARTIFACT_CACHE.get(cache_key)
+    if cached_path and request_headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    if not cached_path and export_as == "pdf":
+        cached_path = (await export_presentation(presentation_id, title, "pdf")).path
+
+    if cached_path:
+        # Handles Range and If-Range against the etag
+        return FileResponse(
+            cached_path,
+            filename=os.path.basename(cached_path),
+            headers={"ETag": etag},
+        )
+
+    return StreamingResponse(
+        await stream_pptx_export(presentation_id, cache_key, filename),
+        media_type=PPTX_MEDIA_TYPE,
+        headers={
+            "ETag": etag,
+            "Content-Disposition": f"attachment; filename*=utf-8''{quote(filename)}",
+        },
+    )
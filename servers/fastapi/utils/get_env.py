@@ -95,3 +95,75 @@ def get_extended_reasoning_env():
 
 def get_web_grounding_env():
     return os.getenv("WEB_GROUNDING")
+
+
+def get_llm_response_cache_env():
+    return os.getenv("LLM_RESPONSE_CACHE")
+
+
+def get_llm_max_concurrency_env():
+    return os.getenv("LLM_MAX_CONCURRENCY")
+
+
+def get_llm_requests_per_minute_env():
+    return os.getenv("LLM_REQUESTS_PER_MINUTE")
+
+
+def get_llm_tokens_per_minute_env():
+    return os.getenv("LLM_TOKENS_PER_MINUTE")
+
+
+def get_slide_generation_window_env():
+    return os.getenv("SLIDE_GENERATION_WINDOW")
+
+
+def get_generation_workers_env():
+    return os.getenv("GENERATION_WORKERS")
+
+
+def get_generation_job_max_attempts_env():
+    return os.getenv("GENERATION_JOB_MAX_ATTEMPTS")
+
+
+def get_export_concurrency_env():
+    return os.getenv("EXPORT_CONCURRENCY")
+
+
+def get_export_queue_size_env():
+    return os.getenv("EXPORT_QUEUE_SIZE")
+
+
+def get_export_image_dpi_env():
+    return os.getenv("EXPORT_IMAGE_DPI")
+
+
+def get_exports_max_size_mb_env():
+    return os.getenv("EXPORTS_MAX_SIZE_MB")
+
+
+def get_document_parser_workers_env():
+    return os.getenv("DOCUMENT_PARSER_WORKERS")
+
+
+def get_document_parser_queue_size_env():
+    return os.getenv("DOCUMENT_PARSER_QUEUE_SIZE")
+
+
+def get_document_parse_timeout_env():
+    return os.getenv("DOCUMENT_PARSE_TIMEOUT")
+
+
+def get_pdf_parallel_min_pages_env():
+    return os.getenv("PDF_PARALLEL_MIN_PAGES")
+
+
+def get_pdf_text_layer_env():
+    return os.getenv("PDF_TEXT_LAYER")
+
+
+def get_native_office_extraction_env():
+    return os.getenv("NATIVE_OFFICE_EXTRACTION")
+
+
+def get_document_context_tokens_env():
+    return os.getenv("DOCUMENT_CONTEXT_TOKENS")
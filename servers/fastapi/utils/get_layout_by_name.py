@@ -1,9 +1,11 @@
 import aiohttp
 from fastapi import HTTPException
 from models.presentation_layout import PresentationLayoutModel
-from typing import List
 
-async def get_layout_by_name(layout_name: str) -> PresentationLayoutModel:
+from services.layout_cache import LAYOUT_CACHE
+
+
+async def fetch_layout_by_name(layout_name: str) -> PresentationLayoutModel:
     url = f"http://localhost/api/template?group={layout_name}"
     async with aiohttp.ClientSession() as session:
         async with session.get(url) as response:
@@ -16,3 +18,7 @@ async def get_layout_by_name(layout_name: str) -> PresentationLayoutModel:
             layout_json = await response.json()
     # Parse the JSON into your Pydantic model
     return PresentationLayoutModel(**layout_json)
+
+
+async def get_layout_by_name(layout_name: str) -> PresentationLayoutModel:
+    return await LAYOUT_CACHE.get(layout_name, fetch_layout_by_name)
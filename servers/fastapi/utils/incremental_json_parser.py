@@ -0,0 +1,147 @@
+import json
+from typing import Any, List, Optional
+
+import dirtyjson
+
+
+WHITESPACE = " \t\n\r"
+PRIMITIVE_TERMINATORS = ",]}" + WHITESPACE
+
+
+def parse_item_path(path: str) -> List[str]:
+    """
+    Converts paths like "slides[*]" or "data.items[*]" to ["slides", "*"] and
+    ["data", "items", "*"]. "[*]" targets the elements of a root array.
+    """
+    tokens = []
+    for part in path.split("."):
+        while part.endswith("[*]"):
+            part = part[:-3]
+            if part:
+                tokens.append(part)
+                part = ""
+            tokens.append("*")
+        if part:
+            tokens.append(part)
+    return tokens
+
+
+class _Frame:
+    __slots__ = ("is_object", "key", "expecting_key")
+
+    def __init__(self, is_object: bool):
+        self.is_object = is_object
+        self.key: Optional[str] = None
+        self.expecting_key = is_object
+
+
+class IncrementalJsonParser:
+    """
+    Parses a growing JSON document and returns every element of the array at
+    `item_path` as soon as that element is closed.
+    """
+
+    def __init__(self, item_path: str = "slides[*]"):
+        self.item_path = parse_item_path(item_path)
+        self.text = ""
+        self.items_count = 0
+
+        self._pos = 0
+        self._stack: List[_Frame] = []
+
+        self._in_string = False
+        self._is_key_string = False
+        self._escape = False
+        self._string_start = 0
+
+        self._in_primitive = False
+
+        self._item_start: Optional[int] = None
+        self._item_depth = 0
+
+    def _get_current_path(self) -> List[Optional[str]]:
+        return [frame.key if frame.is_object else "*" for frame in self._stack]
+
+    def _on_value_start(self, position: int):
+        if self._item_start is None and self._get_current_path() == self.item_path:
+            self._item_start = position
+            self._item_depth = len(self._stack)
+
+    def _on_value_end(self, end: int, items: List[Any]):
+        if self._item_start is not None and len(self._stack) == self._item_depth:
+            items.append(self._parse_item(self.text[self._item_start : end]))
+            self.items_count += 1
+            self._item_start = None
+
+    def _parse_item(self, text: str) -> Any:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return json.loads(json.dumps(dirtyjson.loads(text)))
+
+    def feed(self, chunk: str) -> List[Any]:
+        self.text += chunk
+        items = []
+        text = self.text
+
+        while self._pos < len(text):
+            position = self._pos
+            character = text[position]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif character == "\\":
+                    self._escape = True
+                elif character == '"':
+                    self._in_string = False
+                    if self._is_key_string:
+                        frame = self._stack[-1]
+                        frame.key = json.loads(text[self._string_start : position + 1])
+                        frame.expecting_key = False
+                    else:
+                        self._on_value_end(position + 1, items)
+                continue
+
+            if self._in_primitive:
+                if character not in PRIMITIVE_TERMINATORS:
+                    continue
+                self._in_primitive = False
+                self._on_value_end(position, items)
+
+            if character in WHITESPACE or character == ":":
+                continue
+
+            if character == ",":
+                if self._stack and self._stack[-1].is_object:
+                    self._stack[-1].expecting_key = True
+                continue
+
+            if character in "}]":
+                if self._stack:
+                    self._stack.pop()
+                self._on_value_end(position + 1, items)
+                continue
+
+            if character == '"':
+                self._in_string = True
+                self._string_start = position
+                self._is_key_string = bool(
+                    self._stack
+                    and self._stack[-1].is_object
+                    and self._stack[-1].expecting_key
+                )
+                if not self._is_key_string:
+                    self._on_value_start(position)
+                continue
+
+            self._on_value_start(position)
+            if character == "{":
+                self._stack.append(_Frame(is_object=True))
+            elif character == "[":
+                self._stack.append(_Frame(is_object=False))
+            else:
+                self._in_primitive = True
+
+        return items
@@ -92,6 +92,7 @@ async def generate_ppt_outline(
     instructions: Optional[str] = None,
     include_title_slide: bool = True,
     web_search: bool = False,
+    incremental_path: Optional[str] = None,
 ):
     model = get_model()
     response_model = get_presentation_outline_model_with_n_slides(n_slides)
@@ -118,6 +119,7 @@ async def generate_ppt_outline(
                 if (client.enable_web_grounding() and web_search)
                 else None
             ),
+            incremental_path=incremental_path,
         ):
             yield chunk
     except Exception as e:
@@ -0,0 +1,73 @@
+from typing import Optional
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from models.presentation_layout import PresentationLayoutModel
+from models.presentation_outline_model import SlideOutlineModel
+from models.slide_layout_index import SlideLayoutIndex
+from services.llm_client import LLMClient
+from utils.llm_client_error_handler import handle_llm_client_exceptions
+from utils.llm_provider import get_model
+
+
+def get_messages(
+    outline: str,
+    layout: PresentationLayoutModel,
+    slide_index: int,
+    n_slides: int,
+    instructions: Optional[str] = None,
+):
+    return [
+        LLMSystemMessage(
+            content=f"""
+                You're a professional presentation designer. Select a Slide Layout index for one slide of a presentation based on its outline.
+                {layout.to_string()}
+
+                {"# User Instruction:" if instructions else ""}
+                {instructions or ""}
+
+                # Notes
+                - Let the slide's purpose guide layout selection.
+                - Opening/closing slides → Title layouts.
+                - Processes/workflows → Visual process layouts.
+                - Comparisons/contrasts → Side-by-side layouts.
+                - Data/metrics → Chart/graph layouts.
+                - Concepts/ideas → Image + text layouts.
+                **Go through all notes and make sure they are followed**
+            """,
+        ),
+        LLMUserMessage(
+            content=f"""
+                - Slide Position: {slide_index + 1} of {n_slides}
+                - Slide Outline: {outline}
+            """,
+        ),
+    ]
+
+
+async def get_slide_layout_index_from_outline(
+    outline: SlideOutlineModel,
+    layout: PresentationLayoutModel,
+    slide_index: int,
+    n_slides: int,
+    instructions: Optional[str] = None,
+) -> int:
+
+    client = LLMClient()
+    model = get_model()
+
+    try:
+        response = await client.generate_structured(
+            model=model,
+            messages=get_messages(
+                outline.content,
+                layout,
+                slide_index,
+                n_slides,
+                instructions,
+            ),
+            response_format=SlideLayoutIndex.model_json_schema(),
+            strict=True,
+        )
+        return SlideLayoutIndex(**response).index
+
+    except Exception as e:
+        raise handle_llm_client_exceptions(e)
@@ -0,0 +1,110 @@
+import asyncio
+import random
+from typing import Dict, List, Optional
+
+from models.presentation_layout import PresentationLayoutModel
+from models.presentation_outline_model import SlideOutlineModel
+from models.presentation_structure_model import PresentationStructureModel
+from utils.llm_calls.generate_slide_content import (
+    get_slide_content_from_type_and_outline,
+)
+from utils.llm_calls.select_slide_layout_from_outline import (
+    get_slide_layout_index_from_outline,
+)
+from utils.ppt_utils import get_slide_generation_window
+
+
+class PipelinedSlideGeneration:
+    """
+    Starts layout selection and content generation for every slide outline as
+    soon as it is streamed, instead of waiting for the full outline.
+
+    Ordered layouts are mapped by slide index, unordered layouts are selected
+    per slide. At most window_size slide contents are generated at a time,
+    same as the sliding window used without pipelining. Tasks are keyed by
+    the index of the outline in the order it was streamed.
+    """
+
+    def __init__(
+        self,
+        layout: PresentationLayoutModel,
+        n_slides: int,
+        language: str,
+        tone: Optional[str] = None,
+        verbosity: Optional[str] = None,
+        instructions: Optional[str] = None,
+        window_size: Optional[int] = None,
+    ):
+        self.layout = layout
+        self.n_slides = n_slides
+        self.language = language
+        self.tone = tone
+        self.verbosity = verbosity
+        self.instructions = instructions
+
+        self.outlines: List[SlideOutlineModel] = []
+        self._layout_tasks: List[asyncio.Task] = []
+        self._content_tasks: Dict[int, asyncio.Task] = {}
+        self._content_semaphore = asyncio.Semaphore(
+            max(window_size or get_slide_generation_window(), 1)
+        )
+
+    def add_outline(self, outline: SlideOutlineModel):
+        if len(self.outlines) >= self.n_slides:
+            return
+
+        slide_index = len(self.outlines)
+        self.outlines.append(outline)
+
+        layout_task = asyncio.create_task(
+            self._select_layout_index(outline, slide_index)
+        )
+        self._layout_tasks.append(layout_task)
+        self._content_tasks[slide_index] = asyncio.create_task(
+            self._generate_content(outline, layout_task)
+        )
+
+    async def _select_layout_index(
+        self, outline: SlideOutlineModel, slide_index: int
+    ) -> int:
+        total_slide_layouts = len(self.layout.slides)
+        if self.layout.ordered:
+            layout_index = slide_index
+        else:
+            layout_index = await get_slide_layout_index_from_outline(
+                outline,
+                self.layout,
+                slide_index,
+                self.n_slides,
+                self.instructions,
+            )
+
+        if layout_index < 0 or layout_index >= total_slide_layouts:
+            layout_index = random.randint(0, total_slide_layouts - 1)
+        return layout_index
+
+    async def _generate_content(
+        self, outline: SlideOutlineModel, layout_task: asyncio.Task
+    ) -> dict:
+        layout_index = await layout_task
+        async with self._content_semaphore:
+            return await get_slide_content_from_type_and_outline(
+                self.layout.slides[layout_index],
+                outline,
+                self.language,
+                self.tone,
+                self.verbosity,
+                self.instructions,
+            )
+
+    async def get_presentation_structure(self) -> PresentationStructureModel:
+        return PresentationStructureModel(
+            slides=list(await asyncio.gather(*self._layout_tasks))
+        )
+
+    def get_content_task(self, outline_index: int) -> Optional[asyncio.Task]:
+        return self._content_tasks.get(outline_index)
+
+    def cancel(self):
+        for task in [*self._layout_tasks, *self._content_tasks.values()]:
+            task.cancel()
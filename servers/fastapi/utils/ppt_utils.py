@@ -1,9 +1,12 @@
+from constants.presentation import DEFAULT_SLIDE_GENERATION_WINDOW
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_outline_model import PresentationOutlineModel
 import re
 from typing import List
 
 from models.presentation_structure_model import PresentationStructureModel
+from utils.get_env import get_slide_generation_window_env
+from utils.parsers import parse_int_or_none
 
 
 def get_presentation_title_from_outlines(
@@ -80,3 +83,10 @@ def select_toc_or_list_slide_layout_index(
         return toc_index
 
     return find_slide_layout_index_by_regex(layout, list_patterns)
+
+
+def get_slide_generation_window() -> int:
+    return (
+        parse_int_or_none(get_slide_generation_window_env())
+        or DEFAULT_SLIDE_GENERATION_WINDOW
+    )
@@ -82,4 +82,24 @@ def set_extended_reasoning_env(value):
 
 
 def set_web_grounding_env(value):
-    os.environ["WEB_GROUNDING"] = value
\ No newline at end of file
+    os.environ["WEB_GROUNDING"] = value
+
+
+def set_llm_response_cache_env(value):
+    os.environ["LLM_RESPONSE_CACHE"] = value
+
+
+def set_llm_max_concurrency_env(value):
+    os.environ["LLM_MAX_CONCURRENCY"] = value
+
+
+def set_llm_requests_per_minute_env(value):
+    os.environ["LLM_REQUESTS_PER_MINUTE"] = value
+
+
+def set_llm_tokens_per_minute_env(value):
+    os.environ["LLM_TOKENS_PER_MINUTE"] = value
+
+
+def set_slide_generation_window_env(value):
+    os.environ["SLIDE_GENERATION_WINDOW"] = value
@@ -0,0 +1,70 @@
+import asyncio
+from typing import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+async def iterate_in_sliding_window(
+    factories: Sequence[Callable[[], Awaitable[T]]],
+    window_size: int,
+) -> AsyncGenerator[Tuple[int, T], None]:
+    """
+    Runs at most window_size awaitables at a time and starts the next one as
+    soon as any of them finishes. Yields (index, result) in completion order.
+    If any awaitable fails, the remaining ones are cancelled and it is raised.
+    """
+    window_size = max(window_size, 1)
+    next_index = 0
+    in_flight: dict[asyncio.Future, int] = {}
+
+    def start_next():
+        nonlocal next_index
+        future = asyncio.ensure_future(factories[next_index]())
+        in_flight[future] = next_index
+        next_index += 1
+
+    try:
+        while next_index < len(factories) and len(in_flight) < window_size:
+            start_next()
+
+        while in_flight:
+            done, _ = await asyncio.wait(
+                in_flight.keys(), return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                index = in_flight.pop(future)
+                result = future.result()
+                if next_index < len(factories):
+                    start_next()
+                yield index, result
+    finally:
+        for future in in_flight:
+            future.cancel()
+        # Waits for the cancellations so no task is left pending
+        await asyncio.gather(*in_flight, return_exceptions=True)
+
+
+async def gather_in_sliding_window(
+    factories: Sequence[Callable[[], Awaitable[T]]],
+    window_size: int,
+    on_result: Optional[Callable[[int, T], None]] = None,
+) -> List[T]:
+    """
+    Same as iterate_in_sliding_window but returns results in input order.
+    on_result is called as soon as each result is available.
+    """
+    results: List[Optional[T]] = [None] * len(factories)
+    async for index, result in iterate_in_sliding_window(factories, window_size):
+        results[index] = result
+        if on_result:
+            on_result(index, result)
+    return results
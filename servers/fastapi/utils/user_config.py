@@ -23,8 +23,13 @@ from utils.get_env import (
     get_pixabay_api_key_env,
     get_extended_reasoning_env,
     get_web_grounding_env,
+    get_llm_response_cache_env,
+    get_llm_max_concurrency_env,
+    get_llm_requests_per_minute_env,
+    get_llm_tokens_per_minute_env,
+    get_slide_generation_window_env,
 )
-from utils.parsers import parse_bool_or_none
+from utils.parsers import parse_bool_or_none, parse_int_or_none
 from utils.set_env import (
     set_anthropic_api_key_env,
     set_anthropic_model_env,
@@ -45,6 +50,11 @@ from utils.set_env import (
     set_pixabay_api_key_env,
     set_tool_calls_env,
     set_web_grounding_env,
+    set_llm_response_cache_env,
+    set_llm_max_concurrency_env,
+    set_llm_requests_per_minute_env,
+    set_llm_tokens_per_minute_env,
+    set_slide_generation_window_env,
 )
 
 
@@ -98,6 +108,19 @@ def get_user_config():
             if existing_config.WEB_GROUNDING is not None
             else (parse_bool_or_none(get_web_grounding_env()) or False)
         ),
+        LLM_RESPONSE_CACHE=(
+            existing_config.LLM_RESPONSE_CACHE
+            if existing_config.LLM_RESPONSE_CACHE is not None
+            else (parse_bool_or_none(get_llm_response_cache_env()) or False)
+        ),
+        LLM_MAX_CONCURRENCY=existing_config.LLM_MAX_CONCURRENCY
+        or parse_int_or_none(get_llm_max_concurrency_env()),
+        LLM_REQUESTS_PER_MINUTE=existing_config.LLM_REQUESTS_PER_MINUTE
+        or parse_int_or_none(get_llm_requests_per_minute_env()),
+        LLM_TOKENS_PER_MINUTE=existing_config.LLM_TOKENS_PER_MINUTE
+        or parse_int_or_none(get_llm_tokens_per_minute_env()),
+        SLIDE_GENERATION_WINDOW=existing_config.SLIDE_GENERATION_WINDOW
+        or parse_int_or_none(get_slide_generation_window_env()),
     )
 
 
@@ -141,3 +164,13 @@ def update_env_with_user_config():
         set_extended_reasoning_env(str(user_config.EXTENDED_REASONING))
     if user_config.WEB_GROUNDING is not None:
         set_web_grounding_env(str(user_config.WEB_GROUNDING))
+    if user_config.LLM_RESPONSE_CACHE is not None:
+        set_llm_response_cache_env(str(user_config.LLM_RESPONSE_CACHE))
+    if user_config.LLM_MAX_CONCURRENCY is not None:
+        set_llm_max_concurrency_env(str(user_config.LLM_MAX_CONCURRENCY))
+    if user_config.LLM_REQUESTS_PER_MINUTE is not None:
+        set_llm_requests_per_minute_env(str(user_config.LLM_REQUESTS_PER_MINUTE))
+    if user_config.LLM_TOKENS_PER_MINUTE is not None:
+        set_llm_tokens_per_minute_env(str(user_config.LLM_TOKENS_PER_MINUTE))
+    if user_config.SLIDE_GENERATION_WINDOW is not None:
+        set_slide_generation_window_env(str(user_config.SLIDE_GENERATION_WINDOW))
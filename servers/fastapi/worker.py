@@ -0,0 +1,58 @@
+import argparse
+import asyncio
+import os
+import signal
+
+from api.v1.ppt.endpoints.presentation import run_presentation_generation_job
+from constants.presentation import DEFAULT_GENERATION_WORKERS
+from services.database import create_db_and_tables
+from services.docling_worker_pool import DOCLING_WORKER_POOL
+from services.pptx_export_executor import PPTX_EXPORT_EXECUTOR
+from services.presentation_generation_queue import (
+    PresentationGenerationWorkerPool,
+    get_generation_workers,
+)
+from utils.download_helpers import close_http_session
+from utils.get_env import get_app_data_directory_env
+
+
+async def run_workers(workers: int):
+    os.makedirs(get_app_data_directory_env(), exist_ok=True)
+    await create_db_and_tables()
+
+    worker_pool = PresentationGenerationWorkerPool(
+        run_presentation_generation_job, workers
+    )
+    worker_pool.start()
+    print(f"Running {workers} presentation generation workers")
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for each in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(each, stop_event.set)
+
+    await stop_event.wait()
+    # Jobs in progress are released back to the queue
+    await worker_pool.stop()
+    PPTX_EXPORT_EXECUTOR.shutdown()
+    DOCLING_WORKER_POOL.shutdown()
+    await close_http_session()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run presentation generation workers"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of presentations to generate at a time",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_workers(
+            args.workers or get_generation_workers() or DEFAULT_GENERATION_WORKERS
+        )
+    )